@@ -1,8 +1,14 @@
 """Graph traversal algorithms related classes and functions."""
 
-from copy import deepcopy
-from enum import Enum
+import pickle
+from array import array
+from collections import deque
+from collections.abc import Callable, Collection, Iterator
+from dataclasses import dataclass
+from enum import Enum, StrEnum
+from typing import Any
 
+from ia.tree.lazy import LazyTree
 from ia.tree.node import Node
 
 
@@ -37,39 +43,387 @@ class UninformedTraversalAlgorithm(str, Enum):
     >>> graph.add_edge(2, 5)
     """
 
+    UCS = "ucs"
+    """Uniform Cost Search
+
+    The Uniform Cost Search algorithm (Dijkstra) is a traversal algorithm
+    that always expands the generated node with the lowest path cost,
+    so the path it returns is the cheapest one.
+    """
+
+    BIDIRECTIONAL_BFS = "bidirectional_bfs"
+    """Bidirectional Breadth First Search
+
+    Runs a Breadth First Search from each end and stops when both
+    meet, returning the path with the fewest edges.
+    """
+
+    BIDIRECTIONAL_UCS = "bidirectional_ucs"
+    """Bidirectional Uniform Cost Search
+
+    Runs a Uniform Cost Search from each end and stops when no
+    cheaper path through both searches can exist.
+    """
+
+    ALL_PAIRS = "all_pairs"
+    """All-Pairs Shortest Paths
+
+    Precomputes the cost and next hop of the cheapest path between
+    every pair of vertices, so each query only walks the path.
+    """
+
 
 class InformedTraversalAlgorithm(str, Enum):
     """Traversal algorithm class."""
 
     A_STAR = "a_star"
+    """A* Search
+
+    The A* algorithm expands the nodes in order of their path cost plus
+    a heuristic estimate of the remaining cost to the goal.
+    """
+
+    JUMP_POINT_SEARCH = "jps"
+    """Jump Point Search
+
+    A* for uniform-cost grids that jumps over the cells of straight and
+    diagonal lines, only generating the cells where a path could turn.
+    Only available on mazes.
+    """
+
+    DISTANCE_FIELD = "distance_field"
+    """Distance Field
+
+    Computes the exact cost to the goal of every cell with one backward
+    uniform-cost search, then follows the field down from the start.
+    Only available on mazes.
+    """
+
+    HPA_STAR = "hpa_star"
+    """Hierarchical Pathfinding A* (HPA*)
+
+    Searches an abstract graph of the entrances between square clusters
+    of the maze, built once per maze, and refines the resulting path
+    cluster by cluster. The path is near-optimal. Only available on mazes.
+    """
+
+    IDA_STAR = "ida_star"
+    """Iterative-Deepening A* (IDA*)
+
+    Repeats depth-first searches bounded by an f score threshold that
+    grows after each one, keeping only the current branch and a bounded
+    transposition table in memory.
+    """
+
+    SMA_STAR = "sma_star"
+    """Simplified Memory-Bounded A* (SMA*)
+
+    A* over a search tree with a fixed number of nodes, which forgets
+    the least promising leaves when it is full and generates them again
+    if they become the most promising ones.
+    """
+
+
+class HistoryMode(StrEnum):
+    """History recording mode."""
+
+    FULL = "full"
+    """Record every step."""
+
+    NONE = "none"
+    """Record no steps, only the generated and inspected counters."""
+
+    FINAL = "final"
+    """Record only the last step."""
+
+    EVERY = "every"
+    """Record one step out of every ``size`` steps, plus the last one."""
+
+    LAST = "last"
+    """Record the last ``size`` steps in a ring buffer."""
+
+
+@dataclass(frozen=True)
+class HistoryPolicy:
+    """Policy that decides which steps an :class:`AlgorithmHistory` keeps.
+
+    Examples
+    --------
+    >>> HistoryPolicy(HistoryMode.EVERY, 10)
+    HistoryPolicy(mode=<HistoryMode.EVERY: 'every'>, size=10)
+    """
+
+    mode: HistoryMode = HistoryMode.FULL
+    size: int = 1
+    """Sampling interval for ``EVERY`` and buffer length for ``LAST``."""
+
+    def __post_init__(self) -> None:
+        """Post initialization."""
+        if self.size < 1:
+            raise ValueError("History size must be greater than zero.")
+
+
+class SearchMode(StrEnum):
+    """Search mode class.
+
+    Defines how a traversal avoids expanding the same vertex twice.
+    """
+
+    GRAPH = "graph"
+    """Graph search
+
+    Keeps a global set of reached vertices, so every vertex is
+    expanded at most once and the search runs in O(V + E).
+    """
+
+    TREE = "tree"
+    """Tree search
+
+    Only discards the vertices already present in the branch being
+    expanded, so a vertex can appear many times in the search tree.
+    """
 
 
 class AlgorithmHistory:
-    """Algorithm history class."""
+    """Algorithm history class.
 
-    def __init__(self):
-        """Initialize the history."""
-        self.history = []
+    Steps are stored as deltas: every call to :meth:`add_step` only records
+    the nodes generated and inspected since the previous step and, optionally,
+    the tip of the current path. Any step can be reconstructed on demand as a
+    dictionary with its ``step`` number, the cumulative ``generated`` and
+    ``inspected`` lists (and the ``path`` when a path resolver is given), so
+    recording a step costs the size of its delta instead of the size of the
+    whole search.
+
+    Which steps are kept is decided by the :class:`HistoryPolicy`. The
+    generated and inspected counters are always kept. Every mode but
+    ``NONE`` also keeps the generated and inspected nodes, which the kept
+    steps list cumulatively, but only records the steps it keeps.
+
+    Examples
+    --------
+    >>> history = AlgorithmHistory()
+    >>> history.add_step(generated=[1])
+    >>> history.add_step(generated=[2, 3], inspected=[1])
+    >>> history[-1]
+    {'step': 1, 'generated': [1, 2, 3], 'inspected': [1]}
+    """
+
+    def __init__(
+        self,
+        *,
+        resolve_path: Callable[[Any], list] | None = None,
+        resolve_node: Callable[[Any], Any] | None = None,
+        policy: HistoryPolicy | None = None,
+    ):
+        """Initialize the history.
+
+        Parameters
+        ----------
+        resolve_path: Callable[[Any], list] | None
+                Function that turns the path tip recorded on each step into
+                the full path. If not given, steps have no ``path`` entry.
+        resolve_node: Callable[[Any], Any] | None
+                Function that turns the generated and inspected nodes into
+                the values returned by the reconstructed steps, so searches
+                can record cheap ids instead. Defaults to returning them as is.
+        policy: HistoryPolicy | None
+                The policy deciding which steps are kept.
+                Defaults to keeping every step.
+
+        """
+        self.__resolve_path = resolve_path
+        self.__resolve_node = resolve_node
+        self.__policy = policy if policy is not None else HistoryPolicy()
+        self.__steps = 0
+        self.__generated_count = 0
+        self.__inspected_count = 0
+        self.__generated: list = []
+        self.__inspected: list = []
+        self.__last: tuple[int, int, int, Any] | None = None
+        mode = self.__policy.mode
+        if mode == HistoryMode.FINAL:
+            # The last step is kept on its own, so no records are needed.
+            self.__records = deque(maxlen=0)
+        elif mode == HistoryMode.LAST:
+            self.__records = deque(maxlen=self.__policy.size)
+        else:
+            self.__records = _StepRecords()
+
+    @property
+    def policy(self) -> HistoryPolicy:
+        """Get the policy of the history."""
+        return self.__policy
+
+    @property
+    def generated_count(self) -> int:
+        """Get the number of generated nodes up to the last step."""
+        return self.__generated_count
+
+    @property
+    def inspected_count(self) -> int:
+        """Get the number of inspected nodes up to the last step."""
+        return self.__inspected_count
 
-    def add_step(self, **kargs) -> None:
-        """Add a step to the history."""
-        self.history.append(deepcopy(kargs))
+    @property
+    def steps(self) -> int:
+        """Get the number of steps added, including the ones not kept."""
+        return self.__steps
+
+    def add_step(
+        self,
+        *,
+        generated: Collection = (),
+        inspected: Collection = (),
+        path: Any = None,
+    ) -> None:
+        """Add a step to the history.
+
+        Parameters
+        ----------
+        generated: Collection
+                The nodes generated since the previous step.
+        inspected: Collection
+                The nodes inspected since the previous step.
+        path: Any
+                The tip of the current path, passed to ``resolve_path``
+                when the step is reconstructed.
+
+        """
+        step = self.__steps
+        self.__steps += 1
+        self.__generated_count += len(generated)
+        self.__inspected_count += len(inspected)
+        mode = self.__policy.mode
+        if mode == HistoryMode.NONE:
+            return
+        self.__generated.extend(generated)
+        self.__inspected.extend(inspected)
+        if self.__resolve_path is None:
+            path = None
+        record = (step, self.__generated_count, self.__inspected_count, path)
+        self.__last = record
+        if mode == HistoryMode.FINAL:
+            return
+        if mode != HistoryMode.EVERY or step % self.__policy.size == 0:
+            self.__records.append(record)
 
     def get_history(self) -> list[dict]:
         """Get the history."""
-        return self.history
+        return list(self)
+
+    def __records_with_last(self) -> int:
+        """Get the number of kept records, counting the last step."""
+        records = len(self.__records)
+        if self.__last is not None and (
+            not records or self.__records[-1][0] != self.__last[0]
+        ):
+            records += 1
+        return records
+
+    def __len__(self) -> int:
+        """Get the number of kept steps."""
+        return self.__records_with_last()
+
+    def __getitem__(self, index: int) -> dict:
+        """Reconstruct a kept step from the history."""
+        records = len(self)
+        if index < 0:
+            index += records
+        if not 0 <= index < records:
+            raise IndexError("history step out of range")
+        if index < len(self.__records):
+            step, generated_end, inspected_end, tip = self.__records[index]
+        else:
+            step, generated_end, inspected_end, tip = self.__last
+        generated = self.__generated[:generated_end]
+        inspected = self.__inspected[:inspected_end]
+        if self.__resolve_node is not None:
+            generated = [self.__resolve_node(node) for node in generated]
+            inspected = [self.__resolve_node(node) for node in inspected]
+        result = {"step": step, "generated": generated, "inspected": inspected}
+        if self.__resolve_path is not None:
+            result["path"] = [] if tip is None else self.__resolve_path(tip)
+        return result
+
+    def __getstate__(self) -> dict:
+        """Get the state to pickle, with the nodes and paths already resolved.
+
+        The resolvers are usually closures over the searched structure, so
+        they are applied before pickling and not kept, unless they can be
+        pickled themselves.
+        """
+        state = self.__dict__.copy()
+        resolve_node = self.__resolve_node
+        if resolve_node is not None and not _picklable(resolve_node):
+            state["_AlgorithmHistory__generated"] = [
+                resolve_node(node) for node in self.__generated
+            ]
+            state["_AlgorithmHistory__inspected"] = [
+                resolve_node(node) for node in self.__inspected
+            ]
+            state["_AlgorithmHistory__resolve_node"] = None
+        resolve_path = self.__resolve_path
+        if resolve_path is not None and not _picklable(resolve_path):
 
-    def __getitem__(self, step: int) -> dict:
-        """Get a step from the history."""
-        return self.history[step]
+            def resolve(record: tuple[int, int, int, Any]) -> tuple[int, int, int, Any]:
+                step, generated_end, inspected_end, tip = record
+                if tip is not None:
+                    tip = list(resolve_path(tip))
+                return step, generated_end, inspected_end, tip
+
+            records = self.__records
+            if isinstance(records, deque):
+                resolved = deque(map(resolve, records), maxlen=records.maxlen)
+            else:
+                resolved = _StepRecords()
+                for index in range(len(records)):
+                    resolved.append(resolve(records[index]))
+            state["_AlgorithmHistory__records"] = resolved
+            if self.__last is not None:
+                state["_AlgorithmHistory__last"] = resolve(self.__last)
+            state["_AlgorithmHistory__resolve_path"] = list
+        return state
 
     def __str__(self) -> str:
         """Return the history as a string."""
-        return str(self.history)
+        return str(self.get_history())
+
+    def __iter__(self) -> Iterator[dict]:
+        """Iterate over the reconstructed steps."""
+        for index in range(len(self)):
+            yield self[index]
+
+
+class _StepRecords:
+    """Compact, append-only storage for history step records."""
+
+    def __init__(self):
+        self.__steps = array("q")
+        self.__generated_ends = array("q")
+        self.__inspected_ends = array("q")
+        self.__tips: list = []
 
-    def __iter__(self):
-        """Iterate over the history."""
-        return iter(self.history)
+    def append(self, record: tuple[int, int, int, Any]) -> None:
+        """Append a record."""
+        step, generated_end, inspected_end, tip = record
+        self.__steps.append(step)
+        self.__generated_ends.append(generated_end)
+        self.__inspected_ends.append(inspected_end)
+        self.__tips.append(tip)
+
+    def __len__(self) -> int:
+        """Get the number of records."""
+        return len(self.__steps)
+
+    def __getitem__(self, index: int) -> tuple[int, int, int, Any]:
+        """Get a record."""
+        return (
+            self.__steps[index],
+            self.__generated_ends[index],
+            self.__inspected_ends[index],
+            self.__tips[index],
+        )
 
 
 # TODO: Refactor to dataclass
@@ -85,7 +439,8 @@ class TraversalResult:
         history: AlgorithmHistory,
         path: list[Node],
         cost: int,
-        tree: Node | None = None,
+        tree: Node | LazyTree | None = None,
+        bound: float | None = None,
     ):
         """Initialize the result.
 
@@ -99,18 +454,78 @@ class TraversalResult:
                 The resulting path
         cost: int
                 The cost of the path
+        tree: Node | LazyTree | None
+                The search tree. A LazyTree is only materialized
+                the first time the tree is accessed.
+        bound: float | None
+                The proven ratio between the cost and the optimal cost,
+                for searches that can return suboptimal paths.
 
         """
         self.history = history
         self.path = path
         self.cost = cost
         self.tree = tree
+        self.bound = bound
+
+    @property
+    def tree(self) -> Node | None:
+        """Get the search tree."""
+        if isinstance(self.__tree, LazyTree):
+            self.__tree = self.__tree.to_node()
+        return self.__tree
+
+    @tree.setter
+    def tree(self, value: Node | LazyTree | None) -> None:
+        """Set the search tree."""
+        self.__tree = value
+
+    @property
+    def generated_count(self) -> int:
+        """Get the number of generated nodes."""
+        return self.history.generated_count
+
+    @property
+    def inspected_count(self) -> int:
+        """Get the number of inspected nodes."""
+        return self.history.inspected_count
+
+    def __getstate__(self) -> dict:
+        """Get the state to pickle.
+
+        The nodes of the path are stored without their links, which are
+        restored on unpickling, so long paths do not exceed the recursion
+        limit of :mod:`pickle`. A search tree is only kept if it has not
+        been materialized.
+        """
+        state = self.__dict__.copy()
+        if self.path is not None:
+            state["path"] = [node.detached() for node in self.path]
+        if not isinstance(self.__tree, LazyTree):
+            state["_TraversalResult__tree"] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore the state and link the nodes of the path again."""
+        self.__dict__.update(state)
+        if self.path is not None:
+            for parent, node in zip(self.path, self.path[1:], strict=False):
+                node.parent = parent
 
     def __str__(self) -> str:
         """Return the result as a string."""
         return f"Path: {self.path}, Cost: {self.cost}"
 
 
+def _picklable(function: Callable) -> bool:
+    """Check if a function can be pickled, which closures cannot."""
+    try:
+        pickle.dumps(function)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    return True
+
+
 def graph_path_cost(path: list[Node], weights: dict[tuple[int, int], int]) -> int:
     """Calculate the cost from a path using the weights of the graph."""
     cost = 0
@@ -0,0 +1,471 @@
+"""Memory-bounded search module.
+
+Contains iterative-deepening A* (IDA*) and simplified memory-bounded A*
+(SMA*), which find optimal paths while keeping at most a fixed number of
+search nodes in memory. They work on any state space given as a
+successor function, and are wrapped by :meth:`Maze.ida_star`,
+:meth:`Maze.sma_star`, :meth:`BaseGraph.ida_star` and
+:meth:`BaseGraph.sma_star`.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from collections.abc import Callable, Hashable, Iterable
+
+from ia.algorithm import AlgorithmHistory
+
+DEFAULT_NODE_BUDGET = 100_000
+"""Number of search nodes kept in memory when no budget is given."""
+
+STALL_FACTOR = 16
+"""Steps per node of the budget SMA* runs without progress before giving up."""
+
+MIN_STALL_STEPS = 2**14
+"""Fewest steps SMA* runs without progress before giving up."""
+
+Successors = Callable[[Hashable], Iterable[tuple[Hashable, float]]]
+"""Function giving the ``(state, cost)`` pairs reachable from a state."""
+
+
+class SearchNode:
+    """Node of a memory-bounded search, linked to its parent.
+
+    Examples
+    --------
+    >>> root = SearchNode("a", 0, None)
+    >>> branch(SearchNode("b", 5, root))
+    [('a', 0), ('b', 5)]
+    """
+
+    __slots__ = ("g", "parent", "state")
+
+    def __init__(self, state: Hashable, g: float, parent: SearchNode | None):
+        self.state = state
+        self.g = g
+        self.parent = parent
+
+
+class _MemoryNode(SearchNode):
+    """Node of SMA*, with the bookkeeping needed to forget and regenerate it."""
+
+    __slots__ = (
+        "children",
+        "cursor",
+        "depth",
+        "f",
+        "forgotten",
+        "in_queue",
+        "successors",
+        "version",
+    )
+
+    def __init__(
+        self,
+        state: Hashable,
+        g: float,
+        parent: _MemoryNode | None,
+        f: float,
+        successors: list[tuple[Hashable, float]],
+    ):
+        super().__init__(state, g, parent)
+        self.f = f
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.successors = successors
+        # Successors before the cursor have been generated at least once.
+        self.cursor = 0
+        self.children: list[_MemoryNode] = []
+        # The f score of the successors that were generated and dropped.
+        self.forgotten: dict[Hashable, float] = {}
+        self.in_queue = False
+        self.version = 0
+
+
+def branch(node: SearchNode) -> list[tuple[Hashable, float]]:
+    """Get the states and costs from the root of a search to a node."""
+    states = []
+    while node is not None:
+        states.append((node.state, node.g))
+        node = node.parent
+    states.reverse()
+    return states
+
+
+def ida_star(
+    start: Hashable,
+    goal: Hashable,
+    successors: Successors,
+    heuristic: Callable[[Hashable], float],
+    history: AlgorithmHistory,
+    node_budget: int = DEFAULT_NODE_BUDGET,
+) -> SearchNode | None:
+    """Search with iterative-deepening A* (IDA*).
+
+    Runs depth-first searches that prune the paths whose ``g + h`` exceeds
+    a threshold, starting at ``h(start)`` and raising it to the lowest
+    pruned value after every search, so the first goal reached is optimal
+    for an admissible heuristic. Only the current branch is kept, plus a
+    transposition table with the cheapest cost each state was reached at
+    in the current search, which cuts the revisits of the same state
+    through other paths. The table holds at most ``node_budget`` states;
+    once it is full, new states are searched without it.
+
+    Every search expands the states below the threshold again, so the
+    history records them once per search: its counts of generated and
+    inspected states add up across thresholds.
+
+    Examples
+    --------
+    >>> edges = {1: [(2, 1), (3, 4)], 2: [(3, 1)], 3: []}
+    >>> history = AlgorithmHistory()
+    >>> goal = ida_star(1, 3, edges.__getitem__, lambda _: 0, history)
+    >>> branch(goal)
+    [(1, 0), (2, 1), (3, 2)]
+
+    Parameters
+    ----------
+        start : (Hashable)
+            The start state.
+        goal : (Hashable)
+            The goal state.
+        successors : (Successors)
+            The ``(state, cost)`` pairs reachable from a state, with
+            non-negative costs.
+        heuristic : (Callable[[Hashable], float])
+            The estimated cost from a state to the goal.
+        history : (AlgorithmHistory)
+            The history where every expansion is recorded, with the node
+            of the expanded state as the tip of its path.
+        node_budget : (int)
+            The largest number of states in the transposition table.
+
+    Returns
+    -------
+        (SearchNode | None)
+            The node of the goal, or None if it cannot be reached.
+    """
+    root = SearchNode(start, 0, None)
+    if start == goal:
+        history.add_step(inspected=[start], path=root)
+        return root
+    threshold = heuristic(start)
+    while True:
+        found, threshold = _ida_iteration(
+            root, goal, successors, heuristic, history, node_budget, threshold
+        )
+        if found is not None:
+            return found
+        if threshold == math.inf:
+            return None
+
+
+def _ida_iteration(
+    root: SearchNode,
+    goal: Hashable,
+    successors: Successors,
+    heuristic: Callable[[Hashable], float],
+    history: AlgorithmHistory,
+    node_budget: int,
+    threshold: float,
+) -> tuple[SearchNode | None, float]:
+    """Run the depth-first search of IDA* for one threshold.
+
+    Returns the node of the goal if it was reached, and the lowest f score
+    above the threshold otherwise.
+    """
+    next_threshold = math.inf
+    best_g = {root.state: 0}
+    on_branch = {root.state}
+
+    def expand(node: SearchNode) -> list[SearchNode]:
+        nonlocal next_threshold
+        children = []
+        for state, cost in successors(node.state):
+            if state in on_branch:
+                continue
+            g = node.g + cost
+            f = g + heuristic(state)
+            if f > threshold:
+                next_threshold = min(next_threshold, f)
+                continue
+            known_g = best_g.get(state)
+            if known_g is not None and known_g <= g:
+                continue
+            if known_g is not None or len(best_g) < node_budget:
+                best_g[state] = g
+            children.append(SearchNode(state, g, node))
+        history.add_step(
+            generated=[child.state for child in children],
+            inspected=[node.state],
+            path=node,
+        )
+        children.reverse()
+        return children
+
+    stack = [(root, expand(root))]
+    while stack:
+        node, children = stack[-1]
+        if not children:
+            stack.pop()
+            on_branch.discard(node.state)
+            continue
+        child = children.pop()
+        if best_g.get(child.state, child.g) < child.g:
+            continue
+        if child.state == goal:
+            history.add_step(inspected=[goal], path=child)
+            return child, threshold
+        on_branch.add(child.state)
+        stack.append((child, expand(child)))
+    return None, next_threshold
+
+
+def sma_star(
+    start: Hashable,
+    goal: Hashable,
+    successors: Successors,
+    heuristic: Callable[[Hashable], float],
+    history: AlgorithmHistory,
+    node_budget: int = DEFAULT_NODE_BUDGET,
+) -> SearchNode | None:
+    """Search with simplified memory-bounded A* (SMA*).
+
+    Works like A* over a search tree of at most ``node_budget`` nodes.
+    Every step generates one successor of the deepest node with the
+    lowest f score. When the tree is full, the shallowest leaf with the
+    highest f score is dropped and its parent remembers its f score, so
+    the branch is only generated again once it is the most promising
+    one. The f score of a node whose successors were all generated is
+    backed up to the lowest f score below it.
+
+    The path is optimal for an admissible heuristic if it fits in the
+    budget, that is, if the optimal path has fewer nodes than it. A
+    state reached again through a path that is not cheaper than the one
+    of a node in memory is not generated.
+
+    With a budget much smaller than the states around the path, SMA* can
+    forget and regenerate the same branches for a very long time. The
+    backed-up f score of the root only grows, so the search gives up once
+    it has not changed for :data:`STALL_FACTOR` steps per node of the
+    budget, and at least :data:`MIN_STALL_STEPS`.
+
+    Examples
+    --------
+    >>> edges = {1: [(2, 1), (3, 4)], 2: [(3, 1)], 3: []}
+    >>> history = AlgorithmHistory()
+    >>> goal = sma_star(1, 3, edges.__getitem__, lambda _: 0, history, node_budget=3)
+    >>> branch(goal)
+    [(1, 0), (2, 1), (3, 2)]
+
+    Parameters
+    ----------
+        start : (Hashable)
+            The start state.
+        goal : (Hashable)
+            The goal state.
+        successors : (Successors)
+            The ``(state, cost)`` pairs reachable from a state, with
+            non-negative costs.
+        heuristic : (Callable[[Hashable], float])
+            The estimated cost from a state to the goal.
+        history : (AlgorithmHistory)
+            The history where every step is recorded, with the node whose
+            successor was generated as the tip of its path. A node is
+            recorded as inspected when its first successor is generated,
+            so it is inspected again only if it is forgotten and generated
+            again.
+        node_budget : (int)
+            The largest number of nodes in memory, at least 2.
+
+    Returns
+    -------
+        (SearchNode | None)
+            The node of the goal, or None if it cannot be reached within
+            the budget or the search stops making progress.
+
+    Raises
+    ------
+    ValueError
+        If the budget is lower than 2.
+    """
+    if node_budget < 2:
+        raise ValueError(f"SMA* needs room for at least 2 nodes: {node_budget}")
+    counter = 0
+    # Nodes in the queue, by lowest f score and then deepest, and the
+    # leaves among them, by highest f score and then shallowest. Entries
+    # of nodes that changed since they were pushed are skipped.
+    open_heap: list[tuple[float, int, int, int, _MemoryNode]] = []
+    leaf_heap: list[tuple[float, int, int, int, _MemoryNode]] = []
+    # The cheapest node in memory of every state.
+    in_memory: dict[Hashable, _MemoryNode] = {}
+    used = 0
+
+    def queue(node: _MemoryNode) -> None:
+        nonlocal counter
+        node.in_queue = True
+        node.version += 1
+        entry = (node.f, -node.depth, counter, node.version, node)
+        heapq.heappush(open_heap, entry)
+        heapq.heappush(leaf_heap, (-node.f, node.depth, counter, node.version, node))
+        counter += 1
+
+    def compact() -> None:
+        nonlocal open_heap, leaf_heap
+        queued = [
+            node
+            for _, _, _, version, node in open_heap
+            if node.in_queue and version == node.version
+        ]
+        open_heap = []
+        leaf_heap = []
+        for node in queued:
+            queue(node)
+
+    def expand(
+        state: Hashable, parent: _MemoryNode | None
+    ) -> list[tuple[Hashable, float]]:
+        excluded = parent.state if parent is not None else None
+        return [
+            (successor, cost)
+            for successor, cost in successors(state)
+            if successor != excluded
+        ]
+
+    def create(
+        state: Hashable,
+        g: float,
+        parent: _MemoryNode | None,
+        f: float,
+        state_successors: list[tuple[Hashable, float]] | None = None,
+    ) -> _MemoryNode:
+        nonlocal used
+        if state_successors is None:
+            state_successors = expand(state, parent)
+        node = _MemoryNode(state, g, parent, f, state_successors)
+        in_memory[state] = node
+        used += 1
+        return node
+
+    def backup(node: _MemoryNode) -> None:
+        while node is not None and node.cursor == len(node.successors):
+            f = min(
+                [child.f for child in node.children] + list(node.forgotten.values()),
+                default=math.inf,
+            )
+            if f == node.f:
+                return
+            node.f = f
+            if node.in_queue:
+                queue(node)
+            node = node.parent
+
+    def forget(current: _MemoryNode) -> bool:
+        nonlocal used
+        while leaf_heap:
+            _, _, _, version, leaf = heapq.heappop(leaf_heap)
+            if (
+                version != leaf.version
+                or not leaf.in_queue
+                or leaf.children
+                or leaf is current
+                or leaf.parent is None
+            ):
+                continue
+            parent = leaf.parent
+            parent.children.remove(leaf)
+            parent.forgotten[leaf.state] = leaf.f
+            leaf.in_queue = False
+            if in_memory.get(leaf.state) is leaf:
+                del in_memory[leaf.state]
+            used -= 1
+            if not parent.in_queue:
+                queue(parent)
+            elif not parent.children:
+                # Queued again so it becomes a candidate leaf.
+                queue(parent)
+            return True
+        return False
+
+    root = create(start, 0, None, heuristic(start))
+    queue(root)
+    root_f = root.f
+    stalled = 0
+    stall_steps = max(STALL_FACTOR * node_budget, MIN_STALL_STEPS)
+    while open_heap:
+        f, _, _, version, best = open_heap[0]
+        if version != best.version or not best.in_queue:
+            heapq.heappop(open_heap)
+            continue
+        if f == math.inf:
+            return None
+        if best.state == goal:
+            history.add_step(inspected=[goal], path=best)
+            return best
+
+        # Generate the next successor, or the forgotten one with the
+        # lowest f score once every successor was generated.
+        expanded = best.cursor == 0
+        if best.cursor < len(best.successors):
+            state, cost = best.successors[best.cursor]
+            best.cursor += 1
+            g = best.g + cost
+            known = in_memory.get(state)
+            child_f = math.inf
+            # Dominated states and branches that cannot reach the goal
+            # within the budget are not generated. The successors are kept
+            # for the node of the state, which needs them anyway.
+            if known is None or known.g > g:
+                state_successors = expand(state, best)
+                if state == goal or (
+                    state_successors and best.depth + 1 < node_budget - 1
+                ):
+                    child_f = max(best.f, g + heuristic(state))
+        else:
+            state_successors = None
+            state = min(best.forgotten, key=best.forgotten.__getitem__)
+            child_f = best.forgotten.pop(state)
+            g = best.g + dict(best.successors)[state]
+            known = in_memory.get(state)
+            if known is not None and known.g <= g:
+                child_f = math.inf
+
+        generated = []
+        if child_f == math.inf:
+            best.forgotten[state] = math.inf
+        else:
+            if used >= node_budget and not forget(best):
+                best.forgotten[state] = child_f
+            else:
+                child = create(state, g, best, child_f, state_successors)
+                best.children.append(child)
+                queue(child)
+                generated.append(state)
+        history.add_step(
+            generated=generated,
+            inspected=[best.state] if expanded else [],
+            path=best,
+        )
+
+        backup(best)
+        if root.f != root_f:
+            root_f = root.f
+            stalled = 0
+        else:
+            stalled += 1
+            if stalled > stall_steps:
+                return None
+        # Nodes stay queued while they have successors to generate. Once
+        # they have none left, only those without children stay, so they
+        # can still be forgotten.
+        if (
+            best.cursor < len(best.successors)
+            or any(value != math.inf for value in best.forgotten.values())
+            or not best.children
+        ):
+            queue(best)
+        else:
+            best.in_queue = False
+        if len(open_heap) > 4 * node_budget:
+            compact()
+    return None
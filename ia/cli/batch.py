@@ -0,0 +1,679 @@
+"""Batch command."""
+
+import csv
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Annotated, Any
+
+import typer
+from rich.console import Console
+
+from ia.algorithm import (
+    HistoryMode,
+    HistoryPolicy,
+    InformedTraversalAlgorithm,
+    SearchMode,
+    TraversalResult,
+    UninformedTraversalAlgorithm,
+)
+from ia.bounded import DEFAULT_NODE_BUDGET
+from ia.cli.informed import (
+    GRAPH_ALGORITHMS,
+    print_graph_report,
+    print_report,
+    search_graph,
+    search_maze,
+)
+from ia.frontier import Frontier
+from ia.graph.parser import parse_and_transform as parse_graph
+from ia.maze import Maze
+from ia.maze.euristics import Euristic
+from ia.maze.hierarchy import DEFAULT_CLUSTER_SIZE
+from ia.maze.matrix import MatrixPosition
+from ia.maze.parser import parse as parse_maze
+
+SUMMARY_FIELDS = (
+    "Instance",
+    "Algorithm",
+    "n",
+    "m",
+    "S",
+    "E",
+    "Path",
+    "Cost",
+    "Nº Nodes generated",
+    "Nº Nodes inspected",
+    "Execution time",
+    "Status",
+)
+"""The columns of the summary, the ones of the ``informed`` table first."""
+
+
+@dataclass(frozen=True)
+class BatchInstance:
+    """One search of a batch.
+
+    Mazes are searched between their own start and goal unless ``start``
+    or ``goal`` are given as ``(row, col)`` pairs. Graphs need both, as
+    vertices.
+    """
+
+    path: Path
+    name: str
+    graph: bool = False
+    algorithm: str = InformedTraversalAlgorithm.A_STAR.value
+    euristic: Euristic = Euristic.MANHATTAN
+    start: tuple[int, int] | int | None = None
+    goal: tuple[int, int] | int | None = None
+
+
+@dataclass(frozen=True)
+class BatchSettings:
+    """The options shared by every search of a batch."""
+
+    output_path: Path
+    history_policy: HistoryPolicy
+    search_mode: SearchMode = SearchMode.GRAPH
+    frontier: Frontier = Frontier.HEAP
+    cluster_size: int = DEFAULT_CLUSTER_SIZE
+    node_budget: int = DEFAULT_NODE_BUDGET
+    epsilon: float = 1.0
+    time_budget: float | None = None
+    pretty: bool = False
+    plot: bool = False
+
+
+def batch(
+    input_path: Annotated[
+        Path,
+        typer.Argument(
+            help=(
+                "A directory of maze or graph files, or a JSON manifest with "
+                "one object per search."
+            ),
+            exists=True,
+            file_okay=True,
+            dir_okay=True,
+            readable=True,
+            resolve_path=True,
+        ),
+    ],
+    output_path: Annotated[
+        Path,
+        typer.Option(
+            "--output",
+            "-o",
+            help="The directory for the output of every search and the summary.",
+            writable=True,
+            resolve_path=True,
+            dir_okay=True,
+        ),
+    ],
+    summary_path: Annotated[
+        Path | None,
+        typer.Option(
+            "--summary",
+            help=(
+                "The summary file, in JSON if it ends in .json and in CSV "
+                "otherwise. Defaults to summary.csv in the output directory."
+            ),
+            dir_okay=False,
+            resolve_path=True,
+        ),
+    ] = None,
+    workers: Annotated[
+        int | None,
+        typer.Option(
+            help="The number of worker processes. Defaults to the number of CPUs.",
+            min=1,
+        ),
+    ] = None,
+    pattern: Annotated[
+        str,
+        typer.Option(
+            help="The files of the input directory to search.",
+        ),
+    ] = "*.txt",
+    graph: Annotated[
+        bool | None,
+        typer.Option(
+            "--graph",
+            help="Treat the files of the input directory as graphs.",
+        ),
+    ] = None,
+    algorithm: Annotated[
+        str,
+        typer.Option(
+            help=(
+                "The search of the entries that do not set one. Any informed "
+                "algorithm on mazes, and any uninformed one or a_star, "
+                "ida_star and sma_star on graphs."
+            ),
+        ),
+    ] = InformedTraversalAlgorithm.A_STAR.value,
+    euristic: Annotated[
+        Euristic,
+        typer.Option(
+            "--euristic",
+            "-e",
+            help="The euristic of the maze entries that do not set one.",
+        ),
+    ] = Euristic.MANHATTAN,
+    start_vertex: Annotated[
+        int | None,
+        typer.Option(
+            help="The start vertex of the graph entries that do not set one.",
+        ),
+    ] = None,
+    goal_vertex: Annotated[
+        int | None,
+        typer.Option(
+            help="The goal vertex of the graph entries that do not set one.",
+        ),
+    ] = None,
+    history: Annotated[
+        HistoryMode,
+        typer.Option(
+            help="Which iterations of the searches to record and print.",
+        ),
+    ] = HistoryMode.FULL,
+    history_size: Annotated[
+        int,
+        typer.Option(
+            help="Sampling interval for `every` or amount of iterations for `last`.",
+            min=1,
+        ),
+    ] = 10,
+    mode: Annotated[
+        SearchMode,
+        typer.Option(
+            help="The search mode of the uninformed graph searches.",
+        ),
+    ] = SearchMode.GRAPH,
+    frontier: Annotated[
+        Frontier,
+        typer.Option(
+            help="The priority queue of the maze searches.",
+        ),
+    ] = Frontier.HEAP,
+    cluster_size: Annotated[
+        int,
+        typer.Option(
+            help="The side of the clusters of `hpa_star`.",
+            min=2,
+        ),
+    ] = DEFAULT_CLUSTER_SIZE,
+    node_budget: Annotated[
+        int,
+        typer.Option(
+            help="The largest number of search nodes of `ida_star` and `sma_star`.",
+            min=2,
+        ),
+    ] = DEFAULT_NODE_BUDGET,
+    epsilon: Annotated[
+        float,
+        typer.Option(
+            help="The weight of the euristic of `a_star` on mazes.",
+            min=1.0,
+        ),
+    ] = 1.0,
+    time_budget: Annotated[
+        float | None,
+        typer.Option(
+            help="Seconds to improve the path of `a_star` on mazes (ARA*).",
+            min=0.0,
+        ),
+    ] = None,
+    pretty: Annotated[
+        bool | None,
+        typer.Option(
+            help="Use the detailed maze representation.",
+        ),
+    ] = None,
+    plot: Annotated[
+        bool | None,
+        typer.Option(
+            help="Save a plot of every maze search.",
+        ),
+    ] = None,
+):
+    """Run the searches of a directory or a manifest in a pool of processes.
+
+    Every search writes its own output, as ``ia informed`` and
+    ``ia uninformed`` would, and one row of a summary.
+    """
+    console = Console()
+    defaults = {
+        "algorithm": algorithm,
+        "euristic": euristic,
+        "start": start_vertex if graph else None,
+        "goal": goal_vertex if graph else None,
+    }
+    try:
+        if input_path.is_dir():
+            instances = instances_from_directory(
+                input_path, pattern, graph=bool(graph), **defaults
+            )
+        else:
+            instances = instances_from_manifest(input_path, **defaults)
+    except (OSError, TypeError, ValueError) as error:
+        console.print(f"[red]error[/red]: {error}")
+        raise typer.Exit(1) from error
+    if not instances:
+        console.print("\nNo instances to search.", style="yellow bold")
+        raise typer.Exit(1)
+    if (epsilon != 1.0 or time_budget is not None) and frontier != Frontier.HEAP:
+        console.print(
+            "\n--epsilon and --time-budget need the heap frontier.", style="red bold"
+        )
+        raise typer.Exit(1)
+
+    output_path.mkdir(parents=True, exist_ok=True)
+    settings = BatchSettings(
+        output_path=output_path,
+        history_policy=HistoryPolicy(history, history_size),
+        search_mode=mode,
+        frontier=frontier,
+        cluster_size=cluster_size,
+        node_budget=node_budget,
+        epsilon=epsilon,
+        time_budget=time_budget,
+        pretty=bool(pretty),
+        plot=bool(plot),
+    )
+    rows = run_batch(instances, settings, workers, console)
+
+    if summary_path is None:
+        summary_path = output_path / "summary.csv"
+    write_summary(rows, summary_path)
+    print_summary(console, rows)
+    console.print(f"\nSummary saved to {summary_path}.", style="green")
+    if any(row["Status"].startswith("error") for row in rows):
+        raise typer.Exit(1)
+
+
+def instances_from_directory(
+    directory: Path,
+    pattern: str = "*.txt",
+    *,
+    graph: bool = False,
+    **defaults: Any,
+) -> list[BatchInstance]:
+    """Get one search per file of a directory, in name order.
+
+    Parameters
+    ----------
+        directory: Path
+            The directory.
+        pattern: str
+            The glob pattern of the files to search.
+        graph: bool
+            Whether the files are graphs instead of mazes.
+        defaults: Any
+            The other fields of every :class:`BatchInstance`.
+    """
+    return [
+        BatchInstance(path=path, name=path.stem, graph=graph, **defaults)
+        for path in sorted(directory.glob(pattern))
+        if path.is_file()
+    ]
+
+
+def instances_from_manifest(path: Path, **defaults: Any) -> list[BatchInstance]:
+    """Read the searches of a JSON manifest.
+
+    The manifest is a list of objects with the ``path`` of the input file,
+    relative to the manifest, and optionally the ``name`` of its outputs
+    and any other field of :class:`BatchInstance`. Fields that are not set
+    are taken from ``defaults``. Entries with the same name get a numbered
+    suffix, so their outputs do not overwrite each other.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as directory:
+    ...     manifest = Path(directory) / "manifest.json"
+    ...     _ = manifest.write_text(
+    ...         '[{"path": "M_1.txt"}, {"path": "M_1.txt", "start": [1, 1]},'
+    ...         ' {"path": "Grafo1.txt", "graph": true, "algorithm": "bfs",'
+    ...         ' "start": 1, "goal": 5}]'
+    ...     )
+    ...     instances = instances_from_manifest(manifest)
+    >>> [(instance.name, instance.start) for instance in instances]
+    [('M_1', None), ('M_1_2', (1, 1)), ('Grafo1', 1)]
+
+    Raises
+    ------
+    TypeError
+        If the manifest is not a list.
+    ValueError
+        If the manifest is not valid JSON or a search is not an object
+        with a path.
+    """
+    with open(path) as manifest_file:
+        try:
+            entries = json.load(manifest_file)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"Invalid manifest {path}: {error}") from error
+    if not isinstance(entries, list):
+        raise TypeError(f"The manifest {path} must be a list of searches.")
+    instances = []
+    names: dict[str, int] = {}
+    for entry in entries:
+        if not isinstance(entry, dict) or "path" not in entry:
+            raise ValueError(f"Every search of the manifest needs a path: {entry}")
+        fields = {**defaults, **entry}
+        input_path = path.parent / fields.pop("path")
+        name = fields.pop("name", input_path.stem)
+        names[name] = names.get(name, 0) + 1
+        if names[name] > 1:
+            name = f"{name}_{names[name]}"
+        for field in ("start", "goal"):
+            if isinstance(fields.get(field), list):
+                fields[field] = tuple(fields[field])
+        if "euristic" in fields:
+            fields["euristic"] = Euristic(fields["euristic"])
+        try:
+            instances.append(BatchInstance(path=input_path, name=name, **fields))
+        except TypeError as error:
+            raise ValueError(f"Invalid search {entry}: {error}") from error
+    return instances
+
+
+def run_batch(
+    instances: list[BatchInstance],
+    settings: BatchSettings,
+    workers: int | None = None,
+    console: Console | None = None,
+) -> list[dict[str, Any]]:
+    """Run the searches of a batch in a pool of processes.
+
+    Parameters
+    ----------
+        instances: list[BatchInstance]
+            The searches.
+        settings: BatchSettings
+            The options shared by every search.
+        workers: int | None
+            The number of worker processes. Defaults to the number of CPUs.
+            With a single worker the searches run in this process.
+        console: Console | None
+            Where to report each search as it finishes.
+
+    Returns
+    -------
+        list[dict[str, Any]]
+            The summary row of every search, in the order of ``instances``.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    rows: list[dict[str, Any] | None] = [None] * len(instances)
+
+    def report(index: int, row: dict[str, Any]) -> None:
+        rows[index] = row
+        if console is not None:
+            done = sum(row is not None for row in rows)
+            console.print(
+                f"[{done}/{len(rows)}] {row['Instance']}: {row['Status']}",
+                highlight=False,
+            )
+
+    if workers == 1:
+        for index, instance in enumerate(instances):
+            try:
+                row = run_instance(instance, settings)
+            except Exception as error:  # noqa: BLE001
+                row = error_row(instance, error)
+            report(index, row)
+        return rows
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(run_instance, instance, settings): index
+            for index, instance in enumerate(instances)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            # Bugs in a search, or a worker that died, fail only its row.
+            try:
+                row = future.result()
+            except Exception as error:  # noqa: BLE001
+                row = error_row(instances[index], error)
+            report(index, row)
+    return rows
+
+
+def run_instance(instance: BatchInstance, settings: BatchSettings) -> dict[str, Any]:
+    """Run one search of a batch and write its output.
+
+    Inputs that cannot be read or searched are reported in the ``Status``
+    of the row. :func:`run_batch` does the same with any other error, so
+    one bad input does not stop the batch.
+
+    Returns
+    -------
+        dict[str, Any]
+            The summary row of the search, with the :data:`SUMMARY_FIELDS`.
+    """
+    try:
+        with open(instance.path) as input_file:
+            text = input_file.read()
+        if instance.graph:
+            fields = run_graph_instance(instance, settings, text)
+        else:
+            fields = run_maze_instance(instance, settings, text)
+    except (OSError, ValueError) as error:
+        return error_row(instance, error)
+    row = dict.fromkeys(SUMMARY_FIELDS, "-")
+    row["Instance"] = instance.name
+    row["Algorithm"] = instance.algorithm
+    row.update(fields)
+    return row
+
+
+def error_row(instance: BatchInstance, error: BaseException) -> dict[str, Any]:
+    """Get the summary row of a search that failed."""
+    row = dict.fromkeys(SUMMARY_FIELDS, "-")
+    row["Instance"] = instance.name
+    row["Algorithm"] = instance.algorithm
+    row["Status"] = f"error: {error}"
+    return row
+
+
+def maze_position(maze: Maze, value: Any, name: str) -> MatrixPosition:
+    """Check that a ``(row, col)`` pair is a cell of the maze.
+
+    Raises
+    ------
+    ValueError
+        If the pair is not two integers inside the maze.
+    """
+    if (
+        not isinstance(value, tuple | list)
+        or len(value) != 2
+        or not all(isinstance(coordinate, int) for coordinate in value)
+    ):
+        raise ValueError(f"The {name} must be a (row, col) pair: {value}")
+    row, col = value
+    if not (0 <= row < maze.rows and 0 <= col < maze.cols):
+        raise ValueError(
+            f"The {name} {tuple(value)} is outside the {maze.rows}x{maze.cols} maze."
+        )
+    return MatrixPosition(row, col)
+
+
+def run_maze_instance(
+    instance: BatchInstance, settings: BatchSettings, text: str
+) -> dict[str, Any]:
+    """Search a maze, see :func:`run_instance`."""
+    algorithm = InformedTraversalAlgorithm(instance.algorithm)
+    weighted = settings.epsilon != 1.0 or settings.time_budget is not None
+    if weighted and algorithm != InformedTraversalAlgorithm.A_STAR:
+        raise ValueError("--epsilon and --time-budget are only available with a_star.")
+    maze = parse_maze(text)
+    if instance.start is not None:
+        maze.start = maze_position(maze, instance.start, "start")
+    if instance.goal is not None:
+        maze.goal = maze_position(maze, instance.goal, "goal")
+    if maze.start is None or maze.goal is None:
+        raise ValueError("A maze search needs a start and a goal.")
+    euristic_func = instance.euristic
+    if euristic_func == Euristic.LANDMARKS:
+        # Picked here instead of read from a file next to the input, which
+        # several searches of the batch could be writing at once.
+        euristic_func = maze.landmarks()
+
+    start_time = time.time()
+    result = search_maze(
+        maze,
+        algorithm,
+        euristic_func,
+        settings.history_policy,
+        frontier=settings.frontier,
+        cluster_size=settings.cluster_size,
+        node_budget=settings.node_budget,
+        epsilon=settings.epsilon,
+        time_budget=settings.time_budget,
+    )
+    execution_time = time.time() - start_time
+
+    output_path = settings.output_path
+    with open(output_path / f"{instance.name}_out.txt", "w") as output_file:
+        print_report(
+            Console(file=output_file),
+            instance.name,
+            maze,
+            "detailed" if settings.pretty else "simple",
+            algorithm,
+            instance.euristic,
+            execution_time,
+            result,
+            bound=weighted,
+        )
+    if settings.plot:
+        maze.plot(
+            path=result.path,
+            title=instance.name,
+            file_path=output_path / f"{instance.name}_plot.png",
+        )
+    return summary_row(
+        result,
+        execution_time,
+        n=maze.rows,
+        m=maze.cols,
+        start=maze.start,
+        goal=maze.goal,
+        path=[node.position for node in result.path] if result.path else None,
+    )
+
+
+def run_graph_instance(
+    instance: BatchInstance, settings: BatchSettings, text: str
+) -> dict[str, Any]:
+    """Search a graph, see :func:`run_instance`."""
+    if instance.algorithm in UninformedTraversalAlgorithm:
+        algorithm = UninformedTraversalAlgorithm(instance.algorithm)
+    else:
+        algorithm = InformedTraversalAlgorithm(instance.algorithm)
+        if algorithm not in GRAPH_ALGORITHMS:
+            raise ValueError(f"Algorithm {algorithm.value} is only available on mazes.")
+    start, goal = instance.start, instance.goal
+    if start is None or goal is None:
+        raise ValueError("A graph search needs a start and a goal vertex.")
+    graph = parse_graph(text)
+    if graph is None:
+        raise ValueError("Failed to parse the graph.")
+    for vertex in (start, goal):
+        if vertex not in graph.vertices:
+            raise ValueError(f"Vertex {vertex} not in the graph.")
+
+    start_time = time.time()
+    if isinstance(algorithm, UninformedTraversalAlgorithm):
+        result = graph.traverse(
+            start=start,
+            end=goal,
+            algorithm=algorithm,
+            history_policy=settings.history_policy,
+            search_mode=settings.search_mode,
+        )
+    else:
+        result = search_graph(
+            graph,
+            algorithm,
+            start,
+            goal,
+            {},
+            settings.history_policy,
+            settings.node_budget,
+        )
+    execution_time = time.time() - start_time
+
+    with open(settings.output_path / f"{instance.name}_out.txt", "w") as output_file:
+        print_graph_report(
+            output_file, graph, algorithm, start, goal, execution_time, result
+        )
+    return summary_row(
+        result,
+        execution_time,
+        n=len(graph.vertices),
+        m=len(graph.edges),
+        start=start,
+        goal=goal,
+        path=[node.id for node in result.path] if result.path else None,
+    )
+
+
+def summary_row(
+    result: TraversalResult,
+    execution_time: float,
+    *,
+    n: int,
+    m: int,
+    start: Any,
+    goal: Any,
+    path: list | None,
+) -> dict[str, Any]:
+    """Get the summary fields of a search that ran."""
+    return {
+        "n": n,
+        "m": m,
+        "S": str(start),
+        "E": str(goal),
+        "Path": " -> ".join(str(step) for step in path) if path else "-",
+        "Cost": result.cost if path else -1,
+        "Nº Nodes generated": result.generated_count,
+        "Nº Nodes inspected": result.inspected_count,
+        "Execution time": round(execution_time, 4),
+        "Status": "ok" if path else "no path",
+    }
+
+
+def write_summary(rows: list[dict[str, Any]], path: Path) -> None:
+    """Write the summary rows to a JSON file if its name ends in .json, or CSV."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="") as summary_file:
+        if path.suffix.lower() == ".json":
+            json.dump(rows, summary_file, indent=2, ensure_ascii=False)
+            summary_file.write("\n")
+            return
+        writer = csv.DictWriter(summary_file, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def print_summary(console: Console, rows: list[dict[str, Any]]) -> None:
+    """Print the summary rows as a table, like ``ia informed`` does for one."""
+    from tabulate import tabulate
+
+    table_str = tabulate(
+        [[row[field] for field in SUMMARY_FIELDS] for row in rows],
+        headers=SUMMARY_FIELDS,
+        tablefmt="fancy_grid",
+        maxcolwidths=30,
+        maxheadercolwidths=math.inf,
+    )
+    console.print(table_str, crop=False, overflow="ignore")
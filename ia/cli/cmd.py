@@ -10,6 +10,7 @@ import typer
 from rich.console import Console
 
 from ia import __version__
+from ia.cli.batch import batch
 from ia.cli.informed import informed
 from ia.cli.uninformed import uninformed
 from ia.graph.parser import parse_and_transform
@@ -20,6 +21,7 @@ def run():
     app = typer.Typer(pretty_exceptions_show_locals=False)
     app.command("uninformed")(uninformed)
     app.command("informed")(informed)
+    app.command("batch")(batch)
     # This callback is needed to force typer to use
     # subcommands even when there is only one command.
     app.callback()(callback)
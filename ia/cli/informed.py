@@ -1,21 +1,55 @@
 """Informed search command."""
 
 import math
+import sys
 import time
+from collections.abc import Callable, Mapping
 from pathlib import Path
-from typing import Annotated, Literal
+from typing import Annotated, Literal, TextIO
 
 import typer
 from rich.console import Console
 from rich.text import Text
 
-from ia.algorithm import TraversalResult
+from ia.algorithm import (
+    HistoryMode,
+    HistoryPolicy,
+    InformedTraversalAlgorithm,
+    TraversalResult,
+    UninformedTraversalAlgorithm,
+)
+from ia.bounded import DEFAULT_NODE_BUDGET
+from ia.cli.uninformed import print_result as print_graph_result
 from ia.cli.utils import wrap_text
+from ia.frontier import Frontier
+from ia.graph import BaseGraph
+from ia.graph.heuristics import parse_heuristic_table
+from ia.graph.landmarks import Landmarks as GraphLandmarks
+from ia.graph.parser import parse_and_transform as parse_graph
 from ia.maze import Maze
 from ia.maze.euristics import Euristic
+from ia.maze.hierarchy import DEFAULT_CLUSTER_SIZE
+from ia.maze.landmarks import Landmarks, maze_fingerprint
 from ia.maze.matrix import MatrixPosition
 from ia.maze.parser import parse as parse_maze
 
+ALGORITHM_NAMES = {
+    InformedTraversalAlgorithm.A_STAR: "A*",
+    InformedTraversalAlgorithm.JUMP_POINT_SEARCH: "JPS",
+    InformedTraversalAlgorithm.DISTANCE_FIELD: "Distance field",
+    InformedTraversalAlgorithm.HPA_STAR: "HPA*",
+    InformedTraversalAlgorithm.IDA_STAR: "IDA*",
+    InformedTraversalAlgorithm.SMA_STAR: "SMA*",
+}
+"""The name printed for each algorithm."""
+
+GRAPH_ALGORITHMS = (
+    InformedTraversalAlgorithm.A_STAR,
+    InformedTraversalAlgorithm.IDA_STAR,
+    InformedTraversalAlgorithm.SMA_STAR,
+)
+"""The algorithms available on graphs."""
+
 
 def informed(
     input_path: Annotated[
@@ -75,6 +109,12 @@ def informed(
             help="Do not print the header.",
         ),
     ] = None,
+    algorithm: Annotated[
+        InformedTraversalAlgorithm,
+        typer.Option(
+            help="Traversal algorithm to use.",
+        ),
+    ] = InformedTraversalAlgorithm.A_STAR,
     euristic: Annotated[
         Euristic,
         typer.Option(
@@ -89,10 +129,143 @@ def informed(
             help="The suffix for the output file.",
         ),
     ] = None,
+    history: Annotated[
+        HistoryMode,
+        typer.Option(
+            help="Which iterations of the search to record and print.",
+        ),
+    ] = HistoryMode.FULL,
+    history_size: Annotated[
+        int,
+        typer.Option(
+            help="Sampling interval for `every` or amount of iterations for `last`.",
+            min=1,
+        ),
+    ] = 10,
+    frontier: Annotated[
+        Frontier,
+        typer.Option(
+            help="The priority queue of the maze search.",
+        ),
+    ] = Frontier.HEAP,
+    cluster_size: Annotated[
+        int,
+        typer.Option(
+            help="The side of the clusters of `hpa_star`.",
+            min=2,
+        ),
+    ] = DEFAULT_CLUSTER_SIZE,
+    node_budget: Annotated[
+        int,
+        typer.Option(
+            help="The largest number of search nodes of `ida_star` and `sma_star`.",
+            min=2,
+        ),
+    ] = DEFAULT_NODE_BUDGET,
+    epsilon: Annotated[
+        float,
+        typer.Option(
+            help=(
+                "The weight of the euristic of `a_star`. Above 1, the path "
+                "costs at most that many times the optimal one."
+            ),
+            min=1.0,
+        ),
+    ] = 1.0,
+    time_budget: Annotated[
+        float | None,
+        typer.Option(
+            help=(
+                "Seconds to improve the path of `a_star`, lowering --epsilon "
+                "towards 1 after each path found (ARA*)."
+            ),
+            min=0.0,
+        ),
+    ] = None,
+    graph: Annotated[
+        bool | None,
+        typer.Option(
+            "--graph",
+            help="Treat the input as a graph file instead of a maze.",
+        ),
+    ] = None,
+    start_vertex: Annotated[
+        int | None,
+        typer.Option(
+            help="The start vertex when searching a graph.",
+        ),
+    ] = None,
+    goal_vertex: Annotated[
+        int | None,
+        typer.Option(
+            help="The goal vertex when searching a graph.",
+        ),
+    ] = None,
+    heuristic_table: Annotated[
+        Path | None,
+        typer.Option(
+            help="File with the estimated cost to the goal of each graph vertex.",
+            exists=True,
+            file_okay=True,
+            dir_okay=False,
+            readable=True,
+            resolve_path=True,
+        ),
+    ] = None,
+    landmarks: Annotated[
+        bool | None,
+        typer.Option(
+            "--landmarks",
+            help=(
+                "Use the landmark heuristic when searching a graph. The "
+                "landmarks are saved next to the input file and reused."
+            ),
+        ),
+    ] = None,
 ):
-    """Traverse a maze using an informed search algorithm."""
+    """Traverse a maze (or a graph) using an informed search algorithm."""
     console = Console()
 
+    history_policy = HistoryPolicy(history, history_size)
+    weighted = epsilon != 1.0 or time_budget is not None
+    if weighted and (graph or algorithm != InformedTraversalAlgorithm.A_STAR):
+        console.print(
+            "\n--epsilon and --time-budget are only available with a_star on mazes.",
+            style="red bold",
+        )
+        raise typer.Exit(1)
+    if weighted and frontier != Frontier.HEAP:
+        console.print(
+            "\n--epsilon and --time-budget need the heap frontier.", style="red bold"
+        )
+        raise typer.Exit(1)
+    if graph:
+        if algorithm not in GRAPH_ALGORITHMS:
+            console.print(
+                f"\nAlgorithm {algorithm.value} is only available on mazes.",
+                style="red bold",
+            )
+            raise typer.Exit(1)
+        if landmarks and heuristic_table is not None:
+            console.print(
+                "\n--landmarks and --heuristic-table cannot be used together.",
+                style="red bold",
+            )
+            raise typer.Exit(1)
+        informed_graph(
+            input_path,
+            output_path,
+            start_vertex,
+            goal_vertex,
+            heuristic_table,
+            suffix,
+            history_policy,
+            landmarks=bool(landmarks),
+            algorithm=algorithm,
+            node_budget=node_budget,
+        )
+        return
+
     if no_header and not plot:
         console.print("No header and no plot selected.", style="red bold")
         raise typer.Exit(1)
@@ -108,9 +281,32 @@ def informed(
     if goal is not None:
         maze.goal = MatrixPosition(goal[0], goal[1])
     print_style = "detailed" if pretty else "simple"
+    if not maze.connected():
+        console.print(
+            "\nThe goal cannot be reached from the start.",
+            style="yellow bold",
+        )
+
+    euristic_func = euristic
+    if euristic == Euristic.LANDMARKS and algorithm != (
+        InformedTraversalAlgorithm.DISTANCE_FIELD
+    ):
+        euristic_func = load_maze_landmarks(
+            maze, landmarks_path(input_path, maze_fingerprint(maze)), console
+        )
 
     start_time = time.time()
-    result = maze.a_star(euristic_func=euristic.to_function())
+    result = search_maze(
+        maze,
+        algorithm,
+        euristic_func,
+        history_policy,
+        frontier=frontier,
+        cluster_size=cluster_size,
+        node_budget=node_budget,
+        epsilon=epsilon,
+        time_budget=time_budget,
+    )
     end_time = time.time()
     execution_time = end_time - start_time
 
@@ -129,11 +325,17 @@ def informed(
     )  # noqa: E501
 
     console = Console(file=output_text_file)
-    console.print("Algorithm: A*", style="blue bold")
-    console.print(f"Euristic: {euristic.value}", style="blue bold")
-    console.print(f"Execution time: {execution_time:.4f} seconds", style="blue bold")
-
-    print_result(console, input_file_name, maze, print_style, result)
+    print_report(
+        console,
+        input_file_name,
+        maze,
+        print_style,
+        algorithm,
+        euristic,
+        execution_time,
+        result,
+        bound=weighted,
+    )
 
     plot_file_name = (
         input_file_name + "_plot.png"
@@ -149,6 +351,288 @@ def informed(
     ) if plot else None
 
 
+def search_maze(
+    maze: Maze,
+    algorithm: InformedTraversalAlgorithm,
+    euristic_func: Euristic | Landmarks,
+    history_policy: HistoryPolicy,
+    *,
+    frontier: Frontier = Frontier.HEAP,
+    cluster_size: int = DEFAULT_CLUSTER_SIZE,
+    node_budget: int = DEFAULT_NODE_BUDGET,
+    epsilon: float = 1.0,
+    time_budget: float | None = None,
+) -> TraversalResult:
+    """Search a maze between its start and goal with an informed algorithm.
+
+    Parameters
+    ----------
+        maze: Maze
+            The maze.
+        algorithm: InformedTraversalAlgorithm
+            The search.
+        euristic_func: Euristic | Landmarks
+            The euristic. Ignored by the distance field.
+        history_policy: HistoryPolicy
+            Which iterations of the search to record.
+        frontier: Frontier
+            The priority queue of A*, JPS and HPA*.
+        cluster_size: int
+            The side of the clusters of HPA*.
+        node_budget: int
+            The largest number of search nodes of IDA* and SMA*.
+        epsilon: float
+            The weight of the euristic of A*.
+        time_budget: float | None
+            Seconds to improve the path of A* (ARA*).
+    """
+    if algorithm == InformedTraversalAlgorithm.JUMP_POINT_SEARCH:
+        return maze.jump_point_search(
+            euristic_func=euristic_func,
+            history_policy=history_policy,
+            frontier=frontier,
+        )
+    if algorithm == InformedTraversalAlgorithm.DISTANCE_FIELD:
+        return maze.field_path(history_policy=history_policy)
+    if algorithm in (
+        InformedTraversalAlgorithm.IDA_STAR,
+        InformedTraversalAlgorithm.SMA_STAR,
+    ):
+        search = (
+            maze.ida_star
+            if algorithm == InformedTraversalAlgorithm.IDA_STAR
+            else maze.sma_star
+        )
+        return search(
+            euristic_func=euristic_func,
+            history_policy=history_policy,
+            node_budget=node_budget,
+        )
+    if algorithm == InformedTraversalAlgorithm.HPA_STAR:
+        return maze.hierarchical_search(
+            euristic_func=euristic_func,
+            history_policy=history_policy,
+            frontier=frontier,
+            cluster_size=cluster_size,
+        )
+    # Every built-in euristic is consistent with the default 5/7 move costs.
+    return maze.a_star(
+        euristic_func=euristic_func,
+        history_policy=history_policy,
+        consistent=True,
+        frontier=frontier,
+        epsilon=epsilon,
+        time_budget=time_budget,
+    )
+
+
+def informed_graph(
+    input_path: Path,
+    output_path: Path | None,
+    start: int | None,
+    goal: int | None,
+    heuristic_table: Path | None,
+    suffix: str | None,
+    history_policy: HistoryPolicy,
+    landmarks: bool = False,
+    algorithm: InformedTraversalAlgorithm = InformedTraversalAlgorithm.A_STAR,
+    node_budget: int = DEFAULT_NODE_BUDGET,
+):
+    """Search a graph file with A* or a memory-bounded variant.
+
+    Parameters
+    ----------
+        input_path: Path
+            The path to the graph file.
+        output_path: Path | None
+            The output directory. If not given, the result is printed.
+        start: int | None
+            The start vertex.
+        goal: int | None
+            The goal vertex.
+        heuristic_table: Path | None
+            The heuristic table file. If not given, the heuristic is 0.
+        suffix: str | None
+            The suffix for the output file.
+        history_policy: HistoryPolicy
+            Which iterations of the search to record.
+        landmarks: bool
+            Whether to use the landmark heuristic instead of a table.
+        algorithm: InformedTraversalAlgorithm
+            The search, one of :data:`GRAPH_ALGORITHMS`.
+        node_budget: int
+            The largest number of search nodes of IDA* and SMA*.
+    """
+    console = Console()
+    if start is None or goal is None:
+        console.print(
+            "A graph search needs --start-vertex and --goal-vertex.", style="red bold"
+        )
+        raise typer.Exit(1)
+    with open(input_path) as input_file:
+        graph = parse_graph(input_file.read())
+        if graph is None:
+            console.print("\nFailed to parse the graph.", style="red bold")
+            raise typer.Exit(1)
+    for vertex in (start, goal):
+        if vertex not in graph.vertices:
+            console.print(f"\nVertex {vertex} not in the graph.", style="red bold")
+            raise typer.Exit(1)
+    if not graph.connected(start, goal):
+        console.print(
+            f"\nVertex {goal} cannot be reached from {start}.",
+            style="yellow bold",
+        )
+    heuristic = {}
+    if landmarks:
+        heuristic = load_graph_landmarks(
+            graph, landmarks_path(input_path), console
+        ).heuristic
+    elif heuristic_table is not None:
+        with open(heuristic_table) as table_file:
+            try:
+                heuristic = parse_heuristic_table(table_file.read())
+            except ValueError as error:
+                console.print(f"[red]error[/red]: {error}")
+                raise typer.Exit(1) from error
+
+    start_time = time.time()
+    result = search_graph(
+        graph, algorithm, start, goal, heuristic, history_policy, node_budget
+    )
+    execution_time = time.time() - start_time
+
+    heuristic_name = "none"
+    if landmarks:
+        heuristic_name = "landmarks"
+    elif heuristic_table:
+        heuristic_name = heuristic_table.name
+    report = (graph, algorithm, start, goal, execution_time, result, heuristic_name)
+    if not output_path:
+        print_graph_report(sys.stdout, *report)
+        return
+    output_path.mkdir(parents=True, exist_ok=True)
+    output_file_name = (
+        input_path.stem + "_out.txt"
+        if not suffix
+        else input_path.stem + "_out_" + suffix + ".txt"
+    )
+    with open(output_path / output_file_name, "w") as output_file:
+        print_graph_report(output_file, *report)
+
+
+def search_graph(
+    graph: BaseGraph,
+    algorithm: InformedTraversalAlgorithm,
+    start: int,
+    goal: int,
+    heuristic: Callable[[int, int], float] | Mapping[int, float],
+    history_policy: HistoryPolicy,
+    node_budget: int = DEFAULT_NODE_BUDGET,
+) -> TraversalResult:
+    """Search a graph with one of :data:`GRAPH_ALGORITHMS`."""
+    options = {"heuristic": heuristic, "history_policy": history_policy}
+    if algorithm == InformedTraversalAlgorithm.IDA_STAR:
+        return graph.ida_star(start=start, end=goal, node_budget=node_budget, **options)
+    if algorithm == InformedTraversalAlgorithm.SMA_STAR:
+        return graph.sma_star(start=start, end=goal, node_budget=node_budget, **options)
+    return graph.a_star(start=start, end=goal, **options)
+
+
+def print_graph_report(
+    file: TextIO,
+    graph: BaseGraph,
+    algorithm: InformedTraversalAlgorithm | UninformedTraversalAlgorithm,
+    start: int,
+    goal: int,
+    execution_time: float,
+    result: TraversalResult,
+    heuristic_name: str | None = None,
+):
+    """Print the algorithm, heuristic and time of a graph search and its result."""
+    console = Console(file=file)
+    name = ALGORITHM_NAMES.get(algorithm, algorithm.value)
+    console.print(f"Algorithm: {name}", style="blue bold")
+    if heuristic_name is not None:
+        console.print(f"Heuristic: {heuristic_name}", style="blue bold")
+    console.print(f"Execution time: {execution_time:.4f} seconds", style="blue bold")
+    print_graph_result(graph, start, goal, algorithm, result, file=file)
+
+
+def landmarks_path(input_path: Path, fingerprint: str | None = None) -> Path:
+    """Get the path where the landmarks of an input file are saved.
+
+    Mazes give the fingerprint of their walls, which change when the
+    start or the goal are moved, so every layout keeps its own file.
+    """
+    if fingerprint is None:
+        return input_path.with_suffix(".landmarks.npz")
+    return input_path.with_suffix(f".{fingerprint[:12]}.landmarks.npz")
+
+
+def load_maze_landmarks(maze: Maze, path: Path, console: Console) -> Landmarks:
+    """Load the landmarks of the maze, picking and saving them if needed."""
+    if path.exists():
+        try:
+            landmarks = Landmarks.load(path)
+        except (OSError, ValueError, KeyError):
+            console.print(f"\nCould not read landmarks {path}.", style="yellow")
+        else:
+            if landmarks.matches(maze):
+                return landmarks
+            console.print(f"\nLandmarks {path} belong to another maze.", style="yellow")
+    landmarks = maze.landmarks()
+    landmarks.save(path)
+    console.print(f"\nLandmarks saved to {path}.", style="green")
+    return landmarks
+
+
+def load_graph_landmarks(
+    graph: BaseGraph, path: Path, console: Console
+) -> GraphLandmarks:
+    """Load the landmarks of the graph, picking and saving them if needed."""
+    if path.exists():
+        try:
+            landmarks = GraphLandmarks.load(path)
+        except (OSError, ValueError, KeyError):
+            console.print(f"\nCould not read landmarks {path}.", style="yellow")
+        else:
+            if landmarks.matches(graph):
+                return landmarks
+            console.print(
+                f"\nLandmarks {path} belong to another graph.", style="yellow"
+            )
+    landmarks = GraphLandmarks.from_graph(graph)
+    landmarks.save(path)
+    console.print(f"\nLandmarks saved to {path}.", style="green")
+    return landmarks
+
+
+def print_report(
+    console: Console,
+    input_file_name: str,
+    maze: Maze,
+    print_style: Literal["simple", "detailed"],
+    algorithm: InformedTraversalAlgorithm,
+    euristic: Euristic,
+    execution_time: float,
+    result: TraversalResult,
+    bound: bool = False,
+):
+    """Print the search settings and time, then the result of the traversal.
+
+    The suboptimality bound of the result is also printed if ``bound`` is
+    set. The other parameters are those of :func:`print_result`.
+    """
+    console.print(f"Algorithm: {ALGORITHM_NAMES[algorithm]}", style="blue bold")
+    console.print(f"Euristic: {euristic.value}", style="blue bold")
+    console.print(f"Execution time: {execution_time:.4f} seconds", style="blue bold")
+    if bound and result.bound is not None:
+        console.print(f"Suboptimality bound: {result.bound:.4f}", style="blue bold")
+
+    print_result(console, input_file_name, maze, print_style, result)
+
+
 def print_result(
     console: Console,
     input_file_name: str,
@@ -187,24 +671,24 @@ def print_result(
 
     width = 35
     divider = Text("-" * width, style="grey30")
-    for i, step in enumerate(result.history):
+    for step in result.history:
         console.print(divider)
-        console.print(Text(f"Iteration {i + 1}", style="red bold"))
+        console.print(Text(f"Iteration {step['step'] + 1}", style="red bold"))
         console.print(
             wrap_text(
-                f"Generated nodes: {", ".join(str(i) for i in step["generated"])}",
+                f"Generated nodes: {', '.join(str(i) for i in step['generated'])}",
                 width,
             )
         )
         console.print(
             wrap_text(
-                f"Inspected nodes: {", ".join(str(i) for i in step["inspected"])}",
+                f"Inspected nodes: {', '.join(str(i) for i in step['inspected'])}",
                 width,
             )
         )
         console.print(
             wrap_text(
-                f"Current path: {" -> ".join(str(i) for i in step["path"])}",
+                f"Current path: {' -> '.join(str(i) for i in step['path'])}",
                 width,
             )
         )
@@ -213,7 +697,7 @@ def print_result(
         console.print(
             Text("Path:", style="bold"),
             wrap_text(
-                f"{" -> ".join(str(i) for i in position_path)}",
+                f"{' -> '.join(str(i) for i in position_path)}",
                 width - 5,
             ),
         )
@@ -268,8 +752,8 @@ def print_table(
                 if result.path
                 else "-",
                 result.cost if result.path else -1,
-                len(result.history[-1]["generated"]),
-                len(result.history[-1]["inspected"]),
+                result.generated_count,
+                result.inspected_count,
             ),
         ],
     )
@@ -8,8 +8,15 @@ import typer
 from rich.console import Console
 from rich.text import Text
 
-from ia.algorithm import TraversalResult, UninformedTraversalAlgorithm
+from ia.algorithm import (
+    HistoryMode,
+    HistoryPolicy,
+    SearchMode,
+    TraversalResult,
+    UninformedTraversalAlgorithm,
+)
 from ia.cli.utils import wrap_text
+from ia.graph.distances import DistanceTable
 from ia.graph.parser.parser import parse_and_transform
 from ia.graph.undirected import UndirectedGraph
 from ia.tree.utils import print_tree
@@ -75,6 +82,37 @@ def uninformed(
             help="Force the execution of the command.",
         ),
     ] = None,
+    mode: Annotated[
+        SearchMode,
+        typer.Option(
+            help="Use a global visited set (graph) or only prune the branch (tree).",
+        ),
+    ] = SearchMode.GRAPH,
+    history: Annotated[
+        HistoryMode,
+        typer.Option(
+            help="Which iterations of the search to record and print.",
+        ),
+    ] = HistoryMode.FULL,
+    history_size: Annotated[
+        int,
+        typer.Option(
+            help="Sampling interval for `every` or amount of iterations for `last`.",
+            min=1,
+        ),
+    ] = 10,
+    table_path: Annotated[
+        Path | None,
+        typer.Option(
+            "--table",
+            help=(
+                "Distance table used by `all_pairs`. It is built and saved "
+                "there if it does not exist or belongs to another graph."
+            ),
+            dir_okay=False,
+            resolve_path=True,
+        ),
+    ] = None,
 ):
     """Traverse the graph using the specified algorithm."""
     console = Console()
@@ -98,13 +136,52 @@ def uninformed(
         if not force:
             raise typer.Exit(1)
         console.print("Forcing execution with invalid end node.", style="yellow bold")
+    elif not graph.connected(start, end):
+        console.print(
+            f"\nVertex {end} cannot be reached from {start}.",
+            style="yellow bold",
+        )
 
-    result = graph.traverse(start=start, end=end, algorithm=algorithm)
+    history_policy = HistoryPolicy(history, history_size)
+    if algorithm == UninformedTraversalAlgorithm.ALL_PAIRS and table_path is not None:
+        result = graph.table_path(
+            start=start,
+            end=end,
+            table=load_table(graph, table_path, console),
+            history_policy=history_policy,
+        )
+    else:
+        result = graph.traverse(
+            start=start,
+            end=end,
+            algorithm=algorithm,
+            history_policy=history_policy,
+            search_mode=mode,
+        )
     print_result(graph, start, end, algorithm, result, file=output_stream)
     if preview:
         print_tree(result.tree)
 
 
+def load_table(graph: UndirectedGraph, path: Path, console: Console) -> DistanceTable:
+    """Load the distance table of the graph, building and saving it if needed."""
+    if path.exists():
+        try:
+            table = DistanceTable.load(path)
+        except (OSError, ValueError, KeyError):
+            console.print(f"\nCould not read distance table {path}.", style="yellow")
+        else:
+            if table.matches(graph):
+                return table
+            console.print(
+                f"\nDistance table {path} belongs to another graph.", style="yellow"
+            )
+    table = graph.all_pairs()
+    table.save(path)
+    console.print(f"\nDistance table saved to {path}.", style="green")
+    return table
+
+
 def print_result(
     graph: UndirectedGraph,
     start: int,
@@ -122,18 +199,18 @@ def print_result(
     console.print(f"Number of edges: {len(graph.edges)}", style="green bold")
     console.print(f"Origin vertex: {start}", style="blue bold")
     console.print(f"Destination vertex: {end}", style="yellow bold")
-    for i, step in enumerate(result.history):
+    for step in result.history:
         console.print(divider)
-        console.print(Text(f"Iteration {i + 1}", style="red bold"))
+        console.print(Text(f"Iteration {step['step'] + 1}", style="red bold"))
         console.print(
             wrap_text(
-                f"Generated nodes: {", ".join(str(i) for i in step["generated"])}",
+                f"Generated nodes: {', '.join(str(i) for i in step['generated'])}",
                 width,
             )
         )
         console.print(
             wrap_text(
-                f"Inspected nodes: {", ".join(str(i) for i in step["inspected"])}",
+                f"Inspected nodes: {', '.join(str(i) for i in step['inspected'])}",
                 width,
             )
         )
@@ -142,7 +219,7 @@ def print_result(
     console.print(
         Text("Path:", style="bold"),
         wrap_text(
-            f"{" -> ".join(str(i) for i in path)}",
+            f"{' -> '.join(str(i) for i in path)}",
             width - 5,
         ),
     )
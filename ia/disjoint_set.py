@@ -0,0 +1,83 @@
+"""Disjoint set module.
+
+Contains the DisjointSet class, used to label connected components.
+"""
+
+from array import array
+
+
+class DisjointSet:
+    """Disjoint set forest (union-find) over the integers ``0..n-1``.
+
+    Uses union by size and path halving, so any sequence of operations
+    runs in almost linear time.
+
+    Examples
+    --------
+    >>> sets = DisjointSet(4)
+    >>> sets.union(0, 1)
+    True
+    >>> sets.union(1, 0)
+    False
+    >>> sets.find(1) == sets.find(0), sets.find(2) == sets.find(0)
+    (True, False)
+    >>> sets.labels()
+    [0, 0, 1, 2]
+    """
+
+    def __init__(self, size: int):
+        """Initialize the forest with every element in its own set.
+
+        Parameters
+        ----------
+            size : (int)
+                The number of elements.
+        """
+        self.__parents = array("q", range(size))
+        self.__sizes = array("q", [1]) * size
+
+    def find(self, element: int) -> int:
+        """Get the representative of the set of an element."""
+        parents = self.__parents
+        while parents[element] != element:
+            parents[element] = parents[parents[element]]
+            element = parents[element]
+        return element
+
+    def union(self, first: int, second: int) -> bool:
+        """Merge the sets of two elements.
+
+        Returns
+        -------
+            (bool)
+                False if both elements were already in the same set.
+        """
+        first = self.find(first)
+        second = self.find(second)
+        if first == second:
+            return False
+        sizes = self.__sizes
+        if sizes[first] < sizes[second]:
+            first, second = second, first
+        self.__parents[second] = first
+        sizes[first] += sizes[second]
+        return True
+
+    def labels(self) -> list[int]:
+        """Get a label for every element.
+
+        Labels are consecutive integers starting at 0, numbered in order
+        of the first element of each set.
+        """
+        labels = []
+        roots: dict[int, int] = {}
+        for element in range(len(self)):
+            root = self.find(element)
+            if root not in roots:
+                roots[root] = len(roots)
+            labels.append(roots[root])
+        return labels
+
+    def __len__(self) -> int:
+        """Return the number of elements."""
+        return len(self.__parents)
@@ -0,0 +1,205 @@
+"""Priority queues used as search frontiers.
+
+Every queue pops the item with the lowest priority, breaking ties in
+insertion order, so they can be swapped without changing the result
+of a search.
+"""
+
+import heapq
+from collections import deque
+from enum import StrEnum
+from typing import Any
+
+
+class BinaryHeap:
+    """Binary heap frontier.
+
+    Works with any comparable priority in O(log n) per operation.
+
+    Examples
+    --------
+    >>> queue = BinaryHeap()
+    >>> queue.push(3, "a")
+    >>> queue.push(1, "b")
+    >>> queue.pop()
+    (1, 'b')
+    """
+
+    def __init__(self):
+        self.__heap: list[tuple[Any, int, Any]] = []
+        self.__counter = 0
+
+    def push(self, priority: Any, item: Any) -> None:
+        """Add an item to the queue."""
+        heapq.heappush(self.__heap, (priority, self.__counter, item))
+        self.__counter += 1
+
+    def pop(self) -> tuple[Any, Any]:
+        """Remove and return the item with the lowest priority and its priority."""
+        priority, _, item = heapq.heappop(self.__heap)
+        return priority, item
+
+    def __len__(self) -> int:
+        """Return the number of items in the queue."""
+        return len(self.__heap)
+
+
+class BucketQueue:
+    """Bucket queue frontier (Dial's algorithm).
+
+    Keeps one FIFO bucket per integer priority and a cursor to the
+    lowest one that may be non-empty. A push is O(1) and a pop is O(1)
+    amortized when the popped priorities grow slowly, as in a search
+    with small integer step costs. Pushing a priority lower than the
+    cursor moves it back, so priorities do not need to be monotone.
+
+    Examples
+    --------
+    >>> queue = BucketQueue()
+    >>> queue.push(7, "a")
+    >>> queue.push(5, "b")
+    >>> queue.push(5, "c")
+    >>> [queue.pop() for _ in range(3)]
+    [(5, 'b'), (5, 'c'), (7, 'a')]
+    """
+
+    def __init__(self):
+        self.__buckets: list[deque] = []
+        self.__cursor = 0
+        self.__size = 0
+
+    def push(self, priority: int, item: Any) -> None:
+        """Add an item to the queue.
+
+        Raises
+        ------
+        ValueError
+            If the priority is negative.
+        TypeError
+            If the priority is not an integer.
+        """
+        if priority < 0:
+            raise ValueError(f"Bucket queues need non-negative priorities: {priority}")
+        buckets = self.__buckets
+        if priority >= len(buckets):
+            buckets.extend(deque() for _ in range(priority + 1 - len(buckets)))
+        buckets[priority].append(item)
+        self.__cursor = min(self.__cursor, priority)
+        self.__size += 1
+
+    def pop(self) -> tuple[int, Any]:
+        """Remove and return the item with the lowest priority and its priority."""
+        if not self.__size:
+            raise IndexError("pop from an empty queue")
+        buckets = self.__buckets
+        cursor = self.__cursor
+        while not buckets[cursor]:
+            cursor += 1
+        self.__cursor = cursor
+        self.__size -= 1
+        return cursor, buckets[cursor].popleft()
+
+    def __len__(self) -> int:
+        """Return the number of items in the queue."""
+        return self.__size
+
+
+class RadixHeap:
+    """Radix heap frontier.
+
+    A monotone priority queue: every pushed priority must be at least
+    the last popped one, which holds in A* with a consistent euristic.
+    Items are spread over buckets by the highest bit in which their
+    priority differs from the last popped one, and each item moves to a
+    lower bucket at most once per bit, so operations are O(log C)
+    amortized for a maximum priority C, independently of the size.
+
+    Examples
+    --------
+    >>> queue = RadixHeap()
+    >>> queue.push(12, "a")
+    >>> queue.push(5, "b")
+    >>> queue.pop()
+    (5, 'b')
+    >>> queue.push(9, "c")
+    >>> queue.pop()
+    (9, 'c')
+    """
+
+    def __init__(self):
+        self.__buckets: list[deque] = [deque()]
+        self.__last = 0
+        self.__size = 0
+
+    def push(self, priority: int, item: Any) -> None:
+        """Add an item to the queue.
+
+        Raises
+        ------
+        ValueError
+            If the priority is lower than the last popped one.
+        TypeError
+            If the priority is not an integer.
+        """
+        if priority < self.__last:
+            raise ValueError(
+                "Radix heaps need monotone priorities: "
+                f"{priority} is lower than {self.__last}"
+            )
+        self.__bucket((priority ^ self.__last).bit_length()).append((priority, item))
+        self.__size += 1
+
+    def pop(self) -> tuple[int, Any]:
+        """Remove and return the item with the lowest priority and its priority."""
+        if not self.__size:
+            raise IndexError("pop from an empty queue")
+        buckets = self.__buckets
+        if not buckets[0]:
+            index = 1
+            while not buckets[index]:
+                index += 1
+            # Items keep their relative order when moved, so the ones with
+            # the same priority still come out in insertion order.
+            entries = buckets[index]
+            buckets[index] = deque()
+            last = self.__last = min(priority for priority, _ in entries)
+            for entry in entries:
+                self.__bucket((entry[0] ^ last).bit_length()).append(entry)
+        self.__size -= 1
+        return buckets[0].popleft()
+
+    def __bucket(self, index: int) -> deque:
+        """Get a bucket, creating the missing ones."""
+        buckets = self.__buckets
+        while index >= len(buckets):
+            buckets.append(deque())
+        return buckets[index]
+
+    def __len__(self) -> int:
+        """Return the number of items in the queue."""
+        return self.__size
+
+
+class Frontier(StrEnum):
+    """Frontier class.
+
+    Defines the priority queues a search can use
+    and allows to create them by their name.
+    """
+
+    HEAP = "heap"
+    """Binary heap, for any priority."""
+
+    BUCKET = "bucket"
+    """Bucket queue, for small non-negative integer priorities."""
+
+    RADIX = "radix"
+    """Radix heap, for non-negative integer priorities that never decrease."""
+
+    def to_queue(self) -> BinaryHeap | BucketQueue | RadixHeap:
+        """Create an empty queue of this type."""
+        return {
+            Frontier.HEAP: BinaryHeap,
+            Frontier.BUCKET: BucketQueue,
+            Frontier.RADIX: RadixHeap,
+        }[self]()
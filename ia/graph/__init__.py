@@ -2,4 +2,8 @@
 
 from ia import algorithm as algorithm
 
+from .base import BaseGraph as BaseGraph
+from .csr import CSRGraph as CSRGraph
+from .distances import DistanceTable as DistanceTable
+from .landmarks import Landmarks as Landmarks
 from .undirected import UndirectedGraph as UndirectedGraph
@@ -0,0 +1,658 @@
+"""Base graph module.
+
+Contains the BaseGraph class, which implements the traversal
+algorithms shared by every graph representation.
+"""
+
+import heapq
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable, Mapping
+from itertools import pairwise
+from typing import Literal
+
+from ia import bounded
+from ia.algorithm import (
+    AlgorithmHistory,
+    HistoryPolicy,
+    SearchMode,
+    TraversalResult,
+    UninformedTraversalAlgorithm,
+    graph_path_cost,
+)
+from ia.disjoint_set import DisjointSet
+from ia.tree.lazy import LazyTree, node_chain
+from ia.tree.node import Node
+
+from .distances import DistanceTable
+from .heuristics import table_heuristic
+
+
+class BaseGraph(ABC):
+    """Base graph class.
+
+    Subclasses only need to provide the vertices, the neighbors
+    of a vertex and the weights of the edges.
+    """
+
+    @property
+    @abstractmethod
+    def vertices(self) -> list[int]:
+        """Get the vertices of the graph."""
+
+    @property
+    @abstractmethod
+    def weights(self) -> Mapping[tuple[int, int], float]:
+        """Get the weights of the graph."""
+
+    @abstractmethod
+    def neighbors(self, vertex: int) -> list[int]:
+        """Get the neighbors of a vertex."""
+
+    def weighted_neighbors(self, vertex: int) -> list[tuple[int, float]]:
+        """Get the neighbors of a vertex along with the weight of each edge."""
+        weights = self.weights
+        return [
+            (neighbor, weights[(vertex, neighbor)])
+            for neighbor in self.neighbors(vertex)
+        ]
+
+    def degree(self, vertex: int) -> int:
+        """Get the degree of a vertex."""
+        return len(self.neighbors(vertex))
+
+    def path_cost(self, path: list[Node]) -> float:
+        """Calculate the cost of a path of nodes."""
+        return graph_path_cost(path, self.weights)
+
+    def dfs(
+        self,
+        *,
+        start: int,
+        end: int,
+        sort_generated: Callable[[list[int]], list[int]] | None = None,
+        history_policy: HistoryPolicy | None = None,
+        search_mode: SearchMode = SearchMode.GRAPH,
+    ) -> TraversalResult:
+        """Depth-first search.
+
+        In ``GRAPH`` mode every vertex is expanded at most once. In ``TREE``
+        mode a vertex is only skipped when it is an ancestor of the node
+        being expanded.
+        """
+        if sort_generated is None:
+
+            def sort_generated(_generated):
+                return reversed(_generated)
+
+        history = AlgorithmHistory(policy=history_policy)
+        tree = LazyTree(start)
+        ids = tree.ids
+        stack = [0]
+        closed = set()
+        history.add_step(generated=[start])
+        if not self.connected(start, end):
+            return TraversalResult(history, [], -1, tree=tree)
+        current = None
+        while stack:
+            current = stack.pop()
+            current_id = ids[current]
+            if search_mode == SearchMode.GRAPH:
+                if current_id in closed:
+                    continue
+                closed.add(current_id)
+            if current_id == end:
+                history.add_step(inspected=[current_id])
+                return self.__result(history, tree, current)
+            if search_mode == SearchMode.GRAPH:
+                new_generated = [
+                    neighbor
+                    for neighbor in self.neighbors(current_id)
+                    if neighbor not in closed
+                ]
+            else:
+                new_generated = self.__tree_successors(tree, current)
+            stack.extend(
+                tree.add(successor, current)
+                for successor in sort_generated(new_generated)
+            )
+            history.add_step(generated=new_generated, inspected=[current_id])
+        return TraversalResult(history, [], -1, tree=tree)
+
+    def bfs(
+        self,
+        *,
+        start: int,
+        end: int,
+        sort_generated: Callable[[list[int]], list[int]] | None = None,
+        history_policy: HistoryPolicy | None = None,
+        search_mode: SearchMode = SearchMode.GRAPH,
+    ) -> TraversalResult:
+        """Breadth-first search.
+
+        In ``GRAPH`` mode every vertex is generated at most once. In ``TREE``
+        mode a vertex is only skipped when it is an ancestor of the node
+        being expanded.
+        """
+        if sort_generated is None:
+
+            def sort_generated(_generated):
+                return _generated
+
+        history = AlgorithmHistory(policy=history_policy)
+        tree = LazyTree(start)
+        ids = tree.ids
+        queue = deque([0])
+        reached = {start}
+        history.add_step(generated=[start])
+        if not self.connected(start, end):
+            return TraversalResult(history, [], -1, tree=tree)
+        while queue:
+            current = queue.popleft()
+            current_id = ids[current]
+            if current_id == end:
+                history.add_step(inspected=[current_id])
+                return self.__result(history, tree, current)
+            if search_mode == SearchMode.GRAPH:
+                new_generated = [
+                    neighbor
+                    for neighbor in self.neighbors(current_id)
+                    if neighbor not in reached
+                ]
+                reached.update(new_generated)
+            else:
+                new_generated = self.__tree_successors(tree, current)
+            queue.extend(
+                tree.add(successor, current)
+                for successor in sort_generated(new_generated)
+            )
+            history.add_step(generated=new_generated, inspected=[current_id])
+        return TraversalResult(history, [], -1, tree=tree)
+
+    def ucs(
+        self,
+        *,
+        start: int,
+        end: int,
+        history_policy: HistoryPolicy | None = None,
+    ) -> TraversalResult:
+        """Uniform-cost search.
+
+        Expands vertices in order of path cost using a binary heap. Instead
+        of decreasing the key of a vertex already in the heap, a new entry
+        is pushed and the outdated one is skipped when popped.
+
+        Raises
+        ------
+        ValueError
+            If an edge with a negative weight is found.
+        """
+        return self.__best_first(start, end, None, history_policy)
+
+    def a_star(
+        self,
+        *,
+        start: int,
+        end: int,
+        heuristic: Callable[[int, int], float] | Mapping[int, float] | None = None,
+        history_policy: HistoryPolicy | None = None,
+    ) -> TraversalResult:
+        """Search the graph with A*.
+
+        Works like :meth:`ucs` but orders the vertices by path cost plus the
+        estimated cost to ``end``. Vertices that are reached again through a
+        cheaper path after being expanded are reopened, so the returned path
+        is optimal for any admissible heuristic.
+
+        Parameters
+        ----------
+            start : (int)
+                The start vertex.
+            end : (int)
+                The goal vertex.
+            heuristic : (Callable[[int, int], float] | Mapping[int, float])
+                Either a function receiving a vertex and the goal, or a table
+                with the precomputed estimate of every vertex to ``end``.
+                Vertices missing from the table are estimated as 0.
+                Defaults to 0 everywhere, which is the same as :meth:`ucs`.
+            history_policy : (HistoryPolicy)
+                Which steps of the search to record in the history.
+
+        Raises
+        ------
+        ValueError
+            If an edge with a negative weight is found.
+        """
+        if isinstance(heuristic, Mapping):
+            heuristic = table_heuristic(heuristic)
+        return self.__best_first(start, end, heuristic, history_policy)
+
+    def ida_star(
+        self,
+        *,
+        start: int,
+        end: int,
+        heuristic: Callable[[int, int], float] | Mapping[int, float] | None = None,
+        history_policy: HistoryPolicy | None = None,
+        node_budget: int = bounded.DEFAULT_NODE_BUDGET,
+    ) -> TraversalResult:
+        """Search the graph with iterative-deepening A* (IDA*).
+
+        Finds the same cost as :meth:`a_star` keeping only the current
+        branch and a transposition table of at most ``node_budget``
+        vertices, see :func:`ia.bounded.ida_star`.
+
+        Raises
+        ------
+        ValueError
+            If an edge with a negative weight is found.
+        """
+        return self.__bounded_search(
+            bounded.ida_star, start, end, heuristic, history_policy, node_budget
+        )
+
+    def sma_star(
+        self,
+        *,
+        start: int,
+        end: int,
+        heuristic: Callable[[int, int], float] | Mapping[int, float] | None = None,
+        history_policy: HistoryPolicy | None = None,
+        node_budget: int = bounded.DEFAULT_NODE_BUDGET,
+    ) -> TraversalResult:
+        """Search the graph with simplified memory-bounded A* (SMA*).
+
+        Finds the same cost as :meth:`a_star` if the path has fewer vertices
+        than ``node_budget``, keeping at most that many search nodes, see
+        :func:`ia.bounded.sma_star`.
+
+        Raises
+        ------
+        ValueError
+            If an edge with a negative weight is found, or the budget is
+            lower than 2.
+        """
+        return self.__bounded_search(
+            bounded.sma_star, start, end, heuristic, history_policy, node_budget
+        )
+
+    def __bounded_search(
+        self,
+        engine: Callable[..., bounded.SearchNode | None],
+        start: int,
+        end: int,
+        heuristic: Callable[[int, int], float] | Mapping[int, float] | None,
+        history_policy: HistoryPolicy | None,
+        node_budget: int,
+    ) -> TraversalResult:
+        """Run a memory-bounded search over the vertices."""
+        if isinstance(heuristic, Mapping):
+            heuristic = table_heuristic(heuristic)
+        elif heuristic is None:
+
+            def heuristic(_vertex, _goal):
+                return 0
+
+        def successors(vertex: int) -> list[tuple[int, float]]:
+            neighbors = self.weighted_neighbors(vertex)
+            for neighbor, weight in neighbors:
+                if weight < 0:
+                    raise ValueError(
+                        "Cost-ordered searches require non-negative weights, "
+                        f"got {weight} on ({vertex}, {neighbor})."
+                    )
+            return neighbors
+
+        history = AlgorithmHistory(policy=history_policy)
+        history.add_step(generated=[start])
+        if not self.connected(start, end):
+            return TraversalResult(history, [], -1)
+        node = engine(
+            start,
+            end,
+            successors,
+            lambda vertex: heuristic(vertex, end),
+            history,
+            node_budget,
+        )
+        if node is None:
+            return TraversalResult(history, [], -1)
+        path = node_chain([vertex for vertex, _ in bounded.branch(node)])
+        return TraversalResult(history, path=path, cost=self.path_cost(path))
+
+    def __best_first(
+        self,
+        start: int,
+        end: int,
+        heuristic: Callable[[int, int], float] | None,
+        history_policy: HistoryPolicy | None,
+    ) -> TraversalResult:
+        """Best-first search ordered by ``g + h`` with lazy deletion."""
+        if heuristic is None:
+
+            def heuristic(_vertex, _goal):
+                return 0
+
+        history = AlgorithmHistory(policy=history_policy)
+        tree = LazyTree(start)
+        ids = tree.ids
+        best = {start: 0}
+        closed = set()
+        open_set = [(heuristic(start, end), 0, 0)]
+        history.add_step(generated=[start])
+        if not self.connected(start, end):
+            return TraversalResult(history, [], -1, tree=tree)
+        while open_set:
+            _, cost, current = heapq.heappop(open_set)
+            current_id = ids[current]
+            if current_id in closed or cost > best[current_id]:
+                continue
+            closed.add(current_id)
+            if current_id == end:
+                history.add_step(inspected=[current_id])
+                return self.__result(history, tree, current)
+            new_generated = []
+            for neighbor, weight in self.weighted_neighbors(current_id):
+                if weight < 0:
+                    raise ValueError(
+                        "Cost-ordered searches require non-negative weights, "
+                        f"got {weight} on ({current_id}, {neighbor})."
+                    )
+                new_cost = cost + weight
+                if new_cost < best.get(neighbor, math.inf):
+                    best[neighbor] = new_cost
+                    closed.discard(neighbor)
+                    heapq.heappush(
+                        open_set,
+                        (
+                            new_cost + heuristic(neighbor, end),
+                            new_cost,
+                            tree.add(neighbor, current),
+                        ),
+                    )
+                    new_generated.append(neighbor)
+            history.add_step(generated=new_generated, inspected=[current_id])
+        return TraversalResult(history, [], -1, tree=tree)
+
+    def bidirectional_bfs(
+        self,
+        *,
+        start: int,
+        end: int,
+        history_policy: HistoryPolicy | None = None,
+    ) -> TraversalResult:
+        """Bidirectional breadth-first search.
+
+        Runs one breadth-first search from each end, always expanding a
+        whole level of the smaller frontier, and stops at the level where
+        both searches meet. The returned path has the fewest edges.
+        """
+        history = AlgorithmHistory(policy=history_policy)
+        trees = (LazyTree(start), LazyTree(end))
+        reached = ({start: 0}, {end: 0})
+        depths = ({start: 0}, {end: 0})
+        frontiers = ([0], [0])
+        history.add_step(generated=[start] if start == end else [start, end])
+        if start == end:
+            history.add_step(inspected=[start])
+            return self.__stitched_result(history, trees, start)
+        if not self.connected(start, end):
+            return TraversalResult(history, [], -1, tree=trees[0])
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            tree, other_reached = trees[side], reached[1 - side]
+            meetings = []
+            next_frontier = []
+            for current in frontiers[side]:
+                current_id = tree.ids[current]
+                new_generated = [
+                    neighbor
+                    for neighbor in self.neighbors(current_id)
+                    if neighbor not in reached[side]
+                ]
+                for neighbor in new_generated:
+                    index = tree.add(neighbor, current)
+                    reached[side][neighbor] = index
+                    depths[side][neighbor] = depths[side][current_id] + 1
+                    next_frontier.append(index)
+                    if neighbor in other_reached:
+                        meetings.append(neighbor)
+                history.add_step(generated=new_generated, inspected=[current_id])
+            if meetings:
+                # Every meeting of this level is equally deep on this side, but
+                # the other search may have reached them on different levels.
+                meeting = min(meetings, key=depths[1 - side].__getitem__)
+                return self.__stitched_result(history, trees, meeting, reached)
+            frontiers = (
+                (next_frontier, frontiers[1])
+                if side == 0
+                else (frontiers[0], next_frontier)
+            )
+        return TraversalResult(history, [], -1, tree=trees[0])
+
+    def bidirectional_ucs(
+        self,
+        *,
+        start: int,
+        end: int,
+        history_policy: HistoryPolicy | None = None,
+    ) -> TraversalResult:
+        """Bidirectional uniform-cost search.
+
+        Runs one uniform-cost search from each end, always expanding the
+        search with the cheapest next vertex, and keeps the cheapest path
+        found through an edge joining both searches. It stops once the
+        two cheapest open costs add up to at least that path cost, which
+        makes the returned path the cheapest one.
+
+        Raises
+        ------
+        ValueError
+            If an edge with a negative weight is found.
+        """
+        history = AlgorithmHistory(policy=history_policy)
+        trees = (LazyTree(start), LazyTree(end))
+        best = ({start: 0}, {end: 0})
+        indices = ({start: 0}, {end: 0})
+        closed = (set(), set())
+        open_sets = ([(0, 0)], [(0, 0)])
+        history.add_step(generated=[start] if start == end else [start, end])
+        if start == end:
+            history.add_step(inspected=[start])
+            return self.__stitched_result(history, trees, start)
+        if not self.connected(start, end):
+            return TraversalResult(history, [], -1, tree=trees[0])
+        best_cost = math.inf
+        meeting = None
+        while open_sets[0] and open_sets[1]:
+            if open_sets[0][0][0] + open_sets[1][0][0] >= best_cost:
+                break
+            side = 0 if open_sets[0][0][0] <= open_sets[1][0][0] else 1
+            tree = trees[side]
+            cost, current = heapq.heappop(open_sets[side])
+            current_id = tree.ids[current]
+            if current_id in closed[side] or cost > best[side][current_id]:
+                continue
+            closed[side].add(current_id)
+            new_generated = []
+            for neighbor, weight in self.weighted_neighbors(current_id):
+                if weight < 0:
+                    raise ValueError(
+                        "Cost-ordered searches require non-negative weights, "
+                        f"got {weight} on ({current_id}, {neighbor})."
+                    )
+                new_cost = cost + weight
+                if new_cost < best[side].get(neighbor, math.inf):
+                    best[side][neighbor] = new_cost
+                    index = tree.add(neighbor, current)
+                    indices[side][neighbor] = index
+                    heapq.heappush(open_sets[side], (new_cost, index))
+                    new_generated.append(neighbor)
+                if neighbor in best[1 - side]:
+                    total = best[side][neighbor] + best[1 - side][neighbor]
+                    if total < best_cost:
+                        best_cost = total
+                        meeting = neighbor
+            history.add_step(generated=new_generated, inspected=[current_id])
+        if meeting is None:
+            return TraversalResult(history, [], -1, tree=trees[0])
+        return self.__stitched_result(history, trees, meeting, indices)
+
+    def components(self) -> dict[int, int]:
+        """Label the connected components of the graph.
+
+        Joins the ends of every edge in a disjoint set, in almost linear time.
+
+        Returns
+        -------
+            (dict[int, int])
+                The label of the component of every vertex, counting from 0.
+        """
+        vertices = self.vertices
+        index = {vertex: i for i, vertex in enumerate(vertices)}
+        sets = DisjointSet(len(vertices))
+        for start, end in self.weights:
+            sets.union(index[start], index[end])
+        return dict(zip(vertices, sets.labels(), strict=True))
+
+    def connected(self, start: int, end: int) -> bool:
+        """Check if there is a path between two vertices.
+
+        Takes O(1) once :meth:`components` is computed, which the graphs
+        that cache it only do once per change. The searches use it to
+        return right away when there is no path.
+        """
+        components = self.components()
+        return (
+            start in components
+            and end in components
+            and components[start] == components[end]
+        )
+
+    def all_pairs(
+        self, method: Literal["auto", "floyd_warshall", "dijkstra"] = "auto"
+    ) -> DistanceTable:
+        """Get the all-pairs shortest path table of the graph.
+
+        See :meth:`DistanceTable.from_graph` for the available methods.
+        """
+        return DistanceTable.from_graph(self, method)
+
+    def table_path(
+        self,
+        *,
+        start: int,
+        end: int,
+        table: DistanceTable | None = None,
+        history_policy: HistoryPolicy | None = None,
+    ) -> TraversalResult:
+        """Read the cheapest path between two vertices from a distance table.
+
+        Takes O(path length) once the table is built. Every iteration
+        inspects one vertex of the path and generates the next one.
+
+        Parameters
+        ----------
+            start : (int)
+                The starting vertex.
+            end : (int)
+                The ending vertex.
+            table : (DistanceTable | None)
+                The table to read. Defaults to :meth:`all_pairs`.
+            history_policy : (HistoryPolicy | None)
+                The policy deciding which iterations are kept.
+
+        Returns
+        -------
+            (TraversalResult)
+                The result, with an empty path and a cost of -1
+                if there is no path.
+        """
+        if table is None:
+            table = self.all_pairs()
+        history = AlgorithmHistory(policy=history_policy)
+        tree = LazyTree(start)
+        history.add_step(generated=[start])
+        ids = table.path(start, end) if start in table and end in table else []
+        if not ids:
+            history.add_step(inspected=[start])
+            return TraversalResult(history, [], -1, tree=tree)
+        index = 0
+        for current, following in pairwise(ids):
+            index = tree.add(following, index)
+            history.add_step(generated=[following], inspected=[current])
+        history.add_step(inspected=[end])
+        return self.__result(history, tree, index)
+
+    def __stitched_result(
+        self,
+        history: AlgorithmHistory,
+        trees: tuple[LazyTree, LazyTree],
+        meeting: int,
+        indices: tuple[dict[int, int], dict[int, int]] | None = None,
+    ) -> TraversalResult:
+        """Build the result of a bidirectional search from its meeting vertex."""
+        if indices is None:
+            ids = [meeting]
+        else:
+            forward = trees[0].branch(indices[0][meeting])
+            backward = trees[1].branch(indices[1][meeting])
+            ids = forward + backward[-2::-1]
+        path = node_chain(ids)
+        return TraversalResult(
+            history,
+            path=path,
+            cost=self.path_cost(path),
+            tree=trees[0],
+        )
+
+    def __tree_successors(self, tree: LazyTree, current: int) -> list[int]:
+        """Get the neighbors of a tree node that are not in its branch."""
+        branch = set(tree.branch(current))
+        return [
+            neighbor
+            for neighbor in self.neighbors(tree.ids[current])
+            if neighbor not in branch
+        ]
+
+    def __result(
+        self, history: AlgorithmHistory, tree: LazyTree, goal: int
+    ) -> TraversalResult:
+        """Build the result of a traversal that reached the goal."""
+        path = tree.path(goal)
+        return TraversalResult(
+            history,
+            path=path,
+            cost=self.path_cost(path),
+            tree=tree,
+        )
+
+    def traverse(
+        self,
+        *,
+        start: int,
+        end: int,
+        algorithm: UninformedTraversalAlgorithm,
+        history_policy: HistoryPolicy | None = None,
+        search_mode: SearchMode = SearchMode.GRAPH,
+    ) -> TraversalResult:
+        """Traverse the graph."""
+        options = {"history_policy": history_policy, "search_mode": search_mode}
+        if algorithm == "dfs":
+            return self.dfs(start=start, end=end, **options)
+        elif algorithm == "bfs":
+            return self.bfs(start=start, end=end, **options)
+        elif algorithm == "ucs":
+            return self.ucs(start=start, end=end, history_policy=history_policy)
+        elif algorithm == "bidirectional_bfs":
+            return self.bidirectional_bfs(
+                start=start, end=end, history_policy=history_policy
+            )
+        elif algorithm == "bidirectional_ucs":
+            return self.bidirectional_ucs(
+                start=start, end=end, history_policy=history_policy
+            )
+        elif algorithm == "all_pairs":
+            return self.table_path(start=start, end=end, history_policy=history_policy)
+        raise TypeError(f"Invalid algorithm {algorithm}")
@@ -0,0 +1,365 @@
+"""Compressed sparse row graph module.
+
+Contains the CSRGraph class, an immutable and compact representation
+of an undirected graph.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from typing import TYPE_CHECKING, Any, Literal
+
+from ia import parallel
+from ia.algorithm import (
+    HistoryPolicy,
+    SearchMode,
+    TraversalResult,
+    UninformedTraversalAlgorithm,
+)
+
+from .base import BaseGraph
+from .distances import DistanceTable
+
+if TYPE_CHECKING:
+    from .undirected import UndirectedGraph
+
+
+class CSRGraph(BaseGraph):
+    """Immutable undirected graph in compressed sparse row format.
+
+    Vertices are mapped to dense indices. The neighbors of the vertex
+    with index ``i`` are ``targets[offsets[i]:offsets[i + 1]]``, stored as
+    vertex indices, and ``weight_data`` holds the weight of each of those
+    entries. Every edge is stored once per direction, which takes 12 bytes
+    per direction instead of the list entries and tuple keys used by
+    :class:`UndirectedGraph`.
+
+    Examples
+    --------
+    >>> from ia.graph import UndirectedGraph
+    >>> graph = UndirectedGraph()
+    >>> graph.add_edge(1, 2, weight=3.0)
+    >>> graph.add_edge(2, 3, weight=4.0)
+    >>> csr = graph.freeze()
+    >>> csr.neighbors(2)
+    [1, 3]
+    >>> csr.weights[(3, 2)]
+    4.0
+    """
+
+    def __init__(
+        self,
+        *,
+        ids: array,
+        offsets: array,
+        targets: array,
+        weight_data: array,
+    ):
+        """Initialize the graph from its raw arrays.
+
+        Parameters
+        ----------
+        ids: array
+                The vertex of each index.
+        offsets: array
+                Where the neighbors of each index start in ``targets``,
+                with one extra trailing entry.
+        targets: array
+                The neighbor indices of every vertex, one row after another.
+        weight_data: array
+                The weight of each entry of ``targets``.
+
+        """
+        if len(offsets) != len(ids) + 1:
+            raise ValueError("There must be exactly one offset per vertex plus one.")
+        if len(targets) != len(weight_data) or offsets[-1] != len(targets):
+            raise ValueError("Targets and weights must match the last offset.")
+        self.__ids = ids
+        self.__offsets = offsets
+        self.__targets = targets
+        self.__weight_data = weight_data
+        self.__index = {vertex: index for index, vertex in enumerate(ids)}
+        self.__weights = CSRWeights(self)
+        self.__tables: dict[str, DistanceTable] = {}
+        self.__components: dict[int, int] | None = None
+
+    @classmethod
+    def from_graph(cls, graph: UndirectedGraph) -> CSRGraph:
+        """Freeze an undirected graph.
+
+        The neighbor order of every vertex is preserved, so traversals
+        visit the vertices in the same order as on the original graph.
+        """
+        adjacency = graph.adjacency
+        weights = graph.weights
+        ids = array("q", adjacency.keys())
+        index = {vertex: i for i, vertex in enumerate(ids)}
+        offsets = array("q", [0])
+        targets = array("i")
+        weight_data = array("d")
+        for start, ends in adjacency.items():
+            targets.extend(index[end] for end in ends)
+            weight_data.extend(weights[(start, end)] for end in ends)
+            offsets.append(len(targets))
+        return cls(ids=ids, offsets=offsets, targets=targets, weight_data=weight_data)
+
+    @property
+    def ids(self) -> array:
+        """Get the vertex of each index."""
+        return self.__ids
+
+    @property
+    def offsets(self) -> array:
+        """Get the row offsets."""
+        return self.__offsets
+
+    @property
+    def targets(self) -> array:
+        """Get the neighbor indices."""
+        return self.__targets
+
+    @property
+    def weight_data(self) -> array:
+        """Get the weight of each neighbor entry."""
+        return self.__weight_data
+
+    @property
+    def vertices(self) -> list[int]:
+        """Get the vertices of the graph."""
+        return self.__ids.tolist()
+
+    @property
+    def weights(self) -> CSRWeights:
+        """Get the weights of the graph."""
+        return self.__weights
+
+    @property
+    def edges(self) -> list[tuple[int, int]]:
+        """Get the edges of the graph.
+
+        As in :attr:`UndirectedGraph.edges`, each edge appears once, and so
+        does the self-loop of a vertex, which is stored twice in its row.
+
+        Examples
+        --------
+        >>> from ia.graph import UndirectedGraph
+        >>> graph = UndirectedGraph()
+        >>> graph.add_edge(1, 1, weight=2.0)
+        >>> graph.add_edge(1, 2, weight=3.0)
+        >>> graph.edges, graph.freeze().edges
+        ([(1, 1), (1, 2)], [(1, 1), (1, 2)])
+        """
+        ids = self.__ids
+        offsets = self.__offsets
+        targets = self.__targets
+        edges = []
+        for i in range(len(ids)):
+            loop_seen = False
+            for k in range(offsets[i], offsets[i + 1]):
+                j = targets[k]
+                if j == i:
+                    if loop_seen:
+                        continue
+                    loop_seen = True
+                if i <= j:
+                    edges.append((ids[i], ids[j]))
+        return edges
+
+    def index_of(self, vertex: int) -> int:
+        """Get the dense index of a vertex."""
+        return self.__index[vertex]
+
+    def neighbors(self, vertex: int) -> list[int]:
+        """Get the neighbors of a vertex."""
+        ids = self.__ids
+        i = self.__index[vertex]
+        return [
+            ids[j] for j in self.__targets[self.__offsets[i] : self.__offsets[i + 1]]
+        ]
+
+    def weighted_neighbors(self, vertex: int) -> list[tuple[int, float]]:
+        """Get the neighbors of a vertex along with the weight of each edge."""
+        ids = self.__ids
+        i = self.__index[vertex]
+        row = slice(self.__offsets[i], self.__offsets[i + 1])
+        return [
+            (ids[j], weight)
+            for j, weight in zip(
+                self.__targets[row], self.__weight_data[row], strict=True
+            )
+        ]
+
+    def degree(self, vertex: int) -> int:
+        """Get the degree of a vertex."""
+        i = self.__index[vertex]
+        return self.__offsets[i + 1] - self.__offsets[i]
+
+    def weight(self, start: int, end: int) -> float:
+        """Get the weight of an edge.
+
+        Raises
+        ------
+        KeyError
+            If the edge does not exist.
+        """
+        i = self.__index[start]
+        j = self.__index[end]
+        targets = self.__targets
+        for k in range(self.__offsets[i], self.__offsets[i + 1]):
+            if targets[k] == j:
+                return self.__weight_data[k]
+        raise KeyError((start, end))
+
+    def components(self) -> dict[int, int]:
+        """Label the connected components of the graph.
+
+        The graph is immutable, so the labels are computed once.
+        See :meth:`BaseGraph.components`.
+        """
+        if self.__components is None:
+            self.__components = super().components()
+        return self.__components
+
+    def all_pairs(
+        self, method: Literal["auto", "floyd_warshall", "dijkstra"] = "auto"
+    ) -> DistanceTable:
+        """Get the all-pairs shortest path table of the graph.
+
+        The graph is immutable, so the table is built once per method.
+        See :meth:`DistanceTable.from_graph` for the available methods.
+        """
+        if method not in self.__tables:
+            self.__tables[method] = super().all_pairs(method)
+        return self.__tables[method]
+
+    def traverse_many(
+        self,
+        queries: Iterable[tuple[int, int]],
+        *,
+        algorithm: UninformedTraversalAlgorithm,
+        history_policy: HistoryPolicy | None = None,
+        search_mode: SearchMode = SearchMode.GRAPH,
+        workers: int | None = None,
+        chunk_size: int = parallel.DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[tuple[int, TraversalResult]]:
+        """Run :meth:`traverse` for many start and end pairs in parallel.
+
+        The arrays of the graph are copied once to shared memory and every
+        worker process traverses a graph wrapped around them, see
+        :func:`parallel.fan_out`. Results are yielded as soon as their chunk
+        of queries finishes, so they may come out of order.
+
+        Parameters
+        ----------
+            queries : (Iterable[tuple[int, int]])
+                The start and end of every traversal.
+            algorithm : (UninformedTraversalAlgorithm)
+                The traversal algorithm.
+            history_policy : (HistoryPolicy)
+                Which steps of the traversals to record in their history.
+            search_mode : (SearchMode)
+                The search mode of the depth and breadth-first searches.
+            workers : (int)
+                The number of worker processes. Defaults to the number of
+                CPUs. With a single worker the traversals run in this process.
+            chunk_size : (int)
+                The number of queries sent to a worker at a time.
+
+        Returns
+        -------
+            (Iterator[tuple[int, TraversalResult]])
+                The index of every query and its result.
+
+        Examples
+        --------
+        >>> from ia.graph import UndirectedGraph
+        >>> graph = UndirectedGraph()
+        >>> graph.add_edge(1, 2, weight=3.0)
+        >>> graph.add_edge(2, 3, weight=4.0)
+        >>> csr = graph.freeze()
+        >>> queries = [(1, 3), (3, 2), (2, 2)]
+        >>> results = dict(csr.traverse_many(queries, algorithm="ucs", workers=2))
+        >>> [results[index].cost for index in range(3)]
+        [7.0, 4.0, 0]
+        >>> [csr.traverse(start=start, end=end, algorithm="ucs").cost
+        ...  for start, end in queries]
+        [7.0, 4.0, 0]
+        """
+        return parallel.fan_out(
+            queries,
+            _traverse_query,
+            local=self,
+            arrays={
+                "ids": self.__ids,
+                "offsets": self.__offsets,
+                "targets": self.__targets,
+                "weight_data": self.__weight_data,
+            },
+            build=_shared_graph,
+            options={
+                "algorithm": algorithm,
+                "history_policy": history_policy,
+                "search_mode": search_mode,
+            },
+            workers=workers,
+            chunk_size=chunk_size,
+        )
+
+    def __len__(self) -> int:
+        """Return the number of vertices."""
+        return len(self.__ids)
+
+    def __contains__(self, vertex: int) -> bool:
+        """Check if the graph contains a vertex."""
+        return vertex in self.__index
+
+
+def _shared_graph(views: dict[str, memoryview], _metadata: None) -> CSRGraph:
+    """Wrap a graph around arrays in shared memory."""
+    return CSRGraph(
+        ids=views["ids"],
+        offsets=views["offsets"],
+        targets=views["targets"],
+        weight_data=views["weight_data"],
+    )
+
+
+def _traverse_query(
+    graph: CSRGraph, query: tuple[int, int], options: dict[str, Any]
+) -> TraversalResult:
+    """Run one traversal of :meth:`CSRGraph.traverse_many`."""
+    start, end = query
+    return graph.traverse(start=start, end=end, **options)
+
+
+class CSRWeights(Mapping[tuple[int, int], float]):
+    """Read-only mapping view of the weights of a :class:`CSRGraph`.
+
+    Behaves like :attr:`UndirectedGraph.weights`, with every edge
+    present in both directions.
+    """
+
+    def __init__(self, graph: CSRGraph):
+        self.__graph = graph
+
+    def __getitem__(self, key: tuple[int, int]) -> float:
+        """Get the weight of an edge."""
+        start, end = key
+        if start not in self.__graph or end not in self.__graph:
+            raise KeyError(key)
+        return self.__graph.weight(start, end)
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        """Iterate over the edges in both directions."""
+        graph = self.__graph
+        ids = graph.ids
+        offsets = graph.offsets
+        targets = graph.targets
+        for i in range(len(ids)):
+            for k in range(offsets[i], offsets[i + 1]):
+                yield ids[i], ids[targets[k]]
+
+    def __len__(self) -> int:
+        """Return the number of edges in both directions."""
+        return len(self.__graph.targets)
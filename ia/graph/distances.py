@@ -0,0 +1,357 @@
+"""All-pairs shortest path module.
+
+Contains the DistanceTable class, which stores the cost and the next
+hop of the cheapest path between every pair of vertices of a graph.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import math
+from os import PathLike
+from typing import TYPE_CHECKING, Literal
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .base import BaseGraph
+
+FLOYD_WARSHALL_MAX_VERTICES = 64
+"""Graphs with at most this many vertices always use Floyd–Warshall."""
+
+FLOYD_WARSHALL_MIN_DENSITY = 0.25
+"""Graphs with at least this ratio of edges to vertex pairs use Floyd–Warshall."""
+
+
+class DistanceTable:
+    """Distance and next hop table of a graph.
+
+    ``distances[i, j]`` is the cost of the cheapest path between the
+    vertices with indices ``i`` and ``j`` (``inf`` if there is none) and
+    ``next_hops[i, j]`` is the index of the vertex that follows ``i`` on
+    that path (``-1`` if there is none). Once built, the cost of a path
+    is read in constant time and the path itself in O(path length).
+
+    Examples
+    --------
+    >>> from ia.graph import UndirectedGraph
+    >>> graph = UndirectedGraph()
+    >>> graph.add_edge(1, 2, weight=3.0)
+    >>> graph.add_edge(2, 3, weight=4.0)
+    >>> graph.add_edge(1, 3, weight=9.0)
+    >>> table = DistanceTable.from_graph(graph)
+    >>> table.path(1, 3)
+    [1, 2, 3]
+    >>> table.distance(3, 1)
+    7.0
+    """
+
+    def __init__(
+        self,
+        *,
+        ids: np.ndarray,
+        distances: np.ndarray,
+        next_hops: np.ndarray,
+        fingerprint: str,
+    ):
+        """Initialize the table from its raw arrays.
+
+        Parameters
+        ----------
+        ids: np.ndarray
+                The vertex of each index.
+        distances: np.ndarray
+                The ``n x n`` matrix of path costs.
+        next_hops: np.ndarray
+                The ``n x n`` matrix of next hop indices.
+        fingerprint: str
+                The fingerprint of the graph the table was built from.
+
+        """
+        n = len(ids)
+        if distances.shape != (n, n) or next_hops.shape != (n, n):
+            raise ValueError("Distances and next hops must be square matrices.")
+        self.__ids = ids
+        self.__distances = distances
+        self.__next_hops = next_hops
+        self.__fingerprint = fingerprint
+        self.__index = {int(vertex): index for index, vertex in enumerate(ids)}
+
+    @classmethod
+    def from_graph(
+        cls,
+        graph: BaseGraph,
+        method: Literal["auto", "floyd_warshall", "dijkstra"] = "auto",
+    ) -> DistanceTable:
+        """Build the table of a graph.
+
+        Parameters
+        ----------
+            graph : (BaseGraph)
+                The graph.
+            method : (Literal["auto", "floyd_warshall", "dijkstra"])
+                ``"floyd_warshall"`` runs a vectorized Floyd–Warshall over the
+                weight matrix in O(V^3), which suits small or dense graphs.
+                ``"dijkstra"`` runs a Dijkstra search from every vertex in
+                O(V E log V), which suits sparse graphs. ``"auto"`` picks one
+                from the size and density of the graph.
+
+        Returns
+        -------
+            (DistanceTable)
+                The table.
+
+        Raises
+        ------
+        ValueError
+            If an edge with a negative weight is found.
+        """
+        ids = np.array(graph.vertices, dtype=np.int64)
+        index = {int(vertex): i for i, vertex in enumerate(ids)}
+        for (start, end), weight in graph.weights.items():
+            if weight < 0:
+                raise ValueError(
+                    "Shortest path tables require non-negative weights, "
+                    f"got {weight} on ({start}, {end})."
+                )
+        if method == "auto":
+            n = len(ids)
+            density = len(graph.weights) / max(n * n, 1)
+            dense = density >= FLOYD_WARSHALL_MIN_DENSITY
+            method = (
+                "floyd_warshall"
+                if n <= FLOYD_WARSHALL_MAX_VERTICES or dense
+                else "dijkstra"
+            )
+        if method == "floyd_warshall":
+            distances, next_hops = _floyd_warshall(graph, index)
+        elif method == "dijkstra":
+            distances, next_hops = _repeated_dijkstra(graph, index)
+        else:
+            raise ValueError(f"Unknown all-pairs method: {method}")
+        return cls(
+            ids=ids,
+            distances=distances,
+            next_hops=next_hops.astype(_index_dtype(len(ids))),
+            fingerprint=graph_fingerprint(graph),
+        )
+
+    @classmethod
+    def load(cls, path: str | PathLike) -> DistanceTable:
+        """Load a table saved with :meth:`save`."""
+        with np.load(path) as data:
+            return cls(
+                ids=data["ids"],
+                distances=data["distances"],
+                next_hops=data["next_hops"],
+                fingerprint=str(data["fingerprint"]),
+            )
+
+    def save(self, path: str | PathLike) -> None:
+        """Save the table as a compressed NumPy ``.npz`` file."""
+        with open(path, "wb") as file:
+            np.savez_compressed(
+                file,
+                ids=self.__ids,
+                distances=self.__distances,
+                next_hops=self.__next_hops,
+                fingerprint=np.array(self.__fingerprint),
+            )
+
+    @property
+    def ids(self) -> np.ndarray:
+        """Get the vertex of each index."""
+        return self.__ids
+
+    @property
+    def distances(self) -> np.ndarray:
+        """Get the matrix of path costs."""
+        return self.__distances
+
+    @property
+    def next_hops(self) -> np.ndarray:
+        """Get the matrix of next hop indices."""
+        return self.__next_hops
+
+    @property
+    def fingerprint(self) -> str:
+        """Get the fingerprint of the graph the table was built from."""
+        return self.__fingerprint
+
+    def matches(self, graph: BaseGraph) -> bool:
+        """Check if the table was built from a graph equal to the given one."""
+        return self.__fingerprint == graph_fingerprint(graph)
+
+    def distance(self, start: int, end: int) -> float:
+        """Get the cost of the cheapest path between two vertices.
+
+        Returns ``inf`` if there is no path.
+
+        Raises
+        ------
+        KeyError
+            If a vertex is not in the table.
+        """
+        return float(self.__distances[self.__index[start], self.__index[end]])
+
+    def path(self, start: int, end: int) -> list[int]:
+        """Get the cheapest path between two vertices.
+
+        Returns an empty list if there is no path.
+
+        Raises
+        ------
+        KeyError
+            If a vertex is not in the table.
+        """
+        current = self.__index[start]
+        goal = self.__index[end]
+        if self.__next_hops[current, goal] < 0:
+            return []
+        ids = self.__ids
+        next_hops = self.__next_hops
+        path = [int(ids[current])]
+        while current != goal:
+            current = int(next_hops[current, goal])
+            path.append(int(ids[current]))
+        return path
+
+    def __len__(self) -> int:
+        """Return the number of vertices."""
+        return len(self.__ids)
+
+    def __contains__(self, vertex: int) -> bool:
+        """Check if the table contains a vertex."""
+        return vertex in self.__index
+
+
+def graph_fingerprint(graph: BaseGraph) -> str:
+    """Get a digest of the vertices and weighted edges of a graph.
+
+    Two graphs with the same vertices, in the same order, and the same
+    weights have the same fingerprint.
+    """
+    digest = hashlib.sha256()
+    digest.update(repr(graph.vertices).encode())
+    digest.update(repr(sorted(graph.weights.items())).encode())
+    return digest.hexdigest()
+
+
+def _index_dtype(n: int) -> type[np.signedinteger]:
+    """Get the smallest signed integer type able to hold ``n`` indices."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _floyd_warshall(
+    graph: BaseGraph, index: dict[int, int]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Run Floyd–Warshall, relaxing a whole matrix per intermediate vertex."""
+    n = len(index)
+    distances = np.full((n, n), np.inf)
+    next_hops = np.full((n, n), -1, dtype=np.int64)
+    for (start, end), weight in graph.weights.items():
+        i, j = index[start], index[end]
+        if weight < distances[i, j]:
+            distances[i, j] = weight
+            next_hops[i, j] = j
+    diagonal = np.arange(n)
+    distances[diagonal, diagonal] = 0
+    next_hops[diagonal, diagonal] = diagonal
+    for k in range(n):
+        through = distances[:, k, None] + distances[None, k, :]
+        shorter = through < distances
+        np.copyto(distances, through, where=shorter)
+        np.copyto(
+            next_hops, np.broadcast_to(next_hops[:, k, None], (n, n)), where=shorter
+        )
+    return distances, next_hops
+
+
+def _repeated_dijkstra(
+    graph: BaseGraph, index: dict[int, int]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Run a Dijkstra search from every vertex."""
+    n = len(index)
+    distances = np.full((n, n), np.inf)
+    next_hops = np.full((n, n), -1, dtype=np.int64)
+    adjacency = weighted_adjacency(graph, index)
+    for source in range(n):
+        distances[source], next_hops[source] = dijkstra(adjacency, source)
+    return distances, next_hops
+
+
+def weighted_adjacency(
+    graph: BaseGraph, index: dict[int, int]
+) -> list[list[tuple[int, float]]]:
+    """Get the weighted neighbors of every vertex, by vertex index.
+
+    Parameters
+    ----------
+        graph : (BaseGraph)
+            The graph.
+        index : (dict[int, int])
+            The index of every vertex, from 0 to the number of vertices.
+
+    Returns
+    -------
+        (list[list[tuple[int, float]]])
+            The index and the weight of the edge of every neighbor of the
+            vertex with each index, as :func:`dijkstra` takes them.
+    """
+    adjacency = [[] for _ in range(len(index))]
+    for vertex, i in index.items():
+        adjacency[i] = [
+            (index[neighbor], weight)
+            for neighbor, weight in graph.weighted_neighbors(vertex)
+        ]
+    return adjacency
+
+
+def dijkstra(
+    adjacency: list[list[tuple[int, float]]], source: int
+) -> tuple[list[float], list[int]]:
+    """Get the cost and first hop of the cheapest paths from a vertex.
+
+    Examples
+    --------
+    >>> dijkstra([[(1, 2.0)], [(0, 2.0), (2, 1.0)], [(1, 1.0)], []], 0)
+    ([0, 2.0, 3.0, inf], [0, 1, 1, -1])
+
+    Parameters
+    ----------
+        adjacency : (list[list[tuple[int, float]]])
+            The weighted neighbors of every vertex, see
+            :func:`weighted_adjacency`.
+        source : (int)
+            The index of the vertex the paths start at.
+
+    Returns
+    -------
+        (tuple[list[float], list[int]])
+            The cost of the cheapest path to every vertex, or infinity if
+            there is none, and the first vertex after the source along it,
+            or -1.
+    """
+    n = len(adjacency)
+    best = [math.inf] * n
+    hops = [-1] * n
+    best[source] = 0
+    hops[source] = source
+    open_set = [(0, source)]
+    while open_set:
+        cost, current = heapq.heappop(open_set)
+        if cost > best[current]:
+            continue
+        for neighbor, weight in adjacency[current]:
+            new_cost = cost + weight
+            if new_cost < best[neighbor]:
+                best[neighbor] = new_cost
+                # The first hop is inherited from the parent, except for
+                # the neighbors of the source, which are their own hop.
+                hops[neighbor] = neighbor if current == source else hops[current]
+                heapq.heappush(open_set, (new_cost, neighbor))
+    return best, hops
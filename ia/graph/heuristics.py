@@ -0,0 +1,57 @@
+"""Heuristics for the informed graph searches."""
+
+from collections.abc import Mapping
+
+
+def parse_heuristic_table(input_text: str) -> dict[int, float]:
+    r"""Parse a heuristic table.
+
+    Each non-empty line holds a vertex and its estimated cost to the
+    goal, separated by whitespace. Everything after a ``#`` is ignored.
+
+    Examples
+    --------
+    >>> parse_heuristic_table("1 10.5\n2 3  # close to the goal\n")
+    {1: 10.5, 2: 3.0}
+
+    Parameters
+    ----------
+        input_text : (str)
+            The text of the table.
+
+    Raises
+    ------
+    ValueError
+        If a line is not a vertex followed by a non-negative number.
+    """
+    table = {}
+    for line_number, line in enumerate(input_text.splitlines(), start=1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        fields = line.split()
+        if len(fields) != 2:
+            raise ValueError(f"Invalid heuristic table entry on line {line_number}.")
+        vertex, value = int(fields[0]), float(fields[1])
+        if value < 0:
+            raise ValueError(f"Negative heuristic value on line {line_number}.")
+        table[vertex] = value
+    return table
+
+
+def table_heuristic(table: Mapping[int, float]):
+    """Wrap a heuristic table as a heuristic function.
+
+    Vertices missing from the table are estimated as 0.
+
+    Examples
+    --------
+    >>> heuristic = table_heuristic({1: 4.0})
+    >>> heuristic(1, 5), heuristic(2, 5)
+    (4.0, 0)
+    """
+
+    def heuristic(vertex: int, _goal: int) -> float:
+        return table.get(vertex, 0)
+
+    return heuristic
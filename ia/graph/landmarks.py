@@ -0,0 +1,207 @@
+"""Landmark heuristic module.
+
+Contains the Landmarks class, which stores the cost from a few
+landmark vertices to every vertex of a graph and turns it into an
+A* heuristic (ALT: A*, landmarks and the triangle inequality).
+"""
+
+from __future__ import annotations
+
+import math
+from os import PathLike
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .distances import dijkstra, graph_fingerprint, weighted_adjacency
+
+if TYPE_CHECKING:
+    from .base import BaseGraph
+
+DEFAULT_LANDMARK_COUNT = 8
+"""Number of landmarks picked when none is given."""
+
+
+class Landmarks:
+    """Landmark heuristic of a graph.
+
+    ``costs[k, i]`` is the cost of the cheapest path between the ``k``-th
+    landmark and the vertex with index ``i`` (``inf`` if there is none).
+    By the triangle inequality, ``|costs[k, v] - costs[k, goal]|`` never
+    exceeds the cost from ``v`` to the goal, so the largest of these
+    bounds is a consistent heuristic. Unlike a geometric estimate, it
+    follows the actual layout of the graph.
+
+    Examples
+    --------
+    >>> from ia.graph import UndirectedGraph
+    >>> graph = UndirectedGraph()
+    >>> graph.add_edge(1, 2, weight=3.0)
+    >>> graph.add_edge(2, 3, weight=4.0)
+    >>> graph.add_edge(3, 4, weight=1.0)
+    >>> landmarks = Landmarks.from_graph(graph, count=1)
+    >>> landmarks.vertices
+    [4]
+    >>> landmarks.heuristic(1, 3)
+    7.0
+    """
+
+    def __init__(
+        self,
+        *,
+        ids: np.ndarray,
+        landmarks: np.ndarray,
+        costs: np.ndarray,
+        fingerprint: str,
+    ):
+        """Initialize the landmarks from their raw arrays.
+
+        Parameters
+        ----------
+        ids: np.ndarray
+                The vertex of each index.
+        landmarks: np.ndarray
+                The index of each landmark.
+        costs: np.ndarray
+                The ``k x n`` matrix of costs from each landmark.
+        fingerprint: str
+                The fingerprint of the graph the landmarks were picked on.
+
+        """
+        if costs.shape != (len(landmarks), len(ids)):
+            raise ValueError("There must be a row of costs per landmark.")
+        self.__ids = ids
+        self.__landmarks = landmarks
+        self.__costs = costs
+        self.__fingerprint = fingerprint
+        self.__index = {int(vertex): index for index, vertex in enumerate(ids)}
+        # One list of costs per vertex, read by the heuristic in pure Python.
+        self.__vertex_costs = costs.T.tolist()
+
+    @classmethod
+    def from_graph(
+        cls, graph: BaseGraph, count: int = DEFAULT_LANDMARK_COUNT
+    ) -> Landmarks:
+        """Pick the landmarks of a graph.
+
+        Landmarks are picked by farthest-point selection: the first one is
+        the vertex farthest from the first vertex of the graph and each
+        next one is the vertex farthest from all the previous ones, with
+        the vertices they cannot reach first. This spreads them over the
+        edges of the graph, where the bounds are tightest. Each landmark
+        costs one Dijkstra search.
+
+        Parameters
+        ----------
+            graph : (BaseGraph)
+                The graph.
+            count : (int)
+                The number of landmarks. Fewer are picked if the graph does
+                not have that many vertices.
+
+        Returns
+        -------
+            (Landmarks)
+                The landmarks.
+
+        Raises
+        ------
+        ValueError
+            If an edge with a negative weight is found.
+        """
+        ids = np.array(graph.vertices, dtype=np.int64)
+        index = {int(vertex): i for i, vertex in enumerate(ids)}
+        for (start, end), weight in graph.weights.items():
+            if weight < 0:
+                raise ValueError(
+                    "Landmarks require non-negative weights, "
+                    f"got {weight} on ({start}, {end})."
+                )
+        adjacency = weighted_adjacency(graph, index)
+        landmarks: list[int] = []
+        rows: list[list[float]] = []
+        if len(ids):
+            # Before the first landmark, distances are taken from the seed.
+            nearest, _ = dijkstra(adjacency, 0)
+            while len(landmarks) < count:
+                # Vertices out of reach of every landmark are at inf, so
+                # each component gets a landmark before any is refined.
+                candidate = max(range(len(ids)), key=nearest.__getitem__)
+                if landmarks and nearest[candidate] == 0:
+                    break
+                costs, _ = dijkstra(adjacency, candidate)
+                nearest = list(map(min, nearest, costs)) if landmarks else list(costs)
+                landmarks.append(candidate)
+                rows.append(costs)
+        return cls(
+            ids=ids,
+            landmarks=np.array(landmarks, dtype=np.int64),
+            costs=np.array(rows, dtype=np.float64).reshape(len(landmarks), len(ids)),
+            fingerprint=graph_fingerprint(graph),
+        )
+
+    @classmethod
+    def load(cls, path: str | PathLike) -> Landmarks:
+        """Load landmarks saved with :meth:`save`."""
+        with np.load(path) as data:
+            return cls(
+                ids=data["ids"],
+                landmarks=data["landmarks"],
+                costs=data["costs"],
+                fingerprint=str(data["fingerprint"]),
+            )
+
+    def save(self, path: str | PathLike) -> None:
+        """Save the landmarks as a compressed NumPy ``.npz`` file."""
+        with open(path, "wb") as file:
+            np.savez_compressed(
+                file,
+                ids=self.__ids,
+                landmarks=self.__landmarks,
+                costs=self.__costs,
+                fingerprint=np.array(self.__fingerprint),
+            )
+
+    @property
+    def vertices(self) -> list[int]:
+        """Get the landmark vertices."""
+        return [int(self.__ids[index]) for index in self.__landmarks]
+
+    @property
+    def costs(self) -> np.ndarray:
+        """Get the matrix of costs from each landmark."""
+        return self.__costs
+
+    @property
+    def fingerprint(self) -> str:
+        """Get the fingerprint of the graph the landmarks were picked on."""
+        return self.__fingerprint
+
+    def matches(self, graph: BaseGraph) -> bool:
+        """Check if the landmarks were picked on a graph equal to the given one."""
+        return self.__fingerprint == graph_fingerprint(graph)
+
+    def heuristic(self, vertex: int, goal: int) -> float:
+        """Get the landmark lower bound of the cost between two vertices.
+
+        Landmarks that cannot reach both vertices are skipped.
+
+        Raises
+        ------
+        KeyError
+            If a vertex is not in the graph of the landmarks.
+        """
+        vertex_costs = self.__vertex_costs
+        bound = 0.0
+        for cost, goal_cost in zip(
+            vertex_costs[self.__index[vertex]],
+            vertex_costs[self.__index[goal]],
+            strict=True,
+        ):
+            if cost != math.inf and goal_cost != math.inf:
+                bound = max(bound, abs(cost - goal_cost))
+        return bound
+
+    def __len__(self) -> int:
+        """Return the number of landmarks."""
+        return len(self.__landmarks)
@@ -4,24 +4,32 @@ Contains the UndirectedGraph class.
 
 """
 
-from collections.abc import Callable
+from __future__ import annotations
 
-from ia.algorithm import (
-    AlgorithmHistory,
-    TraversalResult,
-    UninformedTraversalAlgorithm,
-    graph_path_cost,
-)
-from ia.tree.node import Node
+from collections.abc import Iterable, Iterator
+from typing import Any, Literal
 
+from ia.algorithm import TraversalResult, UninformedTraversalAlgorithm
 
-class UndirectedGraph:
-    """Undirected graph class."""
+from .base import BaseGraph
+from .csr import CSRGraph
+from .distances import DistanceTable
+
+
+class UndirectedGraph(BaseGraph):
+    """Undirected graph class.
+
+    Derived views such as :attr:`edges` or :attr:`adjacency_matrix`
+    are computed in linear time on first access and cached until the
+    graph is modified through :meth:`add_edge`, :meth:`remove_edge` or
+    :meth:`remove_vertex`.
+    """
 
     def __init__(self):
         """Initialize the graph."""
         self.__adjacency = {}
         self.__weights = {}
+        self.__cache = {}
 
     # Getters / Setters
 
@@ -38,14 +46,7 @@ class UndirectedGraph:
     @property
     def adjacency_matrix(self) -> list[list[int]]:
         """Get the adjacency matrix of the graph."""
-        vertices = self.vertices
-        n = len(vertices)
-        matrix = [[0 for _ in range(n)] for _ in range(n)]
-        for i in range(n):
-            for j in range(n):
-                if vertices[i] in self.__adjacency[vertices[j]]:
-                    matrix[i][j] = 1
-        return matrix
+        return self.to_adjacency_matrix()
 
     @property
     def adjacency_list(self) -> dict[int, list[int]]:
@@ -59,20 +60,31 @@ class UndirectedGraph:
 
     @property
     def edges(self) -> list[tuple[int, int]]:
-        """Get the edges of the graph."""
-        edges = []
-        for start in self.__adjacency:
-            for end in self.__adjacency[start]:
-                if (end, start) not in edges:
-                    edges.append((start, end))
-        return edges
+        """Get the edges of the graph.
+
+        Each edge appears once, oriented from the vertex that
+        was added first to the graph.
+        """
+        if "edges" not in self.__cache:
+            edges = []
+            visited = set()
+            for start, ends in self.__adjacency.items():
+                loop_seen = False
+                for end in ends:
+                    if end == start:
+                        if loop_seen:
+                            continue
+                        loop_seen = True
+                    if end not in visited:
+                        edges.append((start, end))
+                visited.add(start)
+            self.__cache["edges"] = edges
+        return self.__cache["edges"]
 
-    @property
     def neighbors(self, vertex: int) -> list[int]:
         """Get the neighbors of a vertex."""
         return self.__adjacency[vertex]
 
-    @property
     def degree(self, vertex: int) -> int:
         """Get the degree of a vertex."""
         return len(self.__adjacency[vertex])
@@ -80,16 +92,7 @@ class UndirectedGraph:
     @property
     def incidence_matrix(self) -> list[list[int]]:
         """Get the incidence matrix of the graph."""
-        vertices = self.vertices
-        edges = self.edges
-        n = len(vertices)
-        m = len(edges)
-        matrix = [[0 for _ in range(m)] for _ in range(n)]
-        for i in range(n):
-            for j in range(m):
-                if vertices[i] in edges[j]:
-                    matrix[i][j] = 1
-        return matrix
+        return self.to_incidence_matrix()
 
     @property
     def incidence_list(self) -> dict[int, list[int]]:
@@ -97,8 +100,108 @@ class UndirectedGraph:
         edges = self.edges
         return {i: edges[i] for i in range(len(edges))}
 
+    def to_adjacency_matrix(
+        self, format: Literal["list", "numpy", "sparse"] = "list"
+    ) -> Any:
+        """Get the adjacency matrix of the graph.
+
+        Rows and columns follow the order of :attr:`vertices`.
+
+        Parameters
+        ----------
+            format : (Literal["list", "numpy", "sparse"])
+                The type of the matrix. ``"list"`` returns a list of lists,
+                ``"numpy"`` a dense NumPy array and ``"sparse"`` a SciPy
+                sparse array in CSR format.
+
+        Returns
+        -------
+            (list[list[int]] | numpy.ndarray | scipy.sparse.csr_array)
+                The adjacency matrix.
+        """
+        index = {vertex: i for i, vertex in enumerate(self.__adjacency)}
+        rows = []
+        cols = []
+        for start, ends in self.__adjacency.items():
+            for end in ends:
+                rows.append(index[end])
+                cols.append(index[start])
+        n = len(index)
+        return self.__build_matrix(f"adjacency_{format}", format, (n, n), rows, cols)
+
+    def to_incidence_matrix(
+        self, format: Literal["list", "numpy", "sparse"] = "list"
+    ) -> Any:
+        """Get the incidence matrix of the graph.
+
+        Rows follow the order of :attr:`vertices` and columns
+        the order of :attr:`edges`.
+
+        Parameters
+        ----------
+            format : (Literal["list", "numpy", "sparse"])
+                The type of the matrix. ``"list"`` returns a list of lists,
+                ``"numpy"`` a dense NumPy array and ``"sparse"`` a SciPy
+                sparse array in CSR format.
+
+        Returns
+        -------
+            (list[list[int]] | numpy.ndarray | scipy.sparse.csr_array)
+                The incidence matrix.
+        """
+        index = {vertex: i for i, vertex in enumerate(self.__adjacency)}
+        edges = self.edges
+        rows = []
+        cols = []
+        for j, (start, end) in enumerate(edges):
+            rows.append(index[start])
+            cols.append(j)
+            if end != start:
+                rows.append(index[end])
+                cols.append(j)
+        shape = (len(index), len(edges))
+        return self.__build_matrix(f"incidence_{format}", format, shape, rows, cols)
+
+    def __build_matrix(
+        self,
+        key: str,
+        format: Literal["list", "numpy", "sparse"],
+        shape: tuple[int, int],
+        rows: list[int],
+        cols: list[int],
+    ) -> Any:
+        """Build a 0/1 matrix with ones at the given cells and cache it."""
+        if key in self.__cache:
+            return self.__cache[key]
+        if format == "list":
+            matrix = [[0] * shape[1] for _ in range(shape[0])]
+            for row, col in zip(rows, cols, strict=True):
+                matrix[row][col] = 1
+        elif format == "numpy":
+            try:
+                import numpy as np
+            except ImportError as e:
+                raise ImportError("NumPy is required for numpy matrices.") from e
+
+            matrix = np.zeros(shape, dtype=np.int8)
+            matrix[rows, cols] = 1
+        elif format == "sparse":
+            try:
+                from scipy.sparse import csr_array  # type: ignore
+            except ImportError as e:
+                raise ImportError("SciPy is required for sparse matrices.") from e
+
+            matrix = csr_array(([1] * len(rows), (rows, cols)), shape=shape)
+            matrix.sum_duplicates()
+            matrix.data[:] = 1
+        else:
+            raise ValueError(f"Unknown matrix format: {format}")
+        self.__cache[key] = matrix
+        return matrix
+
     def add_edge(self, start: int, end: int, *, weight: int = 1) -> None:
         """Add an edge to the graph."""
+        self.__cache.clear()
         if start not in self.__adjacency:
             self.__adjacency[start] = []
         if end not in self.__adjacency:
@@ -110,6 +213,7 @@ class UndirectedGraph:
 
     def remove_edge(self, start: int, end: int) -> None:
         """Remove an edge from the graph."""
+        self.__cache.clear()
         self.__adjacency[start].remove(end)
         self.__adjacency[end].remove(start)
         del self.__weights[(start, end)]
@@ -117,124 +221,61 @@ class UndirectedGraph:
 
     def remove_vertex(self, vertex: int) -> None:
         """Remove a vertex from the graph."""
-        del self.__adjacency[vertex]
-        for u in self.__adjacency:
-            if vertex in self.__adjacency[u]:
-                self.__adjacency[u].remove(vertex)
-                del self.__weights[(u, vertex)]
-                del self.__weights[(vertex, u)]
-
-    def dfs(
-        self,
-        *,
-        start: int,
-        end: int,
-        sort_generated: Callable[[list[int]], list[int]] = None,
-    ) -> TraversalResult:
-        """Depth-first search."""
-        if sort_generated is None:
-
-            def sort_generated(_generated):
-                return reversed(_generated)
-
-        history = AlgorithmHistory()
-        tree_root = Node(start, id=start)
-        generated = [tree_root.id]
-        inspected = []
-        stack = [tree_root]
-        history.add_step(generated=generated, inspected=inspected)
-        current = None
-        while stack:
-            current = stack.pop()
-            if current.id == end:
-                inspected.append(current.id)
-                history.add_step(generated=generated, inspected=inspected)
-                break
-            new_generated = [
-                neighbor
-                for neighbor in self.adjacency[current.id]
-                if neighbor not in [ancestor.id for ancestor in current.ancestors]
-                and neighbor is not current
-            ]
-            generated.extend(new_generated)
-            stack.extend(
-                [
-                    Node(successor, parent=current, id=successor)
-                    for successor in sort_generated(new_generated)
-                ]
-            )
-            inspected.append(current.id)
-            history.add_step(generated=generated, inspected=inspected)
-        if current.id != end:
-            return TraversalResult(history, [], -1, tree=tree_root)
-        path = current.node_path
-        return TraversalResult(
-            history,
-            path=current.node_path,
-            cost=graph_path_cost(path, self.weights),
-            tree=tree_root,
-        )
-
-    def bfs(
+        self.__cache.clear()
+        for u in dict.fromkeys(self.__adjacency.pop(vertex)):
+            if u == vertex:
+                del self.__weights[(vertex, vertex)]
+                continue
+            self.__adjacency[u].remove(vertex)
+            del self.__weights[(u, vertex)]
+            del self.__weights[(vertex, u)]
+
+    def components(self) -> dict[int, int]:
+        """Label the connected components of the graph.
+
+        The labels are cached until the graph is modified.
+        See :meth:`BaseGraph.components`.
+        """
+        if "components" not in self.__cache:
+            self.__cache["components"] = super().components()
+        return self.__cache["components"]
+
+    def all_pairs(
+        self, method: Literal["auto", "floyd_warshall", "dijkstra"] = "auto"
+    ) -> DistanceTable:
+        """Get the all-pairs shortest path table of the graph.
+
+        The table is cached until the graph is modified.
+        See :meth:`DistanceTable.from_graph` for the available methods.
+        """
+        key = f"all_pairs_{method}"
+        if key not in self.__cache:
+            self.__cache[key] = super().all_pairs(method)
+        return self.__cache[key]
+
+    def freeze(self) -> CSRGraph:
+        """Get an immutable compressed sparse row copy of the graph.
+
+        The copy supports the same traversals and is much more compact,
+        but later changes to this graph are not reflected on it.
+        """
+        return CSRGraph.from_graph(self)
+
+    def traverse_many(
         self,
+        queries: Iterable[tuple[int, int]],
         *,
-        start: int,
-        end: int,
-        sort_generated: Callable[[list[int]], list[int]] = None,
-    ) -> TraversalResult:
-        """Breadth-first search."""
-        if sort_generated is None:
-
-            def sort_generated(_generated):
-                return _generated
-
-        history = AlgorithmHistory()
-        tree_root = Node(start, id=start)
-        generated = [tree_root.id]
-        inspected = []
-        queue = [tree_root]
-        history.add_step(generated=generated, inspected=inspected)
-        current = None
-        while queue:
-            current = queue.pop(0)
-            if current.id == end:
-                inspected.append(current.id)
-                history.add_step(generated=generated, inspected=inspected)
-                break
-            new_generated = [
-                neighbor
-                for neighbor in self.adjacency[current.id]
-                if neighbor not in [ancestor.id for ancestor in current.ancestors]
-                and neighbor is not current
-            ]
-            generated.extend(new_generated)
-            queue.extend(
-                [
-                    Node(successor, parent=current, id=successor)
-                    for successor in sort_generated(new_generated)
-                ]
-            )
-            inspected.append(current.id)
-            history.add_step(generated=generated, inspected=inspected)
-        if current.id != end:
-            return TraversalResult(history, [], -1, tree=tree_root)
-        path = current.node_path
-        return TraversalResult(
-            history,
-            path=current.node_path,
-            cost=graph_path_cost(path, self.weights),
-            tree=tree_root,
-        )
-
-    def traverse(
-        self, *, start: int, end: int, algorithm: UninformedTraversalAlgorithm
-    ) -> TraversalResult:
-        """Traverse the graph."""
-        if algorithm == "dfs":
-            return self.dfs(start=start, end=end)
-        elif algorithm == "bfs":
-            return self.bfs(start=start, end=end)
-        raise TypeError(f"Invalid algorithm {algorithm}")
+        algorithm: UninformedTraversalAlgorithm,
+        **options: Any,
+    ) -> Iterator[tuple[int, TraversalResult]]:
+        """Run :meth:`traverse` for many start and end pairs in parallel.
+
+        The graph is frozen first, see :meth:`freeze` and
+        :meth:`CSRGraph.traverse_many`, which takes the same ``options``.
+        The results are the same as on this graph, except that the weights
+        are floats.
+        """
+        return self.freeze().traverse_many(queries, algorithm=algorithm, **options)
 
     def to_networkx(self):
         """Convert the graph to a NetworkX graph."""
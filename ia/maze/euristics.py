@@ -3,9 +3,19 @@
 import math
 from collections.abc import Callable
 from enum import Enum
+from functools import lru_cache
+
+import numpy as np
 
 from ia.maze.matrix import MatrixPosition
 
+EURISTIC_TABLE_CACHE_SIZE = 2
+"""Number of whole-grid euristic tables kept in memory.
+
+A table takes 4 bytes per cell, 64 MB on a 4000x4000 grid, in every
+process, so only the ones of the last goals are kept.
+"""
+
 
 def manhattan_distance(start: MatrixPosition, goal: MatrixPosition) -> int:
     """Calculate the Manhattan distance between two positions.
@@ -131,6 +141,8 @@ class Euristic(str, Enum):
     CHEBYSHEV = "chebyshev"
     OCTILE = "octile"
     GREATER_DIAGONAL_G_SCORE = "greater_diagonal_g_score"
+    LANDMARKS = "landmarks"
+    """ALT bound from the landmarks of the maze, see :meth:`Maze.landmarks`."""
 
     def to_function(self) -> Callable[[MatrixPosition, MatrixPosition], int]:
         """Call the euristic function.
@@ -148,3 +160,70 @@ class Euristic(str, Enum):
             Euristic.CHEBYSHEV: chebyshev_distance,
             Euristic.OCTILE: octile_distance,
         }[self]
+
+    def to_array(self, rows: int, cols: int, goal: MatrixPosition) -> np.ndarray:
+        """Get the euristic of every cell of a grid at once.
+
+        ``to_array(rows, cols, goal)[row, col]`` is the same integer as
+        ``to_function()(MatrixPosition(row, col), goal)``, computed for the
+        whole grid in a single vectorized pass. The last tables are cached
+        per euristic, grid shape and goal, see
+        :data:`EURISTIC_TABLE_CACHE_SIZE`, so they must not be modified.
+
+        Examples
+        --------
+        >>> Euristic.CHEBYSHEV.to_array(2, 3, MatrixPosition(0, 2))
+        array([[2, 1, 0],
+               [2, 1, 1]], dtype=int32)
+
+        Parameters
+        ----------
+            rows : int
+                The number of rows of the grid.
+            cols : int
+                The number of columns of the grid.
+            goal : MatrixPosition
+                The goal position.
+
+        Returns
+        -------
+            (np.ndarray)
+                The read-only ``rows x cols`` table of euristic values.
+
+        Raises
+        ------
+        ValueError
+            If the member is not a geometric euristic.
+        """
+        if self == Euristic.LANDMARKS:
+            raise ValueError(
+                "The landmarks euristic depends on the walls, see Maze.landmarks."
+            )
+        return _euristic_table(self, rows, cols, goal.row, goal.col)
+
+
+@lru_cache(maxsize=EURISTIC_TABLE_CACHE_SIZE)
+def _euristic_table(
+    euristic: Euristic, rows: int, cols: int, goal_row: int, goal_col: int
+) -> np.ndarray:
+    """Build the euristic table of a grid."""
+    row_distances = np.abs(np.arange(rows, dtype=np.int64) - goal_row)[:, None]
+    col_distances = np.abs(np.arange(cols, dtype=np.int64) - goal_col)[None, :]
+    # The floating point operations follow the scalar functions step by
+    # step, so that both round to the same integers.
+    if euristic == Euristic.MANHATTAN:
+        table = (row_distances + col_distances) * 3
+    elif euristic == Euristic.EUCLIDEAN:
+        table = np.floor(np.sqrt(row_distances**2 + col_distances**2) * 3)
+    elif euristic == Euristic.CHEBYSHEV:
+        table = np.maximum(row_distances, col_distances)
+    elif euristic == Euristic.OCTILE:
+        table = np.floor(
+            (row_distances + col_distances)
+            + (math.sqrt(2) - 2) * np.minimum(row_distances, col_distances)
+        )
+    else:
+        raise ValueError(f"{euristic.value} is not an euristic.")
+    table = table.astype(np.int32)
+    table.flags.writeable = False
+    return table
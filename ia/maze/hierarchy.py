@@ -0,0 +1,346 @@
+"""Hierarchical abstraction module.
+
+Contains the Hierarchy class, the abstract graph of a maze used by
+hierarchical pathfinding (HPA*).
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ia.maze.matrix import NEIGHBOR_OFFSETS
+from ia.maze.tile import MazeTile
+
+if TYPE_CHECKING:
+    from ia.maze.maze import Maze
+
+DEFAULT_CLUSTER_SIZE = 16
+"""Side of the square clusters when none is given."""
+
+LONG_ENTRANCE = 6
+"""Entrances at least this wide get a transition at each end instead of one."""
+
+
+class Hierarchy:
+    """Abstract graph of a maze split in square clusters.
+
+    The maze is split in ``cluster_size x cluster_size`` clusters. Along
+    the border between two clusters, every maximal run of cells that are
+    free on both sides is an entrance, with a transition (a pair of
+    facing cells) in its middle, or one at each end if it is wide. Cells
+    that can only cross a border diagonally also get a transition, so any
+    cell that can reach another one in the maze can also reach it in the
+    abstract graph.
+
+    The nodes of the abstract graph are the cells of the transitions.
+    They are linked with the 5 or 7 cost of the move across the border,
+    and with the exact cost of the cheapest path inside their cluster
+    between any two nodes of the same cluster. A search over this graph
+    only visits a few nodes per cluster, and its path is refined into
+    cells cluster by cluster with :meth:`refine`.
+
+    Only the transitions are found up front. The costs from a node to
+    the other nodes of its cluster are computed the first time
+    :meth:`neighbors` is asked for it and kept, so nodes that no search
+    expands cost nothing.
+
+    Examples
+    --------
+    >>> from ia.maze.maze import Maze
+    >>> maze = Maze(rows=2, cols=4)
+    >>> for col in range(4):
+    ...     maze[0, col] = MazeTile.EMPTY
+    >>> hierarchy = Hierarchy.from_maze(maze, cluster_size=2)
+    >>> hierarchy.nodes
+    [1, 2]
+    >>> hierarchy.neighbors(1)
+    {2: 5}
+    """
+
+    def __init__(
+        self,
+        *,
+        cols: int,
+        moves: bytes,
+        cluster_size: int,
+        transitions: dict[int, dict[int, int]],
+    ):
+        """Initialize the hierarchy.
+
+        Parameters
+        ----------
+            cols : (int)
+                The number of columns of the maze.
+            moves : (bytes)
+                One byte per cell, indexed by ``row * cols + col``, with bit
+                ``k`` set if the move ``NEIGHBOR_OFFSETS[k]`` from the cell
+                leads to a free cell of the same cluster.
+            cluster_size : (int)
+                The side of the clusters.
+            transitions : (dict[int, dict[int, int]])
+                The cost of the moves across borders from every node.
+        """
+        if cluster_size < 1:
+            raise ValueError(f"Clusters must have a positive size: {cluster_size}")
+        self.__cols = cols
+        self.__moves = moves
+        self.__cluster_size = cluster_size
+        self.__transitions = transitions
+        self.__clusters: dict[tuple[int, int], list[int]] = {}
+        for node in sorted(transitions):
+            self.__clusters.setdefault(self.cluster(node), []).append(node)
+        self.__intra_edges: dict[int, dict[int, int]] = {}
+        # The index offset and cost of the moves allowed by each byte.
+        offsets = [
+            (
+                row_offset * cols + col_offset,
+                5 if row_offset == 0 or col_offset == 0 else 7,
+            )
+            for row_offset, col_offset in NEIGHBOR_OFFSETS
+        ]
+        self.__move_table = [
+            [offset for bit, offset in enumerate(offsets) if moves_byte >> bit & 1]
+            for moves_byte in range(256)
+        ]
+
+    @classmethod
+    def from_maze(
+        cls,
+        maze: Maze,
+        cluster_size: int = DEFAULT_CLUSTER_SIZE,
+        tiles_to_ignore: list[MazeTile] | None = None,
+    ) -> Hierarchy:
+        """Find the transitions between the clusters of a maze.
+
+        Entrances and the moves inside the clusters are found with
+        vectorized operations, so this takes a few passes over the tiles
+        plus O(1) per transition.
+
+        Parameters
+        ----------
+            maze : (Maze)
+                The maze.
+            cluster_size : (int)
+                The side of the clusters.
+            tiles_to_ignore : (list[MazeTile])
+                The tiles to ignore.
+
+        Returns
+        -------
+            (Hierarchy)
+                The abstract graph.
+        """
+        if tiles_to_ignore is None:
+            tiles_to_ignore = [MazeTile.WALL]
+        mask = maze.mask(*tiles_to_ignore)
+        free = ~mask
+        rows, cols = maze.rows, maze.cols
+        transitions: dict[int, dict[int, int]] = {}
+
+        def link(first: int, second: int, cost: int) -> None:
+            for node, other in ((first, second), (second, first)):
+                neighbors = transitions.setdefault(node, {})
+                if cost < neighbors.get(other, cost + 1):
+                    neighbors[other] = cost
+
+        for row in range(cluster_size - 1, rows - 1, cluster_size):
+            for col, next_col, cost in _border_crossings(
+                free[row], free[row + 1], cluster_size
+            ):
+                link(row * cols + col, (row + 1) * cols + next_col, cost)
+        for col in range(cluster_size - 1, cols - 1, cluster_size):
+            for row, next_row, cost in _border_crossings(
+                free[:, col], free[:, col + 1], cluster_size
+            ):
+                link(row * cols + col, next_row * cols + col + 1, cost)
+        rows_cluster = np.arange(rows) // cluster_size
+        cols_cluster = np.arange(cols) // cluster_size
+        moves = np.zeros((rows, cols), dtype=np.uint8)
+        for bit, (row_offset, col_offset) in enumerate(NEIGHBOR_OFFSETS):
+            # Cells [row_slice, col_slice] move to [next_rows, next_cols].
+            row_slice = slice(max(-row_offset, 0), rows - max(row_offset, 0))
+            col_slice = slice(max(-col_offset, 0), cols - max(col_offset, 0))
+            next_rows = slice(row_slice.start + row_offset, row_slice.stop + row_offset)
+            next_cols = slice(col_slice.start + col_offset, col_slice.stop + col_offset)
+            allowed = (
+                free[row_slice, col_slice]
+                & free[next_rows, next_cols]
+                & (rows_cluster[row_slice] == rows_cluster[next_rows])[:, None]
+                & (cols_cluster[col_slice] == cols_cluster[next_cols])[None, :]
+            )
+            moves[row_slice, col_slice] |= allowed.astype(np.uint8) << bit
+        return cls(
+            cols=cols,
+            moves=moves.tobytes(),
+            cluster_size=cluster_size,
+            transitions=transitions,
+        )
+
+    @property
+    def cluster_size(self) -> int:
+        """Get the side of the clusters."""
+        return self.__cluster_size
+
+    @property
+    def nodes(self) -> list[int]:
+        """Get the nodes of the abstract graph, as ``row * cols + col`` indices."""
+        return sorted(self.__transitions)
+
+    def cluster(self, index: int) -> tuple[int, int]:
+        """Get the row and column of the cluster of a cell."""
+        row, col = divmod(index, self.__cols)
+        return row // self.__cluster_size, col // self.__cluster_size
+
+    def nodes_in(self, cluster: tuple[int, int]) -> list[int]:
+        """Get the nodes of a cluster."""
+        return self.__clusters.get(cluster, [])
+
+    def neighbors(self, node: int) -> dict[int, int]:
+        """Get the cost of the edges from a node to its neighbors.
+
+        Raises
+        ------
+        KeyError
+            If the cell is not a node of the abstract graph.
+        """
+        neighbors = dict(self.__transitions[node])
+        intra_edges = self.__intra_edges.get(node)
+        if intra_edges is None:
+            others = [
+                other for other in self.nodes_in(self.cluster(node)) if other != node
+            ]
+            costs = self.__search(node, others)[0] if others else {}
+            intra_edges = self.__intra_edges[node] = {
+                other: costs[other] for other in others if other in costs
+            }
+        neighbors.update(intra_edges)
+        return neighbors
+
+    def connect(self, index: int, targets: tuple[int, ...] = ()) -> dict[int, int]:
+        """Get the cost from a cell to the nodes of its cluster.
+
+        Used to insert the start and the goal of a search in the abstract
+        graph. The costs are those of paths inside the cluster.
+
+        Parameters
+        ----------
+            index : (int)
+                The ``row * cols + col`` index of the cell.
+            targets : (tuple[int, ...])
+                Other cells to include if they are in the same cluster.
+
+        Returns
+        -------
+            (dict[int, int])
+                The cost to every node or target that can be reached.
+        """
+        costs, _ = self.__search(index)
+        return {
+            cell: costs[cell]
+            for cell in (*self.nodes_in(self.cluster(index)), *targets)
+            if cell != index and cell in costs
+        }
+
+    def refine(self, first: int, second: int) -> list[int]:
+        """Get the cells of a cheapest path between two linked cells.
+
+        The cells are either in the same cluster, where the path stays, or
+        on both sides of a transition, which is a single move.
+
+        Returns
+        -------
+            (list[int])
+                The cells after ``first`` up to ``second``, or an empty list
+                if there is no such path.
+        """
+        if self.cluster(first) != self.cluster(second):
+            return [second]
+        _, parents = self.__search(first, (second,))
+        if second not in parents:
+            return []
+        path = []
+        cell = second
+        while cell != first:
+            path.append(cell)
+            cell = parents[cell]
+        path.reverse()
+        return path
+
+    def __search(
+        self, source: int, targets: list[int] | tuple[int, ...] = ()
+    ) -> tuple[dict[int, int], dict[int, int]]:
+        """Run a uniform-cost search from a cell, without leaving its cluster.
+
+        Stops once every target is settled, if any are given.
+        """
+        moves = self.__moves
+        move_table = self.__move_table
+        remaining = set(targets)
+        costs = {source: 0}
+        parents = {source: source}
+        open_set = [(0, source)]
+        while open_set:
+            cost, current = heapq.heappop(open_set)
+            if cost > costs[current]:
+                continue
+            if remaining:
+                remaining.discard(current)
+                if not remaining:
+                    break
+            for offset, step in move_table[moves[current]]:
+                neighbor = current + offset
+                new_cost = cost + step
+                if new_cost < costs.get(neighbor, new_cost + 1):
+                    costs[neighbor] = new_cost
+                    parents[neighbor] = current
+                    heapq.heappush(open_set, (new_cost, neighbor))
+        return costs, parents
+
+    def __len__(self) -> int:
+        """Return the number of nodes of the abstract graph."""
+        return len(self.__transitions)
+
+    def __contains__(self, index: int) -> bool:
+        """Check if a cell is a node of the abstract graph."""
+        return index in self.__transitions
+
+
+def _border_crossings(
+    first: np.ndarray, second: np.ndarray, cluster_size: int
+) -> list[tuple[int, int, int]]:
+    """Get the transitions across the border between two lines of cells.
+
+    Returns ``(i, j, cost)`` triples, meaning that cell ``i`` of the first
+    line is linked with cell ``j`` of the second one.
+    """
+    straight = first & second
+    crossings = []
+    # Entrances are the runs of straight crossings, split at the corners
+    # of the clusters so both sides of each one stay in a single cluster.
+    for start in range(0, len(straight), cluster_size):
+        segment = np.concatenate(
+            ([False], straight[start : start + cluster_size], [False])
+        ).astype(np.int8)
+        changes = np.diff(segment)
+        run_starts = np.flatnonzero(changes == 1) + start
+        run_ends = np.flatnonzero(changes == -1) + start - 1
+        for run_start, run_end in zip(
+            run_starts.tolist(), run_ends.tolist(), strict=True
+        ):
+            if run_end - run_start + 1 >= LONG_ENTRANCE:
+                crossings.append((run_start, run_start, 5))
+                crossings.append((run_end, run_end, 5))
+            else:
+                middle = (run_start + run_end) // 2
+                crossings.append((middle, middle, 5))
+    # A diagonal crossing is only needed where no straight crossing next
+    # to it leads to the same cell.
+    lone = ~straight[:-1] & ~straight[1:]
+    for i in np.flatnonzero(lone & first[:-1] & second[1:]).tolist():
+        crossings.append((i, i + 1, 7))
+    for i in np.flatnonzero(lone & first[1:] & second[:-1]).tolist():
+        crossings.append((i + 1, i, 7))
+    return crossings
@@ -0,0 +1,367 @@
+"""Incremental planning module.
+
+Contains the IncrementalPlanner class, which keeps the search state of
+a maze between queries and repairs it when tiles or endpoints change
+(D* Lite).
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING
+
+from ia.algorithm import AlgorithmHistory, HistoryPolicy, TraversalResult
+from ia.maze import euristics
+from ia.maze.landmarks import Landmarks
+from ia.maze.matrix import NEIGHBOR_OFFSETS, MatrixPosition
+from ia.maze.tile import MazeTile
+from ia.tree.node import Node
+
+if TYPE_CHECKING:
+    from ia.maze.maze import Maze
+
+
+class IncrementalPlanner:
+    """D* Lite planner bound to a maze.
+
+    The planner searches backwards from the goal and keeps, for every cell
+    it has touched, its cost to the goal (``g``) and the best cost through
+    its neighbors (``rhs``). It listens to the cells set on the maze, see
+    :meth:`Matrix.add_listener`, and on the next :meth:`plan` only the
+    cells whose walls changed and their neighbors are updated, and the
+    search resumes from them. Cells far from the changes keep their costs,
+    so a small edit costs a small search instead of a full one.
+
+    The endpoints are read from the maze on every :meth:`plan`. A new start
+    is handled by raising the keys of the queue by the euristic between
+    the old and the new start, without touching the costs. A new goal
+    invalidates every cost, so the search starts over.
+
+    Moves cost 5 orthogonally and 7 diagonally, as in :meth:`Maze.a_star`.
+
+    Examples
+    --------
+    >>> from ia.maze.maze import Maze
+    >>> maze = Maze(rows=1, cols=3)
+    >>> maze[0, 1] = MazeTile.EMPTY
+    >>> maze[0, 0], maze[0, 2] = MazeTile.START, MazeTile.GOAL
+    >>> maze.start, maze.goal = MatrixPosition(0, 0), MatrixPosition(0, 2)
+    >>> planner = IncrementalPlanner(maze)
+    >>> planner.plan().cost
+    10
+    >>> maze[0, 1] = MazeTile.WALL
+    >>> planner.plan().cost is None
+    True
+    """
+
+    def __init__(
+        self,
+        maze: Maze,
+        euristic_func: Callable[[MatrixPosition, MatrixPosition], int]
+        | euristics.Euristic
+        | None = None,
+        tiles_to_ignore: list[MazeTile] | None = None,
+    ):
+        """Bind the planner to a maze.
+
+        Parameters
+        ----------
+            maze : (Maze)
+                The maze.
+            euristic_func : (Callable[[MatrixPosition, MatrixPosition], int] | Euristic)
+                A consistent euristic function. Built-in euristics are read
+                from their whole-grid table for the current start, see
+                :meth:`Euristic.to_array`. Defaults to the Manhattan distance.
+            tiles_to_ignore : (list[MazeTile])
+                The tiles to ignore.
+
+        Raises
+        ------
+        ValueError
+            If the euristic is the landmarks one, which is only valid for
+            the tiles the landmarks were picked on.
+        """
+        if euristic_func is None:
+            euristic_func = euristics.Euristic.MANHATTAN
+        if euristic_func == euristics.Euristic.LANDMARKS or isinstance(
+            euristic_func, Landmarks
+        ):
+            raise ValueError(
+                "Landmarks are only valid for the tiles they were picked on."
+            )
+        if tiles_to_ignore is None:
+            tiles_to_ignore = [MazeTile.WALL]
+        self.__maze = maze
+        self.__euristic_func = euristic_func
+        self.__tiles_to_ignore = frozenset(tiles_to_ignore)
+        self.__blocked = bytearray(maze.mask(*tiles_to_ignore).tobytes())
+        self.__changed: set[int] = set()
+        cols = maze.cols
+        self.__moves = [
+            (
+                row_offset,
+                col_offset,
+                row_offset * cols + col_offset,
+                5 if row_offset == 0 or col_offset == 0 else 7,
+            )
+            for row_offset, col_offset in NEIGHBOR_OFFSETS
+        ]
+        self.__start: int | None = None
+        self.__goal: int | None = None
+        self.__h_score: Sequence[int | None] = []
+        self.__g_score: list[float] = []
+        self.__rhs: list[float] = []
+        self.__queue: list[tuple[float, float, int]] = []
+        self.__keys: dict[int, tuple[float, float]] = {}
+        self.__key_modifier = 0
+        maze.add_listener(self.__on_change)
+
+    @property
+    def maze(self) -> Maze:
+        """Get the maze the planner is bound to."""
+        return self.__maze
+
+    def plan(self, history_policy: HistoryPolicy | None = None) -> TraversalResult:
+        """Find a cheapest path between the start and the goal of the maze.
+
+        The first call searches like a backward A*. Later calls repair the
+        costs left by the previous one, so the history only records the
+        cells expanded by the repair.
+
+        Parameters
+        ----------
+            history_policy : (HistoryPolicy)
+                Which steps of the search to record in the history.
+
+        Returns
+        -------
+            (TraversalResult)
+                The path from the start to the goal. Each node has the cost
+                from the start as its g score and the exact cost left to the
+                goal as its h score. If there is no path, the path and the
+                cost are None.
+        """
+        maze = self.__maze
+        cols = maze.cols
+        start_index = maze.start.row * cols + maze.start.col
+        goal_index = maze.goal.row * cols + maze.goal.col
+        if goal_index != self.__goal:
+            self.__reset(start_index, goal_index)
+        else:
+            if start_index != self.__start:
+                # Every key was computed with the euristic to the old
+                # start, which is at most this much higher than the one
+                # to the new start.
+                last_start = self.__start
+                self.__start = start_index
+                self.__h_score = self.__h_scores(start_index)
+                self.__key_modifier += self.__h(last_start)
+            changed = self.__changed
+            self.__changed = set()
+            for index in changed:
+                self.__update(index)
+                for neighbor, _ in self.__neighbors(index):
+                    self.__update(neighbor)
+
+        history = AlgorithmHistory(resolve_node=self.__position, policy=history_policy)
+        self.__compute(history)
+        cost = self.__g_score[start_index]
+        if cost == math.inf:
+            return TraversalResult(history, path=None, cost=None)
+        return TraversalResult(history, path=self.__path(start_index), cost=cost)
+
+    def close(self) -> None:
+        """Stop listening to the maze."""
+        self.__maze.remove_listener(self.__on_change)
+
+    def __on_change(
+        self, position: MatrixPosition, previous: MazeTile, value: MazeTile
+    ) -> None:
+        """Record a cell whose tile became or stopped being ignored."""
+        blocked = value in self.__tiles_to_ignore
+        index = position.row * self.__maze.cols + position.col
+        if blocked != bool(self.__blocked[index]):
+            self.__blocked[index] = blocked
+            self.__changed.add(index)
+
+    def __reset(self, start: int, goal: int) -> None:
+        """Forget every cost and start a search towards a new goal."""
+        size = len(self.__blocked)
+        self.__start = start
+        self.__goal = goal
+        self.__h_score = self.__h_scores(start)
+        self.__g_score = [math.inf] * size
+        self.__rhs = [math.inf] * size
+        self.__queue = []
+        self.__keys = {}
+        self.__key_modifier = 0
+        self.__changed = set()
+        if not self.__blocked[goal]:
+            self.__rhs[goal] = 0
+            self.__push(goal)
+
+    def __compute(self, history: AlgorithmHistory) -> None:
+        """Expand cells until the cost of the start is exact."""
+        queue = self.__queue
+        keys = self.__keys
+        g_score = self.__g_score
+        rhs = self.__rhs
+        blocked = self.__blocked
+        start = self.__start
+        goal = self.__goal
+        start_h = self.__h(start)
+        while queue:
+            k1, k2, current = queue[0]
+            key = keys.get(current)
+            if key is None or key[0] != k1 or key[1] != k2:
+                heapq.heappop(queue)
+                continue
+            start_best = min(g_score[start], rhs[start])
+            if rhs[start] == g_score[start] and (k1, k2) >= (
+                start_best + start_h + self.__key_modifier,
+                start_best,
+            ):
+                break
+            if (k1, k2) < self.__key(current):
+                self.__push(current)
+                continue
+            heapq.heappop(queue)
+            del keys[current]
+            generated: list[int] = []
+            if g_score[current] > rhs[current]:
+                current_g_score = g_score[current] = rhs[current]
+                for neighbor, cost in self.__neighbors(current):
+                    if neighbor == goal or blocked[neighbor]:
+                        continue
+                    if current_g_score + cost < rhs[neighbor]:
+                        rhs[neighbor] = current_g_score + cost
+                        if g_score[neighbor] != rhs[neighbor]:
+                            self.__push(neighbor)
+                            generated.append(neighbor)
+                        else:
+                            keys.pop(neighbor, None)
+            else:
+                g_score[current] = math.inf
+                if self.__update(current):
+                    generated.append(current)
+                for neighbor, _ in self.__neighbors(current):
+                    if self.__update(neighbor):
+                        generated.append(neighbor)
+            history.add_step(generated=generated, inspected=[current])
+
+    def __update(self, index: int) -> bool:
+        """Recompute the best cost through the neighbors of a cell.
+
+        Returns
+        -------
+            (bool)
+                True if the cell was queued because its cost changed.
+        """
+        g_score = self.__g_score
+        rhs = self.__rhs
+        if index != self.__goal:
+            best = math.inf
+            if not self.__blocked[index]:
+                blocked = self.__blocked
+                for neighbor, cost in self.__neighbors(index):
+                    if not blocked[neighbor] and g_score[neighbor] + cost < best:
+                        best = g_score[neighbor] + cost
+            rhs[index] = best
+        elif self.__blocked[index]:
+            rhs[index] = math.inf
+        else:
+            rhs[index] = 0
+        if g_score[index] != rhs[index]:
+            self.__push(index)
+            return True
+        self.__keys.pop(index, None)
+        return False
+
+    def __key(self, index: int) -> tuple[float, float]:
+        """Get the priority of a cell in the queue."""
+        best = min(self.__g_score[index], self.__rhs[index])
+        return best + self.__h(index) + self.__key_modifier, best
+
+    def __push(self, index: int) -> None:
+        """Queue a cell, replacing its previous entry if any."""
+        key = self.__key(index)
+        self.__keys[index] = key
+        heapq.heappush(self.__queue, (*key, index))
+
+    def __h(self, index: int) -> int:
+        """Get the euristic between a cell and the start."""
+        h = self.__h_score[index]
+        if h is None:
+            h = self.__h_score[index] = self.__euristic_func(
+                self.__position(index), self.__position(self.__start)
+            )
+        return h
+
+    def __h_scores(self, start: int) -> Sequence[int | None]:
+        """Get the euristic from a start, indexed by ``row * cols + col``.
+
+        Built-in euristics are read from a whole-grid table. Other functions
+        are evaluated lazily, so every cell is None until it is needed.
+        """
+        maze = self.__maze
+        if isinstance(self.__euristic_func, euristics.Euristic):
+            table = self.__euristic_func.to_array(
+                maze.rows, maze.cols, self.__position(start)
+            )
+            return memoryview(table.reshape(-1))
+        return [None] * len(self.__blocked)
+
+    def __neighbors(self, index: int) -> list[tuple[int, int]]:
+        """Get the cells next to a cell inside the maze, with the cost of the move."""
+        maze = self.__maze
+        rows, cols = maze.rows, maze.cols
+        row, col = divmod(index, cols)
+        if 0 < row < rows - 1 and 0 < col < cols - 1:
+            return [
+                (index + index_offset, cost)
+                for _, _, index_offset, cost in self.__moves
+            ]
+        return [
+            (index + index_offset, cost)
+            for row_offset, col_offset, index_offset, cost in self.__moves
+            if 0 <= row + row_offset < rows and 0 <= col + col_offset < cols
+        ]
+
+    def __path(self, start: int) -> list[Node]:
+        """Follow the cheapest neighbors from the start to the goal."""
+        g_score = self.__g_score
+        blocked = self.__blocked
+        total = g_score[start]
+        cells = [start]
+        current = start
+        while current != self.__goal:
+            current = min(
+                (
+                    (cost + g_score[neighbor], neighbor)
+                    for neighbor, cost in self.__neighbors(current)
+                    if not blocked[neighbor]
+                ),
+            )[1]
+            cells.append(current)
+        path = []
+        parent = None
+        for cell in cells:
+            position = self.__position(cell)
+            h = g_score[cell]
+            parent = Node(
+                name=position,
+                parent=parent,
+                compare_by="f_score",
+                position=position,
+                g_score=total - h,
+                f_score=total,
+                h_score=h,
+            )
+            path.append(parent)
+        return path
+
+    def __position(self, index: int) -> MatrixPosition:
+        """Get the position of a ``row * cols + col`` index."""
+        return MatrixPosition(*divmod(index, self.__maze.cols))
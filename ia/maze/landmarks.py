@@ -0,0 +1,226 @@
+"""Landmark euristic module.
+
+Contains the Landmarks class, which stores the cost from a few
+landmark cells to every cell of a maze and turns it into an A*
+euristic (ALT: A*, landmarks and the triangle inequality).
+"""
+
+from __future__ import annotations
+
+import hashlib
+from os import PathLike
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ia.maze.matrix import MatrixPosition
+from ia.maze.tile import MazeTile
+
+if TYPE_CHECKING:
+    from ia.maze.maze import Maze
+
+DEFAULT_LANDMARK_COUNT = 8
+"""Number of landmarks picked when none is given."""
+
+
+class Landmarks:
+    """Landmark euristic of a maze.
+
+    ``costs[k, row, col]`` is the cost of the cheapest path between the
+    ``k``-th landmark and the cell, with the 5/7 move costs, or ``-1`` if
+    there is none. By the triangle inequality,
+    ``|costs[k, cell] - costs[k, goal]|`` never exceeds the cost from the
+    cell to the goal, so the largest of these bounds is a consistent
+    euristic. Unlike the geometric euristics, it accounts for the walls
+    between the cell and the goal.
+
+    Examples
+    --------
+    >>> costs = np.array([[[0, 5, 10], [5, 7, -1]]], dtype=np.int32)
+    >>> landmarks = Landmarks([MatrixPosition(0, 0)], costs, fingerprint="")
+    >>> landmarks.to_array(MatrixPosition(0, 2))
+    array([[10,  5,  0],
+           [ 5,  3,  0]], dtype=int32)
+    """
+
+    def __init__(
+        self, positions: list[MatrixPosition], costs: np.ndarray, fingerprint: str
+    ):
+        """Initialize the landmarks.
+
+        Parameters
+        ----------
+            positions : (list[MatrixPosition])
+                The landmark cells.
+            costs : (np.ndarray)
+                The ``k x rows x cols`` array of costs from each landmark.
+            fingerprint : (str)
+                The fingerprint of the maze the landmarks were picked on,
+                see :func:`maze_fingerprint`.
+        """
+        if costs.ndim != 3 or len(costs) != len(positions):
+            raise ValueError("There must be a grid of costs per landmark.")
+        self.__positions = positions
+        self.__costs = costs
+        self.__costs.flags.writeable = False
+        self.__fingerprint = fingerprint
+
+    @classmethod
+    def from_maze(
+        cls,
+        maze: Maze,
+        count: int = DEFAULT_LANDMARK_COUNT,
+        tiles_to_ignore: list[MazeTile] | None = None,
+    ) -> Landmarks:
+        """Pick the landmarks of a maze.
+
+        Landmarks are picked by farthest-point selection: the first one is
+        the cell farthest from the first free cell of the maze and each
+        next one is the cell farthest from all the previous ones, with the
+        cells they cannot reach first. This spreads them over the dead
+        ends and corners of the maze, where the bounds are tightest. Each
+        landmark costs one :meth:`Maze.distance_field`.
+
+        Parameters
+        ----------
+            maze : (Maze)
+                The maze.
+            count : (int)
+                The number of landmarks. Fewer are picked if the maze does
+                not have that many free cells.
+            tiles_to_ignore : (list[MazeTile])
+                The tiles to ignore.
+
+        Returns
+        -------
+            (Landmarks)
+                The landmarks.
+        """
+        if tiles_to_ignore is None:
+            tiles_to_ignore = [MazeTile.WALL]
+        free = ~maze.mask(*tiles_to_ignore)
+        positions: list[MatrixPosition] = []
+        fields: list[np.ndarray] = []
+        free_cells = np.flatnonzero(free)
+        if len(free_cells):
+            # Before the first landmark, distances are taken from the seed.
+            seed = MatrixPosition(*divmod(int(free_cells[0]), maze.cols))
+            nearest = _far(maze.distance_field(seed, tiles_to_ignore).costs, free)
+            while len(positions) < count:
+                candidate = MatrixPosition(*divmod(int(np.argmax(nearest)), maze.cols))
+                if positions and nearest[candidate.row, candidate.col] == 0:
+                    break
+                costs = maze.distance_field(candidate, tiles_to_ignore).costs
+                far = _far(costs, free)
+                nearest = np.minimum(nearest, far) if positions else far
+                positions.append(candidate)
+                fields.append(costs)
+        return cls(
+            positions,
+            np.array(fields, dtype=np.int32).reshape(len(fields), maze.rows, maze.cols),
+            fingerprint=maze_fingerprint(maze, tiles_to_ignore),
+        )
+
+    @classmethod
+    def load(cls, path: str | PathLike) -> Landmarks:
+        """Load landmarks saved with :meth:`save`."""
+        with np.load(path) as data:
+            return cls(
+                [MatrixPosition(int(row), int(col)) for row, col in data["positions"]],
+                data["costs"],
+                fingerprint=str(data["fingerprint"]),
+            )
+
+    def save(self, path: str | PathLike) -> None:
+        """Save the landmarks as a compressed NumPy ``.npz`` file."""
+        with open(path, "wb") as file:
+            np.savez_compressed(
+                file,
+                positions=np.array(
+                    [(position.row, position.col) for position in self.__positions],
+                    dtype=np.int64,
+                ).reshape(-1, 2),
+                costs=self.__costs,
+                fingerprint=np.array(self.__fingerprint),
+            )
+
+    @property
+    def positions(self) -> list[MatrixPosition]:
+        """Get the landmark cells."""
+        return list(self.__positions)
+
+    @property
+    def costs(self) -> np.ndarray:
+        """Get the read-only array of costs from each landmark."""
+        return self.__costs
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Get the shape of the maze the landmarks were picked on."""
+        return self.__costs.shape[1:]
+
+    @property
+    def fingerprint(self) -> str:
+        """Get the fingerprint of the maze the landmarks were picked on."""
+        return self.__fingerprint
+
+    def matches(
+        self, maze: Maze, tiles_to_ignore: list[MazeTile] | None = None
+    ) -> bool:
+        """Check if the landmarks were picked on a maze with the same free cells."""
+        return self.__fingerprint == maze_fingerprint(maze, tiles_to_ignore)
+
+    def to_array(self, goal: MatrixPosition) -> np.ndarray:
+        """Get the euristic of every cell at once.
+
+        Landmarks that cannot reach both the cell and the goal are skipped.
+
+        Parameters
+        ----------
+            goal : (MatrixPosition)
+                The goal position.
+
+        Returns
+        -------
+            (np.ndarray)
+                The ``rows x cols`` table of euristic values.
+        """
+        costs = self.__costs
+        goal_costs = costs[:, goal.row, goal.col, None, None]
+        reachable = (costs >= 0) & (goal_costs >= 0)
+        bounds = np.where(reachable, np.abs(costs - goal_costs), 0)
+        return bounds.max(axis=0, initial=0).astype(np.int32)
+
+    def euristic(self, position: MatrixPosition, goal: MatrixPosition) -> int:
+        """Get the landmark bound between two cells, as an euristic function."""
+        cell_costs = self.__costs[:, position.row, position.col]
+        goal_costs = self.__costs[:, goal.row, goal.col]
+        reachable = (cell_costs >= 0) & (goal_costs >= 0)
+        return int(np.abs(cell_costs - goal_costs)[reachable].max(initial=0))
+
+    def __len__(self) -> int:
+        """Return the number of landmarks."""
+        return len(self.__positions)
+
+
+def maze_fingerprint(maze: Maze, tiles_to_ignore: list[MazeTile] | None = None) -> str:
+    """Get a digest of the shape and the free cells of a maze.
+
+    Two mazes with the same shape and the same cells blocked by the
+    ignored tiles have the same fingerprint, so moving the start or the
+    goal does not change it.
+    """
+    if tiles_to_ignore is None:
+        tiles_to_ignore = [MazeTile.WALL]
+    digest = hashlib.sha256()
+    digest.update(repr((maze.rows, maze.cols)).encode())
+    digest.update(maze.mask(*tiles_to_ignore).tobytes())
+    return digest.hexdigest()
+
+
+def _far(costs: np.ndarray, free: np.ndarray) -> np.ndarray:
+    """Get the costs with the unreachable free cells as far as possible."""
+    far = costs.astype(np.int64)
+    far[(costs < 0) & free] = np.iinfo(np.int64).max
+    far[~free] = -1
+    return far
@@ -2,12 +2,26 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable, Sequence
 from dataclasses import dataclass
 from typing import TypeVar
 
+import numpy as np
+
 from ia.maze.utils import number_to_representation
 
+NEIGHBOR_OFFSETS = [
+    (0, 1),
+    (1, 0),
+    (0, -1),
+    (-1, 0),
+    (1, 1),
+    (1, -1),
+    (-1, 1),
+    (-1, -1),
+]
+"""The offsets of the 4 cardinal directions and the 4 diagonals, in order."""
+
 
 @dataclass(frozen=True, repr=True, unsafe_hash=True)
 class MatrixPosition:
@@ -73,6 +87,8 @@ class MatrixPosition:
         """Check if two positions are equal."""
         if isinstance(value, tuple):
             value = MatrixPosition(*value)
+        if not isinstance(value, MatrixPosition):
+            return NotImplemented
         return self.row == value.row and self.col == value.col
 
     def __req__(self, value: object) -> bool:
@@ -112,14 +128,72 @@ class MatrixPosition:
         return f"({self.row}, {self.col})"
 
 
+def index_position(cols: int, index: int) -> MatrixPosition:
+    """Get the position of a ``row * cols + col`` index.
+
+    Examples
+    --------
+    >>> index_position(3, 7)
+    MatrixPosition(row=2, col=1)
+    """
+    return MatrixPosition(*divmod(index, cols))
+
+
 class Matrix:
-    """Matrix data structure."""
+    """Matrix data structure.
+
+    By default the cells are stored as a list of lists. When a
+    ``vocabulary`` of at most 256 values is given, they are stored as
+    indices into it in a ``uint8`` NumPy array instead, which takes one
+    byte per cell and allows scanning the whole matrix with vectorized
+    operations through :attr:`codes` and :meth:`mask`. Both backends
+    share the same item access and iteration API.
+
+    A coded matrix can also wrap an existing ``rows x cols`` array of
+    ``codes`` without copying it, such as one in shared memory.
+
+    Examples
+    --------
+    >>> matrix = Matrix(rows=2, cols=2, default="a", vocabulary=["a", "b"])
+    >>> matrix[0, 1] = "b"
+    >>> matrix[0, 1]
+    'b'
+    >>> matrix.mask("b")
+    array([[False,  True],
+           [False, False]])
+    """
 
-    def __init__(self, *, rows: int, cols: int, default: TContent) -> None:
+    def __init__(
+        self,
+        *,
+        rows: int,
+        cols: int,
+        default: TContent,
+        vocabulary: Sequence[TContent] | None = None,
+        codes: np.ndarray | None = None,
+    ) -> None:
         self.__rows = rows
         self.__cols = cols
         self.__default = default
-        self.__data = [[default for _ in range(cols)] for _ in range(rows)]
+        self.__version = 0
+        self.__listeners: list[
+            Callable[[MatrixPosition, TContent, TContent], None]
+        ] = []
+        if vocabulary is None:
+            self.__vocabulary = None
+            self.__data = [[default for _ in range(cols)] for _ in range(rows)]
+            return
+        if len(vocabulary) > 256:
+            raise ValueError("The vocabulary can have at most 256 values.")
+        self.__vocabulary = list(vocabulary)
+        self.__codes = {value: code for code, value in enumerate(self.__vocabulary)}
+        self.__lookup = np.empty(len(self.__vocabulary), dtype=object)
+        self.__lookup[:] = self.__vocabulary
+        if codes is None:
+            codes = np.full((rows, cols), self.__codes[default], dtype=np.uint8)
+        elif codes.shape != (rows, cols) or codes.dtype != np.uint8:
+            raise ValueError(f"The codes must be a {rows}x{cols} uint8 array.")
+        self.__data = codes
 
     @property
     def rows(self) -> int:
@@ -136,6 +210,84 @@ class Matrix:
         """Get the default value."""
         return self.__default
 
+    @property
+    def vocabulary(self) -> list[TContent] | None:
+        """Get the values a coded matrix can hold, or None for a list matrix."""
+        return self.__vocabulary
+
+    @property
+    def codes(self) -> np.ndarray:
+        """Get a read-only view of the cell codes of a coded matrix.
+
+        Raises
+        ------
+        TypeError
+            If the matrix has no vocabulary.
+        """
+        if self.__vocabulary is None:
+            raise TypeError("Only matrices with a vocabulary have codes.")
+        codes = self.__data.view()
+        codes.flags.writeable = False
+        return codes
+
+    @property
+    def version(self) -> int:
+        """Get a counter that increases every time a cell is set.
+
+        Derived data can be cached along with the version it was
+        computed at and rebuilt once the version changes.
+        """
+        return self.__version
+
+    def add_listener(
+        self, listener: Callable[[MatrixPosition, TContent, TContent], None]
+    ) -> None:
+        """Call a function every time a cell is set.
+
+        The listener is called after the cell is written with its position,
+        its previous value and its new value, so objects derived from the
+        matrix can update themselves instead of being rebuilt.
+
+        Parameters
+        ----------
+            listener : (Callable[[MatrixPosition, TContent, TContent], None])
+                The function to call.
+        """
+        self.__listeners.append(listener)
+
+    def remove_listener(
+        self, listener: Callable[[MatrixPosition, TContent, TContent], None]
+    ) -> None:
+        """Stop calling a function added with :meth:`add_listener`.
+
+        Raises
+        ------
+        ValueError
+            If the function is not a listener of the matrix.
+        """
+        self.__listeners.remove(listener)
+
+    def mask(self, *values: TContent) -> np.ndarray:
+        """Get a boolean array that is True on the cells holding any of the values.
+
+        Parameters
+        ----------
+            values : (TContent)
+                The values to look for.
+
+        Returns
+        -------
+            (np.ndarray)
+                A ``rows x cols`` boolean array.
+        """
+        if self.__vocabulary is None:
+            return np.array(
+                [[cell in values for cell in row] for row in self.__data],
+                dtype=bool,
+            ).reshape(self.__rows, self.__cols)
+        codes = [self.__codes[value] for value in values if value in self.__codes]
+        return np.isin(self.__data, codes)
+
     def neighbors(
         self, row: int, col: int, offsets: list[MatrixPosition] = None
     ) -> dict[MatrixPosition, MatrixPosition]:
@@ -158,16 +310,7 @@ class Matrix:
                 and the value is the position.
         """
         if offsets is None:
-            offsets = [
-                (0, 1),
-                (1, 0),
-                (0, -1),
-                (-1, 0),
-                (1, 1),
-                (1, -1),
-                (-1, 1),
-                (-1, -1),
-            ]
+            offsets = NEIGHBOR_OFFSETS
         adjacent: dict[MatrixPosition, MatrixPosition] = {}
         for row_offset, col_offset in offsets:
             new_row, new_col = row + row_offset, col + col_offset
@@ -221,33 +364,52 @@ class Matrix:
         """Get the value of the matrix."""
         if isinstance(key, tuple):
             key = MatrixPosition(*key)
-        return self.__data[key.row][key.col]
+        if self.__vocabulary is None:
+            return self.__data[key.row][key.col]
+        return self.__vocabulary[self.__data[key.row, key.col]]
 
     def __setitem__(self, key: MatrixPosition, value: TContent) -> None:
         """Set the value of the matrix."""
         if isinstance(key, tuple):
             key = MatrixPosition(*key)
-        self.__data[key.row][key.col] = value
+        previous = self[key] if self.__listeners else None
+        if self.__vocabulary is None:
+            self.__data[key.row][key.col] = value
+        else:
+            try:
+                code = self.__codes[value]
+            except KeyError:
+                raise ValueError(f"{value!r} is not in the vocabulary.") from None
+            self.__data[key.row, key.col] = code
+        self.__version += 1
+        for listener in list(self.__listeners):
+            listener(key, previous, value)
 
     def __contains__(self, item: TContent) -> bool:
         """Check if the matrix contains the item."""
-        return item in self.__data
+        if self.__vocabulary is None:
+            return item in self.__data
+        return item in self.__codes and bool((self.__data == self.__codes[item]).any())
 
     def __iter__(self) -> Iterable[TContent]:
         """Iterate over the matrix.
 
         Yields
         ------
-            (tuple[MatrixPosition, TContent])
-                The position and the value of the matrix tile.
+            (list[TContent])
+                The values of each row of the matrix.
         """
-        yield from self.__data
+        if self.__vocabulary is None:
+            yield from self.__data
+            return
+        for row in self.__data:
+            yield self.__lookup[row].tolist()
 
     def __str__(self) -> str:
         """Return the matrix as a string."""
         horizontal_border = "+" + "-" * (self.__cols * 3 + (self.__cols - 1)) + "+"
         rows_str = "\n".join(
-            "| " + " ".join(f"{item:2}" for item in row) + " |" for row in self.__data
+            "| " + " ".join(f"{item:2}" for item in row) + " |" for row in self
         )
         return f"{horizontal_border}\n{rows_str}\n{horizontal_border}"
 
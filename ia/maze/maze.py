@@ -1,22 +1,73 @@
 """Maze data structure."""
 
 import heapq
-from collections.abc import Callable
-from typing import TypeVar
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from functools import partial
+from itertools import pairwise
+from typing import Any, TypeVar
 
-from ia.algorithm import AlgorithmHistory, TraversalResult
+import numpy as np
+
+from ia import bounded, parallel
+from ia.algorithm import AlgorithmHistory, HistoryPolicy, TraversalResult
+from ia.disjoint_set import DisjointSet
+from ia.frontier import Frontier
 from ia.maze import euristics
 from ia.maze.constants import (
     DEFAULT_MAZE_MAPPINGS,
     MAZE_PRINT_STYLES,
 )
-from ia.maze.matrix import Matrix, MatrixPosition
+from ia.maze.field import DistanceField
+from ia.maze.hierarchy import DEFAULT_CLUSTER_SIZE, Hierarchy
+from ia.maze.incremental import IncrementalPlanner
+from ia.maze.landmarks import DEFAULT_LANDMARK_COUNT, Landmarks
+from ia.maze.matrix import NEIGHBOR_OFFSETS, Matrix, MatrixPosition, index_position
 from ia.maze.tile import MazeTile
+from ia.tree.lazy import LazyTree
 from ia.tree.node import Node
 
+ANYTIME_EPSILON_STEP = 0.5
+"""How much the weight of anytime A* drops after each path when only one is given."""
+
+
+def anytime_schedule(
+    epsilon: float | Sequence[float], time_budget: float | None = None
+) -> list[float]:
+    """Get the weights of the euristic used by :meth:`Maze.a_star`.
+
+    Examples
+    --------
+    >>> anytime_schedule(2.0)
+    [2.0]
+    >>> anytime_schedule(2.0, time_budget=1.0)
+    [2.0, 1.5, 1.0]
+
+    Raises
+    ------
+    ValueError
+        If a weight is lower than 1 or the weights increase.
+    """
+    if isinstance(epsilon, Sequence):
+        schedule = [float(weight) for weight in epsilon]
+    elif time_budget is None:
+        schedule = [float(epsilon)]
+    else:
+        schedule = [float(epsilon)]
+        while schedule[-1] > 1:
+            schedule.append(max(1.0, schedule[-1] - ANYTIME_EPSILON_STEP))
+    if not schedule or min(schedule) < 1:
+        raise ValueError(f"The weights of the euristic must be at least 1: {epsilon}")
+    if any(later > earlier for earlier, later in pairwise(schedule)):
+        raise ValueError(f"The weights of the euristic cannot increase: {epsilon}")
+    return schedule
+
 
 class Maze(Matrix):
-    """Maze data structure."""
+    """Maze data structure.
+
+    Tiles are stored as one byte per cell, see :class:`Matrix`.
+    """
 
     def __init__(
         self,
@@ -25,10 +76,19 @@ class Maze(Matrix):
         cols: int,
         start: MatrixPosition = None,
         goal: MatrixPosition = None,
+        codes: np.ndarray | None = None,
     ) -> None:
-        super().__init__(rows=rows, cols=cols, default=MazeTile.WALL)
+        super().__init__(
+            rows=rows,
+            cols=cols,
+            default=MazeTile.WALL,
+            vocabulary=list(MazeTile),
+            codes=codes,
+        )
         self.__start = start
         self.__goal = goal
+        self.__cache: dict[tuple, Any] = {}
+        self.__cache_version = 0
 
     @property
     def start(self) -> MatrixPosition:
@@ -56,6 +116,107 @@ class Maze(Matrix):
             self[value] = MazeTile.GOAL
         self.__goal = value
 
+    @property
+    def passable(self) -> np.ndarray:
+        """Get a read-only boolean array that is True on the tiles that are not walls.
+
+        The array is cached until a tile of the maze changes.
+        """
+
+        def build() -> np.ndarray:
+            passable = ~self.mask(MazeTile.WALL)
+            passable.flags.writeable = False
+            return passable
+
+        return self.__cached(("passable",), build)
+
+    def components(self, tiles_to_ignore: list[MazeTile] | None = None) -> np.ndarray:
+        """Label the regions of tiles connected by any of the 8 moves.
+
+        Free cells are grouped in horizontal runs, which are merged with
+        the runs of the previous row they touch using a disjoint set, so
+        the cost grows with the number of runs rather than of cells. The
+        labels are cached until a tile of the maze changes.
+
+        Parameters
+        ----------
+            tiles_to_ignore : (list[MazeTile])
+                The tiles to ignore.
+
+        Returns
+        -------
+            (np.ndarray)
+                A read-only ``rows x cols`` array with the label of the
+                region of every cell, counting from 0, or -1 on the
+                ignored tiles.
+        """
+        if tiles_to_ignore is None:
+            tiles_to_ignore = [MazeTile.WALL]
+        return self.__cached(
+            ("components", frozenset(tiles_to_ignore)),
+            lambda: self.__label_components(tiles_to_ignore),
+        )
+
+    def connected(
+        self,
+        start: MatrixPosition | None = None,
+        goal: MatrixPosition | None = None,
+        tiles_to_ignore: list[MazeTile] | None = None,
+    ) -> bool:
+        """Check if the goal can be reached from the start.
+
+        Takes O(1) once :meth:`components` is computed.
+        """
+        if start is None:
+            start = self.start
+        if goal is None:
+            goal = self.goal
+        labels = self.components(tiles_to_ignore)
+        label = labels[start.row, start.col]
+        return bool(label >= 0 and label == labels[goal.row, goal.col])
+
+    def __label_components(self, tiles_to_ignore: list[MazeTile]) -> np.ndarray:
+        """Label the connected regions of the tiles that are not ignored."""
+        free = ~self.mask(*tiles_to_ignore)
+        rows, cols = free.shape
+        width = cols + 2
+        padded = np.zeros((rows, width), dtype=np.int8)
+        padded[:, 1:-1] = free
+        changes = np.diff(padded, axis=1)
+        # Runs of free cells, in row-major order, as [start, end) columns.
+        run_rows, starts = np.nonzero(changes == 1)
+        _, ends = np.nonzero(changes == -1)
+        # A run touches the runs of the previous row that start before its
+        # end and end after its start, which are contiguous in row-major
+        # order, so they are found by searching on row * width + column.
+        previous_row = (run_rows - 1) * width
+        first = np.searchsorted(run_rows * width + ends, previous_row + starts)
+        last = np.searchsorted(run_rows * width + starts, previous_row + ends, "right")
+        counts = np.maximum(last - first, 0)
+        runs = np.repeat(np.arange(len(starts)), counts)
+        touching = np.repeat(first, counts) + (
+            np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        )
+        sets = DisjointSet(len(starts))
+        for run, other in zip(runs.tolist(), touching.tolist(), strict=True):
+            sets.union(run, other)
+        labels = np.full(rows * cols, -1, dtype=np.int32)
+        labels[np.flatnonzero(free)] = np.repeat(
+            np.array(sets.labels(), dtype=np.int32), ends - starts
+        )
+        labels = labels.reshape(rows, cols)
+        labels.flags.writeable = False
+        return labels
+
+    def __cached(self, key: tuple, build: Callable[[], Any]) -> Any:
+        """Get a value derived from the tiles, building it if the maze changed."""
+        if self.__cache_version != self.version:
+            self.__cache.clear()
+            self.__cache_version = self.version
+        if key not in self.__cache:
+            self.__cache[key] = build()
+        return self.__cache[key]
+
     def print(self, path: list[MatrixPosition] = None, style: str = "detailed") -> str:
         """Print the maze as a string with an optional path and style.
 
@@ -139,114 +300,1361 @@ class Maze(Matrix):
         self,
         start: MatrixPosition | None = None,
         goal: MatrixPosition | None = None,
-        euristic_func: Callable[[MatrixPosition, MatrixPosition], int] | None = None,
+        euristic_func: Callable[[MatrixPosition, MatrixPosition], int]
+        | euristics.Euristic
+        | Landmarks
+        | None = None,
         g_score_func: Callable[[MatrixPosition, MatrixPosition], int] | None = None,
         tiles_to_ignore: list[MazeTile] | None = None,
+        history_policy: HistoryPolicy | None = None,
+        consistent: bool = False,
+        frontier: Frontier = Frontier.HEAP,
+        epsilon: float | Sequence[float] = 1.0,
+        time_budget: float | None = None,
     ) -> TraversalResult:
         """Find the shortest path between the start and goal positions using the A* algorithm.
 
+        Cells are handled as flat ``row * cols + col`` indices, with
+        list-backed scores and ``(f_score, node)`` pairs in the frontier, so
+        positions and nodes are only built for the history and the final
+        path. Ties on the f score are expanded in the order they were
+        generated.
+
+        Unreachable goals are detected with :meth:`components` before
+        searching.
+
+        Every cell is expanded once per improvement of its cost: heap
+        entries left behind by a cheaper path are skipped and expanded
+        cells are closed. A closed cell is reopened if a cheaper path to
+        it is found, which only happens with inconsistent euristics.
+
         Parameters
         ----------
             start : (MatrixPosition)
                 The start position.
             goal : (MatrixPosition)
                 The goal position.
-            euristic_func : (Callable[[MatrixPosition, MatrixPosition], int])
-                The euristic function to use.
+            euristic_func : (Callable[[MatrixPosition, MatrixPosition], int] | Euristic | Landmarks)
+                The euristic function to use. A built-in :class:`Euristic` is
+                read from its whole-grid table, see :meth:`Euristic.to_array`,
+                instead of being called for every generated cell. So are
+                :class:`Landmarks`, and :attr:`Euristic.LANDMARKS` uses the
+                ones of :meth:`landmarks`. Defaults to the Manhattan distance.
             g_score_func : (Callable[[MatrixPosition, MatrixPosition], int])
-                The g score function to use.
+                The g score function to use. Defaults to 5 for orthogonal
+                moves and 7 for diagonal ones, as in
+                :func:`euristics.greater_diagonal_g_score`.
             tiles_to_ignore : (list[MazeTile])
                 The tiles to ignore.
+            history_policy : (HistoryPolicy)
+                Which steps of the search to record in the history.
+            consistent : (bool)
+                Whether the euristic is consistent with the g score function,
+                that is, it never decreases by more than the cost of a move.
+                If so, closed cells are skipped without computing their cost.
+            frontier : (Frontier)
+                The priority queue of the open cells. With integer scores, as
+                with the built-in euristics, a bucket queue or a radix heap
+                avoid the logarithmic cost of the binary heap. A radix heap
+                also needs a consistent euristic. All of them return the same
+                result. Uniform-cost search is A* with an euristic of 0.
+            epsilon : (float | Sequence[float])
+                The weight of the euristic. Above 1, cells are ordered by
+                ``g + epsilon * h`` (weighted A*), which expands fewer cells
+                and returns a path at most ``epsilon`` times the optimal cost
+                if the euristic is admissible. A non-increasing sequence of
+                weights runs anytime repairing A* (ARA*): a path is found
+                with each weight in turn, reusing the costs of the previous
+                searches, and the best one is returned.
+            time_budget : (float)
+                Seconds after which ARA* returns the best path found so far.
+                The first path is always completed. With a single
+                ``epsilon``, the weights go from it down to 1 in steps of
+                :data:`ANYTIME_EPSILON_STEP`.
+
+        Returns
+        -------
+            (TraversalResult)
+                The path from the start to the goal, with its proven
+                suboptimality bound as ``bound``.
+                If no path is found, None is returned.
+
+        Raises
+        ------
+        ValueError
+            If a weight is lower than 1, the weights increase, or they are
+            used with another frontier than the binary heap.
+
+        Examples
+        --------
+        >>> maze = Maze(rows=1, cols=3)
+        >>> for col in range(3):
+        ...     maze[0, col] = MazeTile.EMPTY
+        >>> start, goal = MatrixPosition(0, 0), MatrixPosition(0, 2)
+        >>> unit_cost = lambda cell, neighbor: 1
+        >>> maze.a_star(start, goal, g_score_func=unit_cost).cost
+        2
+        >>> maze.a_star(start, goal, g_score_func=unit_cost, epsilon=[2, 1]).cost
+        2
+        >>> result = maze.a_star(start, start, epsilon=[2, 1])
+        >>> result.cost, result.bound
+        (0, 1.0)
+        """  # noqa: E501
+        if start is None:
+            start = self.start
+        if goal is None:
+            goal = self.goal
+        if euristic_func is None:
+            euristic_func = euristics.Euristic.MANHATTAN
+        if tiles_to_ignore is None:
+            tiles_to_ignore = [MazeTile.WALL]
+        schedule = anytime_schedule(epsilon, time_budget)
+        if schedule != [1] and frontier != Frontier.HEAP:
+            raise ValueError("Weighted searches need the binary heap frontier.")
+        if len(schedule) > 1:
+            deadline = None
+            if time_budget is not None:
+                deadline = time.perf_counter() + time_budget
+            return self.__anytime_a_star(
+                start,
+                goal,
+                euristic_func,
+                g_score_func,
+                tiles_to_ignore,
+                history_policy,
+                schedule,
+                deadline,
+            )
+        weight = schedule[0]
+
+        rows, cols = self.rows, self.cols
+        blocked = self.mask(*tiles_to_ignore).tobytes()
+        moves = [
+            (
+                row_offset,
+                col_offset,
+                row_offset * cols + col_offset,
+                5 if row_offset == 0 or col_offset == 0 else 7,
+            )
+            for row_offset, col_offset in NEIGHBOR_OFFSETS
+        ]
+        start_index = start.row * cols + start.col
+        goal_index = goal.row * cols + goal.col
+
+        position = partial(index_position, cols)
+
+        # Best known cost and heuristic of every cell, indexed by
+        # row * cols + col. Each heap entry is a node of the search tree,
+        # so the path of every step stays the one it was generated with.
+        g_score = [None] * len(self)
+        h_score = self.__h_scores(euristic_func, start, goal, tiles_to_ignore)
+        g_score[start_index] = 0
+        tree = LazyTree(start_index)
+        tree_g_score = [0]
+        closed = bytearray(len(self))
+        open_set = frontier.to_queue()
+        push, pop = open_set.push, open_set.pop
+        push(h_score[start_index], 0)
+
+        history = AlgorithmHistory(
+            resolve_path=partial(_branch_positions, tree, cols),
+            resolve_node=position,
+            policy=history_policy,
+        )
+        history.add_step(generated=[start_index])
+        if not self.connected(start, goal, tiles_to_ignore):
+            return TraversalResult(history, path=None, cost=None)
+
+        while open_set:
+            _, current_node = pop()
+            current = tree.ids[current_node]
+            if tree_g_score[current_node] > g_score[current]:
+                continue
+
+            if current == goal_index:
+                history.add_step(inspected=[current], path=current_node)
+                return TraversalResult(
+                    history,
+                    path=self.__node_path(tree, tree_g_score, h_score, current_node),
+                    cost=g_score[current],
+                    bound=weight,
+                )
+
+            closed[current] = 1
+            generated: list[int] = []
+            row, col = divmod(current, cols)
+            current_g_score = g_score[current]
+            for row_offset, col_offset, index_offset, cost in moves:
+                neighbor_row = row + row_offset
+                neighbor_col = col + col_offset
+                if not (0 <= neighbor_row < rows and 0 <= neighbor_col < cols):
+                    continue
+                neighbor = current + index_offset
+                if blocked[neighbor] or (consistent and closed[neighbor]):
+                    continue
+                if g_score_func is not None:
+                    cost = g_score_func(
+                        MatrixPosition(row, col),
+                        MatrixPosition(neighbor_row, neighbor_col),
+                    )
+                tentative_g_score = current_g_score + cost
+                neighbor_g_score = g_score[neighbor]
+                if neighbor_g_score is None or tentative_g_score < neighbor_g_score:
+                    g_score[neighbor] = tentative_g_score
+                    closed[neighbor] = 0
+                    h = h_score[neighbor]
+                    if h is None:
+                        h = h_score[neighbor] = euristic_func(
+                            MatrixPosition(neighbor_row, neighbor_col), goal
+                        )
+                    if weight != 1:
+                        h *= weight
+                    push(tentative_g_score + h, tree.add(neighbor, current_node))
+                    tree_g_score.append(tentative_g_score)
+                    generated.append(neighbor)
+            history.add_step(
+                generated=generated, inspected=[current], path=current_node
+            )
+
+        return TraversalResult(history, path=None, cost=None)
+
+    def a_star_many(
+        self,
+        queries: Iterable[tuple[MatrixPosition, MatrixPosition]],
+        *,
+        workers: int | None = None,
+        chunk_size: int = parallel.DEFAULT_CHUNK_SIZE,
+        **options: Any,
+    ) -> Iterator[tuple[int, TraversalResult]]:
+        """Run :meth:`a_star` for many start and goal pairs in parallel.
+
+        The tiles are copied once to shared memory and every worker process
+        searches a read-only maze wrapped around them, see
+        :func:`parallel.fan_out`. Results are yielded as soon as their chunk
+        of queries finishes, so they may come out of order.
+
+        Parameters
+        ----------
+            queries : (Iterable[tuple[MatrixPosition, MatrixPosition]])
+                The start and goal of every search.
+            workers : (int)
+                The number of worker processes. Defaults to the number of
+                CPUs. With a single worker the searches run in this process.
+            chunk_size : (int)
+                The number of queries sent to a worker at a time.
+            options : (Any)
+                Keyword arguments of :meth:`a_star`. The euristic and the
+                g score function must be picklable, such as the built-in
+                ones. :attr:`Euristic.LANDMARKS` is resolved here, so the
+                landmarks are only picked once.
+
+        Returns
+        -------
+            (Iterator[tuple[int, TraversalResult]])
+                The index of every query and its result.
+
+        Examples
+        --------
+        >>> maze = Maze(rows=1, cols=3)
+        >>> for col in range(3):
+        ...     maze[0, col] = MazeTile.EMPTY
+        >>> start = MatrixPosition(0, 0)
+        >>> queries = [(start, MatrixPosition(0, col)) for col in range(3)]
+        >>> results = dict(maze.a_star_many(queries, workers=2, chunk_size=1))
+        >>> [results[index].cost for index in range(3)]
+        [0, 5, 10]
+        >>> [maze.a_star(*query).cost for query in queries]
+        [0, 5, 10]
+        """
+        if options.get("euristic_func") == euristics.Euristic.LANDMARKS:
+            options["euristic_func"] = self.landmarks(
+                tiles_to_ignore=options.get("tiles_to_ignore")
+            )
+        return parallel.fan_out(
+            queries,
+            _a_star_query,
+            local=self,
+            arrays={"codes": self.codes},
+            build=_shared_maze,
+            metadata=(self.rows, self.cols, self.start, self.goal),
+            options=options,
+            workers=workers,
+            chunk_size=chunk_size,
+        )
+
+    def __anytime_a_star(
+        self,
+        start: MatrixPosition,
+        goal: MatrixPosition,
+        euristic_func: Callable[[MatrixPosition, MatrixPosition], int]
+        | euristics.Euristic
+        | Landmarks,
+        g_score_func: Callable[[MatrixPosition, MatrixPosition], int] | None,
+        tiles_to_ignore: list[MazeTile],
+        history_policy: HistoryPolicy | None,
+        schedule: list[float],
+        deadline: float | None,
+    ) -> TraversalResult:
+        """Run anytime repairing A* (ARA*) with a schedule of weights.
+
+        Each weight runs a weighted A* that does not reopen closed cells:
+        the ones that get cheaper are kept aside as inconsistent and only
+        queued again for the next weight, so every search reuses the costs
+        of the previous ones. After each path, its suboptimality bound is
+        the cost divided by the lowest unweighted f score left in the
+        queue or aside, which is a lower bound of the optimal cost.
+        """
+        rows, cols = self.rows, self.cols
+        blocked = self.mask(*tiles_to_ignore).tobytes()
+        moves = [
+            (
+                row_offset,
+                col_offset,
+                row_offset * cols + col_offset,
+                5 if row_offset == 0 or col_offset == 0 else 7,
+            )
+            for row_offset, col_offset in NEIGHBOR_OFFSETS
+        ]
+        start_index = start.row * cols + start.col
+        goal_index = goal.row * cols + goal.col
+
+        position = partial(index_position, cols)
+
+        # As in a_star, but the node of the best path found to every cell
+        # is also kept, to requeue the cell when the weight changes.
+        g_score = [None] * len(self)
+        h_score = self.__h_scores(euristic_func, start, goal, tiles_to_ignore)
+        g_score[start_index] = 0
+        tree = LazyTree(start_index)
+        tree_g_score = [0]
+        best_node = {start_index: 0}
+        closed = bytearray(len(self))
+        inconsistent: set[int] = set()
+        open_set: list[tuple[float, int, int]] = [
+            (schedule[0] * h_score[start_index], 0, 0)
+        ]
+        counter = 1
+
+        history = AlgorithmHistory(
+            resolve_path=partial(_branch_positions, tree, cols),
+            resolve_node=position,
+            policy=history_policy,
+        )
+        history.add_step(generated=[start_index])
+        result = TraversalResult(history, path=None, cost=None)
+        if not self.connected(start, goal, tiles_to_ignore):
+            return result
+
+        for iteration, weight in enumerate(schedule):
+            if iteration:
+                # Requeue the open and inconsistent cells with the new weight.
+                cells = {
+                    tree.ids[node]
+                    for _, _, node in open_set
+                    if tree_g_score[node] == g_score[tree.ids[node]]
+                }
+                cells.update(inconsistent)
+                inconsistent = set()
+                closed = bytearray(len(self))
+                open_set = []
+                for cell in cells:
+                    open_set.append(
+                        (
+                            g_score[cell] + weight * h_score[cell],
+                            counter,
+                            best_node[cell],
+                        )
+                    )
+                    counter += 1
+                heapq.heapify(open_set)
+            while open_set:
+                current_f_score, _, current_node = open_set[0]
+                current = tree.ids[current_node]
+                if tree_g_score[current_node] > g_score[current] or closed[current]:
+                    heapq.heappop(open_set)
+                    continue
+                goal_g_score = g_score[goal_index]
+                if goal_g_score is not None and goal_g_score <= current_f_score:
+                    break
+                if (
+                    result.path is not None
+                    and deadline is not None
+                    and time.perf_counter() > deadline
+                ):
+                    return result
+                heapq.heappop(open_set)
+                closed[current] = 1
+                generated: list[int] = []
+                row, col = divmod(current, cols)
+                current_g_score = g_score[current]
+                for row_offset, col_offset, index_offset, cost in moves:
+                    neighbor_row = row + row_offset
+                    neighbor_col = col + col_offset
+                    if not (0 <= neighbor_row < rows and 0 <= neighbor_col < cols):
+                        continue
+                    neighbor = current + index_offset
+                    if blocked[neighbor]:
+                        continue
+                    if g_score_func is not None:
+                        cost = g_score_func(
+                            MatrixPosition(row, col),
+                            MatrixPosition(neighbor_row, neighbor_col),
+                        )
+                    tentative_g_score = current_g_score + cost
+                    neighbor_g_score = g_score[neighbor]
+                    if neighbor_g_score is None or tentative_g_score < neighbor_g_score:
+                        g_score[neighbor] = tentative_g_score
+                        h = h_score[neighbor]
+                        if h is None:
+                            h = h_score[neighbor] = euristic_func(
+                                MatrixPosition(neighbor_row, neighbor_col), goal
+                            )
+                        node = best_node[neighbor] = tree.add(neighbor, current_node)
+                        tree_g_score.append(tentative_g_score)
+                        generated.append(neighbor)
+                        if closed[neighbor]:
+                            inconsistent.add(neighbor)
+                        else:
+                            heapq.heappush(
+                                open_set,
+                                (tentative_g_score + weight * h, counter, node),
+                            )
+                            counter += 1
+                history.add_step(
+                    generated=generated, inspected=[current], path=current_node
+                )
+
+            goal_g_score = g_score[goal_index]
+            if goal_g_score is None:
+                return result
+            if result.path is None or goal_g_score < result.cost:
+                goal_node = best_node[goal_index]
+                history.add_step(inspected=[goal_index], path=goal_node)
+                result = TraversalResult(
+                    history,
+                    path=self.__node_path(tree, tree_g_score, h_score, goal_node),
+                    cost=goal_g_score,
+                )
+            lower_bound = min(
+                (
+                    g_score[tree.ids[node]] + h_score[tree.ids[node]]
+                    for _, _, node in open_set
+                    if tree_g_score[node] == g_score[tree.ids[node]]
+                    and not closed[tree.ids[node]]
+                ),
+                default=result.cost,
+            )
+            lower_bound = min(
+                [lower_bound] + [g_score[cell] + h_score[cell] for cell in inconsistent]
+            )
+            if lower_bound == 0:
+                # Only a path of cost 0, from the goal to itself, is proven
+                # optimal without a positive lower bound.
+                result.bound = 1.0 if result.cost == 0 else weight
+            else:
+                result.bound = max(1.0, min(weight, result.cost / lower_bound))
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+        return result
+
+    def ida_star(
+        self,
+        start: MatrixPosition | None = None,
+        goal: MatrixPosition | None = None,
+        euristic_func: Callable[[MatrixPosition, MatrixPosition], int]
+        | euristics.Euristic
+        | Landmarks
+        | None = None,
+        tiles_to_ignore: list[MazeTile] | None = None,
+        history_policy: HistoryPolicy | None = None,
+        node_budget: int = bounded.DEFAULT_NODE_BUDGET,
+    ) -> TraversalResult:
+        """Find the shortest path with iterative-deepening A* (IDA*).
+
+        Keeps the current branch and a transposition table of at most
+        ``node_budget`` cells instead of the scores of every cell, see
+        :func:`ia.bounded.ida_star`. Every threshold searches again from
+        the start, so it trades time for memory, and the generated and
+        inspected counts add up across thresholds.
+
+        Parameters
+        ----------
+            start : (MatrixPosition)
+                The start position.
+            goal : (MatrixPosition)
+                The goal position.
+            euristic_func : (Callable[[MatrixPosition, MatrixPosition], int] | Euristic | Landmarks)
+                The euristic function to use, as in :meth:`a_star`.
+                Defaults to the Manhattan distance.
+            tiles_to_ignore : (list[MazeTile])
+                The tiles to ignore.
+            history_policy : (HistoryPolicy)
+                Which steps of the search to record in the history.
+            node_budget : (int)
+                The largest number of cells in the transposition table.
+
+        Returns
+        -------
+            (TraversalResult)
+                The path from the start to the goal.
+                If no path is found, None is returned.
+        """  # noqa: E501
+        return self.__bounded_search(
+            bounded.ida_star,
+            start,
+            goal,
+            euristic_func,
+            tiles_to_ignore,
+            history_policy,
+            node_budget,
+        )
+
+    def sma_star(
+        self,
+        start: MatrixPosition | None = None,
+        goal: MatrixPosition | None = None,
+        euristic_func: Callable[[MatrixPosition, MatrixPosition], int]
+        | euristics.Euristic
+        | Landmarks
+        | None = None,
+        tiles_to_ignore: list[MazeTile] | None = None,
+        history_policy: HistoryPolicy | None = None,
+        node_budget: int = bounded.DEFAULT_NODE_BUDGET,
+    ) -> TraversalResult:
+        """Find the shortest path with simplified memory-bounded A* (SMA*).
+
+        Keeps a search tree of at most ``node_budget`` nodes, forgetting
+        the least promising leaves when it is full, see
+        :func:`ia.bounded.sma_star`. The path is optimal if it has fewer
+        cells than the budget. Budgets much smaller than the maze can make
+        the search give up without a path.
+
+        Parameters
+        ----------
+            start : (MatrixPosition)
+                The start position.
+            goal : (MatrixPosition)
+                The goal position.
+            euristic_func : (Callable[[MatrixPosition, MatrixPosition], int] | Euristic | Landmarks)
+                The euristic function to use, as in :meth:`a_star`.
+                Defaults to the Manhattan distance.
+            tiles_to_ignore : (list[MazeTile])
+                The tiles to ignore.
+            history_policy : (HistoryPolicy)
+                Which steps of the search to record in the history.
+            node_budget : (int)
+                The largest number of nodes in memory, at least 2.
 
         Returns
         -------
             (TraversalResult)
                 The path from the start to the goal.
                 If no path is found, None is returned.
+
+        Examples
+        --------
+        >>> import random
+        >>> rng = random.Random(0)
+        >>> maze = Maze(rows=23, cols=8)
+        >>> for row in range(23):
+        ...     for col in range(8):
+        ...         tile = MazeTile.WALL if rng.random() < 0.3 else MazeTile.EMPTY
+        ...         maze[row, col] = tile
+        >>> start, goal = MatrixPosition(0, 0), MatrixPosition(22, 7)
+        >>> maze[start] = maze[goal] = MazeTile.EMPTY
+        >>> maze.sma_star(start, goal, node_budget=23 * 8).cost
+        124
+        >>> maze.sma_star(start, goal, node_budget=23 * 8 // 3).path is None
+        True
         """  # noqa: E501
+        return self.__bounded_search(
+            bounded.sma_star,
+            start,
+            goal,
+            euristic_func,
+            tiles_to_ignore,
+            history_policy,
+            node_budget,
+        )
+
+    def __bounded_search(
+        self,
+        engine: Callable[..., bounded.SearchNode | None],
+        start: MatrixPosition | None,
+        goal: MatrixPosition | None,
+        euristic_func: Callable[[MatrixPosition, MatrixPosition], int]
+        | euristics.Euristic
+        | Landmarks
+        | None,
+        tiles_to_ignore: list[MazeTile] | None,
+        history_policy: HistoryPolicy | None,
+        node_budget: int,
+    ) -> TraversalResult:
+        """Run a memory-bounded search over the ``row * cols + col`` cell indices."""
         if start is None:
             start = self.start
         if goal is None:
             goal = self.goal
         if euristic_func is None:
-            euristic_func = euristics.manhattan_distance
-        if g_score_func is None:
-            g_score_func = euristics.greater_diagonal_g_score
+            euristic_func = euristics.Euristic.MANHATTAN
         if tiles_to_ignore is None:
             tiles_to_ignore = [MazeTile.WALL]
 
-        open_set = []
-        heapq.heappush(
-            open_set,
-            Node(
-                name=start,
-                parent=None,
-                position=start,
-                compare_by="f_score",
-                g_score=0,
-                f_score=euristic_func(start, goal),
-                h_score=euristic_func(start, goal),
+        rows, cols = self.rows, self.cols
+        blocked = self.mask(*tiles_to_ignore).tobytes()
+        moves = [
+            (
+                row_offset,
+                col_offset,
+                row_offset * cols + col_offset,
+                5 if row_offset == 0 or col_offset == 0 else 7,
+            )
+            for row_offset, col_offset in NEIGHBOR_OFFSETS
+        ]
+        start_index = start.row * cols + start.col
+        goal_index = goal.row * cols + goal.col
+        h_score = self.__h_scores(euristic_func, start, goal, tiles_to_ignore)
+
+        position = partial(index_position, cols)
+
+        def successors(index: int) -> list[tuple[int, int]]:
+            row, col = divmod(index, cols)
+            return [
+                (index + index_offset, cost)
+                for row_offset, col_offset, index_offset, cost in moves
+                if 0 <= row + row_offset < rows
+                and 0 <= col + col_offset < cols
+                and not blocked[index + index_offset]
+            ]
+
+        def heuristic(index: int) -> int:
+            h = h_score[index]
+            if h is None:
+                h = h_score[index] = euristic_func(position(index), goal)
+            return h
+
+        history = AlgorithmHistory(
+            resolve_path=lambda tip: [
+                position(index) for index, _ in bounded.branch(tip)
+            ],
+            resolve_node=position,
+            policy=history_policy,
+        )
+        history.add_step(generated=[start_index])
+        if not self.connected(start, goal, tiles_to_ignore):
+            return TraversalResult(history, path=None, cost=None)
+        node = engine(
+            start_index, goal_index, successors, heuristic, history, node_budget
+        )
+        if node is None:
+            return TraversalResult(history, path=None, cost=None)
+        cells = bounded.branch(node)
+        return TraversalResult(
+            history,
+            path=self.__nodes(
+                [position(index) for index, _ in cells],
+                [g for _, g in cells],
+                [heuristic(index) for index, _ in cells],
             ),
+            cost=node.g,
+        )
+
+    def distance_field(
+        self,
+        goal: MatrixPosition | None = None,
+        tiles_to_ignore: list[MazeTile] | None = None,
+    ) -> DistanceField:
+        """Compute the exact cost from every cell to the goal.
+
+        Runs a single uniform-cost search backwards from the goal, which
+        with the symmetric 5/7 move costs gives the cost to the goal of
+        every cell. The field is cached until a tile of the maze changes.
+
+        Parameters
+        ----------
+            goal : (MatrixPosition)
+                The goal position.
+            tiles_to_ignore : (list[MazeTile])
+                The tiles to ignore.
+
+        Returns
+        -------
+            (DistanceField)
+                The distance field.
+        """
+        if goal is None:
+            goal = self.goal
+        if tiles_to_ignore is None:
+            tiles_to_ignore = [MazeTile.WALL]
+        return self.__cached(
+            ("distance_field", goal, frozenset(tiles_to_ignore)),
+            lambda: self.__build_distance_field(goal, tiles_to_ignore),
         )
-        came_from = {}
-        g_score = {start: 0}
-        f_score = {start: euristic_func(start, goal)}
 
-        generated: list[MatrixPosition] = [start]
-        inspected: list[MatrixPosition] = []
+    def landmarks(
+        self,
+        count: int = DEFAULT_LANDMARK_COUNT,
+        tiles_to_ignore: list[MazeTile] | None = None,
+    ) -> Landmarks:
+        """Pick landmarks for the ALT euristic.
 
-        history = AlgorithmHistory()
-        history.add_step(inspected=inspected, generated=generated, path=[])
+        See :meth:`Landmarks.from_maze`. The landmarks are cached until a
+        tile of the maze changes, and are used by the searches when given
+        :attr:`Euristic.LANDMARKS`.
 
+        Parameters
+        ----------
+            count : (int)
+                The number of landmarks.
+            tiles_to_ignore : (list[MazeTile])
+                The tiles to ignore.
+
+        Returns
+        -------
+            (Landmarks)
+                The landmarks.
+        """
+        if tiles_to_ignore is None:
+            tiles_to_ignore = [MazeTile.WALL]
+        return self.__cached(
+            ("landmarks", count, frozenset(tiles_to_ignore)),
+            lambda: Landmarks.from_maze(self, count, tiles_to_ignore),
+        )
+
+    def __build_distance_field(
+        self, goal: MatrixPosition, tiles_to_ignore: list[MazeTile]
+    ) -> DistanceField:
+        """Run a uniform-cost search from the goal over the whole maze."""
+        rows, cols = self.rows, self.cols
+        blocked = self.mask(*tiles_to_ignore).tobytes()
+        moves = [
+            (row_offset, col_offset, row_offset * cols + col_offset)
+            for row_offset, col_offset in NEIGHBOR_OFFSETS
+        ]
+        costs = [-1] * len(self)
+        goal_index = goal.row * cols + goal.col
+        costs[goal_index] = 0
+        open_set = [(0, goal_index)]
         while open_set:
-            current_node: Node = heapq.heappop(open_set)
-            current: MatrixPosition = current_node.position
-            inspected.append(current)
+            cost, current = heapq.heappop(open_set)
+            if cost > costs[current]:
+                continue
+            row, col = divmod(current, cols)
+            for row_offset, col_offset, index_offset in moves:
+                neighbor_row = row + row_offset
+                neighbor_col = col + col_offset
+                if not (0 <= neighbor_row < rows and 0 <= neighbor_col < cols):
+                    continue
+                neighbor = current + index_offset
+                if blocked[neighbor]:
+                    continue
+                neighbor_cost = cost + (5 if row_offset == 0 or col_offset == 0 else 7)
+                if costs[neighbor] < 0 or neighbor_cost < costs[neighbor]:
+                    costs[neighbor] = neighbor_cost
+                    heapq.heappush(open_set, (neighbor_cost, neighbor))
+        return DistanceField(goal, np.array(costs, dtype=np.int32).reshape(rows, cols))
 
-            if current == goal:
-                node_path = current_node.node_path
-                position_path = [node.position for node in node_path]
-                history.add_step(
-                    inspected=inspected, generated=generated, path=position_path
-                )
+    def field_path(
+        self,
+        start: MatrixPosition | None = None,
+        field: DistanceField | None = None,
+        history_policy: HistoryPolicy | None = None,
+    ) -> TraversalResult:
+        """Find the shortest path from the start position by descending a distance field.
+
+        Takes O(path length) once the field is built. Every iteration
+        inspects one cell of the path and generates the next one.
+
+        Parameters
+        ----------
+            start : (MatrixPosition)
+                The start position.
+            field : (DistanceField)
+                The field to descend. Defaults to :meth:`distance_field`
+                for the goal of the maze.
+            history_policy : (HistoryPolicy)
+                Which steps of the search to record in the history.
+
+        Returns
+        -------
+            (TraversalResult)
+                The path from the start to the goal of the field.
+                If no path is found, the path and the cost are None.
+        """  # noqa: E501
+        if start is None:
+            start = self.start
+        if field is None and not self.connected(start):
+            positions = []
+        else:
+            if field is None:
+                field = self.distance_field()
+            positions = field.path(start)
+        history = AlgorithmHistory(
+            resolve_path=lambda tip: positions[: tip + 1],
+            policy=history_policy,
+        )
+        history.add_step(generated=[start])
+        if not positions:
+            history.add_step(inspected=[start])
+            return TraversalResult(history, path=None, cost=None)
+        for index, position in enumerate(positions[:-1]):
+            history.add_step(
+                generated=[positions[index + 1]], inspected=[position], path=index
+            )
+        history.add_step(inspected=[positions[-1]], path=len(positions) - 1)
+        cost = field.cost(start)
+        h_scores = [field.cost(position) for position in positions]
+        return TraversalResult(
+            history,
+            path=self.__nodes(positions, [cost - h for h in h_scores], h_scores),
+            cost=cost,
+        )
+
+    def jump_point_search(
+        self,
+        start: MatrixPosition | None = None,
+        goal: MatrixPosition | None = None,
+        euristic_func: Callable[[MatrixPosition, MatrixPosition], int]
+        | euristics.Euristic
+        | Landmarks
+        | None = None,
+        tiles_to_ignore: list[MazeTile] | None = None,
+        history_policy: HistoryPolicy | None = None,
+        frontier: Frontier = Frontier.HEAP,
+    ) -> TraversalResult:
+        """Find the shortest path between the start and goal positions using Jump Point Search.
+
+        Jump Point Search is A* on the default 5/7 move costs that, instead
+        of generating every neighbor of a cell, jumps in a straight or
+        diagonal line until it finds a cell where a path could turn
+        (a jump point). Only jump points are generated and inspected, so
+        open areas are crossed without expanding every cell in them. As in
+        :meth:`a_star`, unreachable goals are detected before searching. Any
+        move to a free neighbor is allowed, as in :meth:`a_star`, and the
+        cost of the path is the same.
+
+        Parameters
+        ----------
+            start : (MatrixPosition)
+                The start position.
+            goal : (MatrixPosition)
+                The goal position.
+            euristic_func : (Callable[[MatrixPosition, MatrixPosition], int] | Euristic | Landmarks)
+                The euristic function to use. It should be consistent. A
+                built-in :class:`Euristic` or :class:`Landmarks` are read
+                from a whole-grid table, as in :meth:`a_star`. Defaults to
+                the Manhattan distance.
+            tiles_to_ignore : (list[MazeTile])
+                The tiles to ignore.
+            history_policy : (HistoryPolicy)
+                Which steps of the search to record in the history.
+            frontier : (Frontier)
+                The priority queue of the open jump points.
+
+        Returns
+        -------
+            (TraversalResult)
+                The path from the start to the goal, with every cell
+                between the jump points. If no path is found,
+                the path and the cost are None.
+
+        Examples
+        --------
+        The cost is the one of the path, whatever the euristic estimates
+        at the goal:
+
+        >>> maze = Maze(rows=1, cols=3)
+        >>> for col in range(3):
+        ...     maze[0, col] = MazeTile.EMPTY
+        >>> start, goal = MatrixPosition(0, 0), MatrixPosition(0, 2)
+        >>> maze.jump_point_search(start, goal, lambda cell, goal: 1).cost
+        10
+        """  # noqa: E501
+        if start is None:
+            start = self.start
+        if goal is None:
+            goal = self.goal
+        if euristic_func is None:
+            euristic_func = euristics.Euristic.MANHATTAN
+        if tiles_to_ignore is None:
+            tiles_to_ignore = [MazeTile.WALL]
+
+        rows, cols = self.rows, self.cols
+        blocked = self.mask(*tiles_to_ignore).tobytes()
+        start_index = start.row * cols + start.col
+        goal_index = goal.row * cols + goal.col
+
+        position = partial(index_position, cols)
+
+        def free(row: int, col: int) -> bool:
+            return 0 <= row < rows and 0 <= col < cols and not blocked[row * cols + col]
+
+        def jump(row: int, col: int, row_offset: int, col_offset: int) -> int | None:
+            """Follow a direction from a cell until a jump point or a wall."""
+            while True:
+                row += row_offset
+                col += col_offset
+                if not free(row, col):
+                    return None
+                index = row * cols + col
+                if index == goal_index:
+                    return index
+                if row_offset and col_offset:
+                    if (
+                        free(row - row_offset, col + col_offset)
+                        and not free(row - row_offset, col)
+                    ) or (
+                        free(row + row_offset, col - col_offset)
+                        and not free(row, col - col_offset)
+                    ):
+                        return index
+                    if (
+                        jump(row, col, row_offset, 0) is not None
+                        or jump(row, col, 0, col_offset) is not None
+                    ):
+                        return index
+                elif col_offset:
+                    if (free(row + 1, col + col_offset) and not free(row + 1, col)) or (
+                        free(row - 1, col + col_offset) and not free(row - 1, col)
+                    ):
+                        return index
+                elif (free(row + row_offset, col + 1) and not free(row, col + 1)) or (
+                    free(row + row_offset, col - 1) and not free(row, col - 1)
+                ):
+                    return index
+
+        def directions(current: int, parent: int) -> list[tuple[int, int]]:
+            """Get the directions worth jumping to from a cell."""
+            if parent == -1:
+                return NEIGHBOR_OFFSETS
+            row, col = divmod(current, cols)
+            parent_row, parent_col = divmod(parent, cols)
+            row_offset = (row > parent_row) - (row < parent_row)
+            col_offset = (col > parent_col) - (col < parent_col)
+            if row_offset and col_offset:
+                pruned = [(0, col_offset), (row_offset, 0), (row_offset, col_offset)]
+                if not free(row - row_offset, col):
+                    pruned.append((-row_offset, col_offset))
+                if not free(row, col - col_offset):
+                    pruned.append((row_offset, -col_offset))
+            elif col_offset:
+                pruned = [(0, col_offset)]
+                if not free(row + 1, col):
+                    pruned.append((1, col_offset))
+                if not free(row - 1, col):
+                    pruned.append((-1, col_offset))
+            else:
+                pruned = [(row_offset, 0)]
+                if not free(row, col + 1):
+                    pruned.append((row_offset, 1))
+                if not free(row, col - 1):
+                    pruned.append((row_offset, -1))
+            return pruned
+
+        g_score = {start_index: 0}
+        h_score = self.__h_scores(euristic_func, start, goal, tiles_to_ignore)
+        tree = LazyTree(start_index)
+        tree_g_score = [0]
+        open_set = frontier.to_queue()
+        push, pop = open_set.push, open_set.pop
+        push(h_score[start_index], 0)
+
+        history = AlgorithmHistory(
+            resolve_path=lambda tip: self.__jump_cells(tree.branch(tip)),
+            resolve_node=position,
+            policy=history_policy,
+        )
+        history.add_step(generated=[start_index])
+        if not self.connected(start, goal, tiles_to_ignore):
+            return TraversalResult(history, path=None, cost=None)
+
+        while open_set:
+            _, current_node = pop()
+            current = tree.ids[current_node]
+            if tree_g_score[current_node] > g_score[current]:
+                continue
+
+            if current == goal_index:
+                history.add_step(inspected=[current], path=current_node)
+                cells = self.__jump_cells(tree.branch(current_node))
+                # Cells between jump points were never generated, so a lazy
+                # euristic has not been evaluated on them yet.
+                h_scores = [h_score[cell.row * cols + cell.col] for cell in cells]
+                h_scores = [
+                    euristic_func(cell, goal) if h is None else h
+                    for cell, h in zip(cells, h_scores, strict=True)
+                ]
                 return TraversalResult(
                     history,
-                    path=node_path,
-                    cost=current_node.f_score,
+                    path=self.__nodes(cells, self.__move_g_scores(cells), h_scores),
+                    cost=g_score[current],
                 )
 
-            for neighbor in self.neighbors(current.row, current.col).values():
-                if self[neighbor] in tiles_to_ignore:
+            generated: list[int] = []
+            row, col = divmod(current, cols)
+            parent_node = tree.parents[current_node]
+            parent = tree.ids[parent_node] if parent_node != -1 else -1
+            for row_offset, col_offset in directions(current, parent):
+                jump_point = jump(row, col, row_offset, col_offset)
+                if jump_point is None:
                     continue
-                tentative_g_score = g_score[current] + g_score_func(current, neighbor)
-                if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
-                    came_from[neighbor] = current
-                    g_score[neighbor] = tentative_g_score
-                    h_score = euristic_func(neighbor, goal)
-                    f_score[neighbor] = tentative_g_score + h_score
-                    new_node = (
-                        Node(
-                            name=neighbor,
-                            parent=current_node,
-                            compare_by="f_score",
-                            position=neighbor,
-                            g_score=tentative_g_score,
-                            f_score=f_score[neighbor],
-                            h_score=h_score,
-                        ),
-                    )
-                    heapq.heappush(
-                        open_set,
-                        new_node[0],
+                jump_row, jump_col = divmod(jump_point, cols)
+                steps = max(abs(jump_row - row), abs(jump_col - col))
+                cost = 7 * steps if row_offset and col_offset else 5 * steps
+                tentative_g_score = g_score[current] + cost
+                if tentative_g_score < g_score.get(jump_point, tentative_g_score + 1):
+                    g_score[jump_point] = tentative_g_score
+                    h = h_score[jump_point]
+                    if h is None:
+                        h = h_score[jump_point] = euristic_func(
+                            MatrixPosition(jump_row, jump_col), goal
+                        )
+                    push(tentative_g_score + h, tree.add(jump_point, current_node))
+                    tree_g_score.append(tentative_g_score)
+                    generated.append(jump_point)
+            history.add_step(
+                generated=generated, inspected=[current], path=current_node
+            )
+
+        return TraversalResult(history, path=None, cost=None)
+
+    def __h_scores(
+        self,
+        euristic_func: Callable[[MatrixPosition, MatrixPosition], int]
+        | euristics.Euristic
+        | Landmarks,
+        start: MatrixPosition,
+        goal: MatrixPosition,
+        tiles_to_ignore: list[MazeTile],
+    ) -> Sequence[int | None]:
+        """Get the euristic of every cell, indexed by ``row * cols + col``.
+
+        Built-in euristics and landmarks are read from a whole-grid table.
+        Other functions are evaluated lazily by the search, so every cell
+        but the start is None until it is generated.
+
+        Raises
+        ------
+        ValueError
+            If the landmarks were picked on a maze of another shape.
+        """
+        if euristic_func == euristics.Euristic.LANDMARKS:
+            euristic_func = self.landmarks(tiles_to_ignore=tiles_to_ignore)
+        if isinstance(euristic_func, Landmarks):
+            if euristic_func.shape != (self.rows, self.cols):
+                raise ValueError(
+                    f"The landmarks belong to a {euristic_func.shape} maze, "
+                    f"not a {(self.rows, self.cols)} one."
+                )
+            return memoryview(euristic_func.to_array(goal).reshape(-1))
+        if isinstance(euristic_func, euristics.Euristic):
+            table = euristic_func.to_array(self.rows, self.cols, goal)
+            return memoryview(table.reshape(-1))
+        h_score: list[int | None] = [None] * len(self)
+        h_score[start.row * self.cols + start.col] = euristic_func(start, goal)
+        return h_score
+
+    def hierarchy(
+        self,
+        cluster_size: int = DEFAULT_CLUSTER_SIZE,
+        tiles_to_ignore: list[MazeTile] | None = None,
+    ) -> Hierarchy:
+        """Build the abstract graph used by :meth:`hierarchical_search`.
+
+        See :meth:`Hierarchy.from_maze`. The graph is cached until a tile
+        of the maze changes.
+
+        Parameters
+        ----------
+            cluster_size : (int)
+                The side of the clusters.
+            tiles_to_ignore : (list[MazeTile])
+                The tiles to ignore.
+
+        Returns
+        -------
+            (Hierarchy)
+                The abstract graph.
+        """
+        if tiles_to_ignore is None:
+            tiles_to_ignore = [MazeTile.WALL]
+        return self.__cached(
+            ("hierarchy", cluster_size, frozenset(tiles_to_ignore)),
+            lambda: Hierarchy.from_maze(self, cluster_size, tiles_to_ignore),
+        )
+
+    def incremental_planner(
+        self,
+        euristic_func: Callable[[MatrixPosition, MatrixPosition], int]
+        | euristics.Euristic
+        | None = None,
+        tiles_to_ignore: list[MazeTile] | None = None,
+    ) -> IncrementalPlanner:
+        """Bind a D* Lite planner to the maze.
+
+        The planner listens to the tiles of the maze, so after the first
+        :meth:`IncrementalPlanner.plan`, moving the start or setting a few
+        tiles only repairs the part of the search they affect. Call
+        :meth:`IncrementalPlanner.close` once it is no longer needed.
+
+        Parameters
+        ----------
+            euristic_func : (Callable[[MatrixPosition, MatrixPosition], int] | Euristic)
+                A consistent euristic function. Defaults to the Manhattan
+                distance.
+            tiles_to_ignore : (list[MazeTile])
+                The tiles to ignore.
+
+        Returns
+        -------
+            (IncrementalPlanner)
+                The planner.
+        """
+        return IncrementalPlanner(self, euristic_func, tiles_to_ignore)
+
+    def hierarchical_search(
+        self,
+        start: MatrixPosition | None = None,
+        goal: MatrixPosition | None = None,
+        euristic_func: Callable[[MatrixPosition, MatrixPosition], int]
+        | euristics.Euristic
+        | Landmarks
+        | None = None,
+        tiles_to_ignore: list[MazeTile] | None = None,
+        history_policy: HistoryPolicy | None = None,
+        frontier: Frontier = Frontier.HEAP,
+        cluster_size: int = DEFAULT_CLUSTER_SIZE,
+    ) -> TraversalResult:
+        """Find a path between the start and goal positions using HPA*.
+
+        The start and the goal are linked to the nodes of their clusters
+        in the abstract graph of :meth:`hierarchy`, which is searched with
+        A*. Each edge of the abstract path is then refined into cells with
+        a search bounded by its cluster. Only the abstract nodes are
+        generated and inspected, so the history records the search over
+        clusters. The path is not always optimal, since it crosses borders
+        at the transitions, but it is usually within a few percent of it.
+
+        The costs inside each cluster are computed when the search first
+        expands one of its nodes and kept with the hierarchy, so the first
+        query costs about as much as :meth:`a_star` and the following ones
+        only search the abstract graph. Changing a tile discards them.
+
+        Mazes that fit in a single cluster, and goals less than a cluster
+        away from the start in both directions, are searched with
+        :meth:`a_star`, since the transitions between their clusters can
+        be far from the short path between them. As in :meth:`a_star`,
+        unreachable goals are detected before searching.
+
+        Parameters
+        ----------
+            start : (MatrixPosition)
+                The start position.
+            goal : (MatrixPosition)
+                The goal position.
+            euristic_func : (Callable[[MatrixPosition, MatrixPosition], int] | Euristic | Landmarks)
+                The euristic function of the abstract search, as in
+                :meth:`a_star`. Defaults to the Manhattan distance.
+            tiles_to_ignore : (list[MazeTile])
+                The tiles to ignore.
+            history_policy : (HistoryPolicy)
+                Which steps of the search to record in the history.
+            frontier : (Frontier)
+                The priority queue of the open abstract nodes.
+            cluster_size : (int)
+                The side of the clusters.
+
+        Returns
+        -------
+            (TraversalResult)
+                The path from the start to the goal, with every cell.
+                If no path is found, the path and the cost are None.
+
+        Examples
+        --------
+        Neighbors on both sides of a cluster border are linked directly,
+        not through the transitions of the border:
+
+        >>> maze = Maze(rows=8, cols=8)
+        >>> for row in range(8):
+        ...     for col in range(8):
+        ...         maze[row, col] = MazeTile.EMPTY
+        >>> start, goal = MatrixPosition(0, 3), MatrixPosition(0, 4)
+        >>> maze.hierarchical_search(start, goal, cluster_size=4).cost
+        5
+        >>> maze.a_star(start, goal).cost
+        5
+        """  # noqa: E501
+        if start is None:
+            start = self.start
+        if goal is None:
+            goal = self.goal
+        if euristic_func is None:
+            euristic_func = euristics.Euristic.MANHATTAN
+        if tiles_to_ignore is None:
+            tiles_to_ignore = [MazeTile.WALL]
+        single_cluster = self.rows <= cluster_size and self.cols <= cluster_size
+        nearby = (
+            abs(goal.row - start.row) < cluster_size
+            and abs(goal.col - start.col) < cluster_size
+        )
+        if single_cluster or nearby:
+            return self.a_star(
+                start,
+                goal,
+                euristic_func,
+                tiles_to_ignore=tiles_to_ignore,
+                history_policy=history_policy,
+                consistent=True,
+                frontier=frontier,
+            )
+
+        cols = self.cols
+        start_index = start.row * cols + start.col
+        goal_index = goal.row * cols + goal.col
+
+        position = partial(index_position, cols)
+
+        h_score = self.__h_scores(euristic_func, start, goal, tiles_to_ignore)
+        g_score = {start_index: 0}
+        tree = LazyTree(start_index)
+        tree_g_score = [0]
+        open_set = frontier.to_queue()
+        push, pop = open_set.push, open_set.pop
+        push(h_score[start_index], 0)
+
+        history = AlgorithmHistory(
+            resolve_path=partial(_branch_positions, tree, cols),
+            resolve_node=position,
+            policy=history_policy,
+        )
+        history.add_step(generated=[start_index])
+        if not self.connected(start, goal, tiles_to_ignore):
+            return TraversalResult(history, path=None, cost=None)
+
+        hierarchy = self.hierarchy(cluster_size, tiles_to_ignore)
+        # The start and the goal are linked to the nodes of their clusters
+        # for this search only, and the goal to the start if they share one.
+        start_edges = hierarchy.connect(start_index, (goal_index,))
+        goal_edges = hierarchy.connect(goal_index)
+
+        while open_set:
+            _, current_node = pop()
+            current = tree.ids[current_node]
+            if tree_g_score[current_node] > g_score[current]:
+                continue
+
+            if current == goal_index:
+                history.add_step(inspected=[current], path=current_node)
+                branch = tree.branch(current_node)
+                cells = [start_index]
+                for first, second in pairwise(branch):
+                    cells.extend(hierarchy.refine(first, second))
+                positions = [position(cell) for cell in cells]
+                h_scores = [
+                    euristic_func(cell, goal) if h is None else h
+                    for cell, h in zip(
+                        positions, [h_score[cell] for cell in cells], strict=True
                     )
+                ]
+                return TraversalResult(
+                    history,
+                    path=self.__nodes(
+                        positions, self.__move_g_scores(positions), h_scores
+                    ),
+                    cost=g_score[current],
+                )
+
+            neighbors = hierarchy.neighbors(current) if current in hierarchy else {}
+            if current == start_index:
+                neighbors.update(start_edges)
+            if current in goal_edges:
+                neighbors[goal_index] = goal_edges[current]
+            generated: list[int] = []
+            for neighbor, cost in neighbors.items():
+                tentative_g_score = g_score[current] + cost
+                if tentative_g_score < g_score.get(neighbor, tentative_g_score + 1):
+                    g_score[neighbor] = tentative_g_score
+                    h = h_score[neighbor]
+                    if h is None:
+                        h = h_score[neighbor] = euristic_func(position(neighbor), goal)
+                    push(tentative_g_score + h, tree.add(neighbor, current_node))
+                    tree_g_score.append(tentative_g_score)
                     generated.append(neighbor)
-            position_path = [node.position for node in current_node.node_path]
             history.add_step(
-                inspected=inspected, generated=generated, path=position_path
+                generated=generated, inspected=[current], path=current_node
             )
 
         return TraversalResult(history, path=None, cost=None)
 
+    def __jump_cells(self, jump_points: list[int]) -> list[MatrixPosition]:
+        """Get every cell of a path given by the jump points along it."""
+        cols = self.cols
+        row, col = divmod(jump_points[0], cols)
+        cells = [MatrixPosition(row, col)]
+        for jump_point in jump_points[1:]:
+            jump_row, jump_col = divmod(jump_point, cols)
+            row_offset = (jump_row > row) - (jump_row < row)
+            col_offset = (jump_col > col) - (jump_col < col)
+            while (row, col) != (jump_row, jump_col):
+                row += row_offset
+                col += col_offset
+                cells.append(MatrixPosition(row, col))
+        return cells
+
+    def __move_g_scores(self, cells: list[MatrixPosition]) -> list[int]:
+        """Get the cost of every prefix of a path with the 5/7 move costs."""
+        g = 0
+        g_scores = [0]
+        for previous, cell in pairwise(cells):
+            diagonal = previous.row != cell.row and previous.col != cell.col
+            g += 7 if diagonal else 5
+            g_scores.append(g)
+        return g_scores
+
+    def __node_path(
+        self,
+        tree: LazyTree,
+        tree_g_score: list[int],
+        h_score: list[int],
+        index: int,
+    ) -> list[Node]:
+        """Build the nodes from the root of the search tree to a node."""
+        cols = self.cols
+        indices = []
+        while index != -1:
+            indices.append(index)
+            index = tree.parents[index]
+        indices.reverse()
+        cells = [tree.ids[index] for index in indices]
+        return self.__nodes(
+            [MatrixPosition(*divmod(cell, cols)) for cell in cells],
+            [tree_g_score[index] for index in indices],
+            [h_score[cell] for cell in cells],
+        )
+
+    def __nodes(
+        self,
+        positions: list[MatrixPosition],
+        g_scores: list[int],
+        h_scores: list[int],
+    ) -> list[Node]:
+        """Build a chain of nodes with their scores, each one the parent of the next."""
+        path = []
+        parent = None
+        for position, g, h in zip(positions, g_scores, h_scores, strict=True):
+            parent = Node(
+                name=position,
+                parent=parent,
+                compare_by="f_score",
+                position=position,
+                g_score=g,
+                f_score=g + h,
+                h_score=h,
+            )
+            path.append(parent)
+        return path
+
     def plot(
         self,
         path: list[Node] | None = None,
@@ -273,7 +1681,7 @@ class Maze(Matrix):
             fig.suptitle(title, fontsize=20)
             fig.text(0.5, 0.90, subtitle, ha="center", fontsize=10)
         ax.imshow(
-            [[0 if cell == MazeTile.WALL else 1 for cell in row] for row in self],
+            self.passable.astype(np.uint8),
             cmap="gray",
             origin="upper",
         )
@@ -372,10 +1780,37 @@ class Maze(Matrix):
             plt.show()
             return
         plt.savefig(file_path)
+        plt.close(fig)
 
     def __str__(self) -> str:
         """Return the maze as a string."""
         return self.print()
 
 
+def _branch_positions(tree: LazyTree, cols: int, tip: int) -> list[MatrixPosition]:
+    """Get the positions from the root of a tree of cells to one of its nodes."""
+    return [index_position(cols, index) for index in tree.branch(tip)]
+
+
+def _shared_maze(
+    views: dict[str, memoryview],
+    metadata: tuple[int, int, MatrixPosition, MatrixPosition],
+) -> Maze:
+    """Wrap a read-only maze around tiles in shared memory."""
+    rows, cols, start, goal = metadata
+    codes = np.frombuffer(views["codes"], dtype=np.uint8).reshape(rows, cols)
+    codes.flags.writeable = False
+    return Maze(rows=rows, cols=cols, start=start, goal=goal, codes=codes)
+
+
+def _a_star_query(
+    maze: Maze,
+    query: tuple[MatrixPosition, MatrixPosition],
+    options: dict[str, Any],
+) -> TraversalResult:
+    """Run one search of :meth:`Maze.a_star_many`."""
+    start, goal = query
+    return maze.a_star(start, goal, **options)
+
+
 TContent = TypeVar("TContent", bound=MazeTile)
@@ -0,0 +1,257 @@
+"""Parallel search module.
+
+Contains the helpers used to answer many queries over one read-only
+maze or graph in a pool of worker processes. The arrays of the structure
+are copied once to shared memory, which every worker attaches to and
+wraps without copying, so only the queries and the results are pickled.
+"""
+
+from __future__ import annotations
+
+import atexit
+import gc
+import os
+import sys
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import batched
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Self
+
+DEFAULT_CHUNK_SIZE = 16
+"""Queries sent to a worker at a time when none is given."""
+
+Layout = tuple[str, tuple[tuple[str, str, tuple[int, ...], int, int], ...]]
+"""The name of a shared memory block and the key, format, shape, offset
+and size in bytes of every array in it."""
+
+_worker: dict[str, Any] = {}
+"""The structure searched by this process, when it is a worker."""
+
+
+class SharedArrays:
+    """Read-only arrays copied to a shared memory block.
+
+    The arrays can be any object that exposes a contiguous buffer, such
+    as :class:`array.array` or NumPy arrays. Other processes get them back
+    as memory views with :func:`attach`, given the :attr:`layout`. The
+    block is freed when the object is closed.
+
+    Examples
+    --------
+    >>> from array import array
+    >>> with SharedArrays({"weights": array("d", [1.5, 2.5])}) as shared:
+    ...     views, block = attach(shared.layout)
+    ...     views["weights"].tolist()
+    [1.5, 2.5]
+    """
+
+    def __init__(self, arrays: Mapping[str, Any]):
+        """Copy the arrays to a new shared memory block.
+
+        Parameters
+        ----------
+            arrays : (Mapping[str, Any])
+                The arrays, by key.
+        """
+        entries = []
+        size = 0
+        for key, value in arrays.items():
+            view = memoryview(value)
+            # Every array starts at a multiple of 8 bytes, so the views
+            # are aligned for any format.
+            size += -size % 8
+            entries.append((key, view.format, view.shape, size, view.nbytes))
+            size += view.nbytes
+        self.__block = SharedMemory(create=True, size=max(size, 1))
+        for (_, _, _, offset, nbytes), value in zip(
+            entries, arrays.values(), strict=True
+        ):
+            self.__block.buf[offset : offset + nbytes] = memoryview(value).cast("B")
+        self.__layout = (self.__block.name, tuple(entries))
+
+    @property
+    def layout(self) -> Layout:
+        """Get what :func:`attach` needs to find the arrays."""
+        return self.__layout
+
+    def close(self) -> None:
+        """Free the shared memory block."""
+        self.__block.close()
+        self.__block.unlink()
+
+    def __enter__(self) -> Self:
+        """Return the arrays."""
+        return self
+
+    def __exit__(self, *_) -> None:
+        """Free the shared memory block."""
+        self.close()
+
+
+def attach(layout: Layout) -> tuple[dict[str, memoryview], SharedMemory]:
+    """Get the arrays of a :class:`SharedArrays` from any process.
+
+    Returns
+    -------
+        (tuple[dict[str, memoryview], SharedMemory])
+            A memory view of every array, by key, and the block they live
+            in, which must be kept alive while the views are used.
+    """
+    name, entries = layout
+    if sys.version_info >= (3, 13):
+        # The block belongs to the process that created it.
+        block = SharedMemory(name=name, track=False)
+    else:
+        block = SharedMemory(name=name)
+    views = {}
+    for key, format, shape, offset, nbytes in entries:
+        view = block.buf[offset : offset + nbytes]
+        views[key] = view.cast(format, shape) if len(shape) > 1 else view.cast(format)
+    return views, block
+
+
+def fan_out[S, Q, R](
+    queries: Iterable[Q],
+    search: Callable[[S, Q, dict[str, Any]], R],
+    *,
+    local: S,
+    arrays: Mapping[str, Any],
+    build: Callable[[dict[str, memoryview], Any], S],
+    metadata: Any = None,
+    options: dict[str, Any] | None = None,
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[tuple[int, R]]:
+    """Answer queries over a structure in a pool of worker processes.
+
+    The arrays are copied to shared memory and every worker rebuilds the
+    structure from them once, with ``build(views, metadata)``. Queries are
+    then sent in chunks and answered with ``search(structure, query,
+    options)``. Only a few chunks per worker are pending at a time, so the
+    queries can be a lazy iterable of any length.
+
+    ``search`` and ``build`` are pickled by reference, so they must be
+    module-level functions. So are the metadata and the options, once per
+    worker.
+
+    Parameters
+    ----------
+        queries : (Iterable[Q])
+            The queries.
+        search : (Callable[[S, Q, dict[str, Any]], R])
+            Answers a query over the structure.
+        local : (S)
+            The structure itself, searched in this process when there is
+            a single worker.
+        arrays : (Mapping[str, Any])
+            The arrays of the structure, by key.
+        build : (Callable[[dict[str, memoryview], Any], S])
+            Rebuilds the structure in a worker from views of its arrays
+            and the metadata.
+        metadata : (Any)
+            Whatever else ``build`` needs, such as the size of the arrays.
+        options : (dict[str, Any])
+            Passed to every call of ``search``.
+        workers : (int)
+            The number of worker processes. Defaults to the number of CPUs.
+        chunk_size : (int)
+            The number of queries sent to a worker at a time.
+
+    Returns
+    -------
+        (Iterator[tuple[int, R]])
+            The index of every query in ``queries`` and its answer, in the
+            order they finish.
+
+    Raises
+    ------
+    ValueError
+        If there are no workers or the chunks are empty.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"There must be at least one worker: {workers}")
+    if chunk_size < 1:
+        raise ValueError(f"Chunks must hold at least one query: {chunk_size}")
+    if options is None:
+        options = {}
+    if workers == 1:
+        return (
+            (index, search(local, query, options))
+            for index, query in enumerate(queries)
+        )
+    return _pool_results(
+        queries, search, arrays, build, metadata, options, workers, chunk_size
+    )
+
+
+def _pool_results[S, Q, R](
+    queries: Iterable[Q],
+    search: Callable[[S, Q, dict[str, Any]], R],
+    arrays: Mapping[str, Any],
+    build: Callable[[dict[str, memoryview], Any], S],
+    metadata: Any,
+    options: dict[str, Any],
+    workers: int,
+    chunk_size: int,
+) -> Iterator[tuple[int, R]]:
+    """Answer queries in worker processes, see :func:`fan_out`."""
+    chunks = batched(enumerate(queries), chunk_size)
+    with (
+        SharedArrays(arrays) as shared,
+        ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_initialize,
+            initargs=(shared.layout, build, metadata, search, options),
+        ) as executor,
+    ):
+        pending = set()
+        try:
+            while True:
+                for chunk in chunks:
+                    pending.add(executor.submit(_run, chunk))
+                    if len(pending) >= 2 * workers:
+                        break
+                if not pending:
+                    return
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _initialize(
+    layout: Layout,
+    build: Callable[[dict[str, memoryview], Any], Any],
+    metadata: Any,
+    search: Callable[[Any, Any, dict[str, Any]], Any],
+    options: dict[str, Any],
+) -> None:
+    """Rebuild the structure in a worker process."""
+    views, block = attach(layout)
+    _worker["structure"] = build(views, metadata)
+    _worker["search"] = search
+    _worker["options"] = options
+    atexit.register(_detach, block)
+
+
+def _detach(block: SharedMemory) -> None:
+    """Drop the structure of a worker process and close its block.
+
+    The block cannot be closed while the structure still has views of it.
+    """
+    _worker.clear()
+    gc.collect()
+    block.close()
+
+
+def _run(chunk: tuple[tuple[int, Any], ...]) -> list[tuple[int, Any]]:
+    """Answer a chunk of queries in a worker process."""
+    structure = _worker["structure"]
+    search = _worker["search"]
+    options = _worker["options"]
+    return [(index, search(structure, query, options)) for index, query in chunk]
@@ -8,7 +8,7 @@ from __future__ import annotations
 import copy
 import heapq
 from collections.abc import Iterable
-from typing import TypeVar
+from typing import Self, TypeVar
 
 from . import iterators
 
@@ -511,6 +511,20 @@ class BaseNode:
         """
         return copy.deepcopy(self)
 
+    def detached(self) -> Self:
+        """Copy the node without its parent and children.
+
+        The attributes are shared with the node, not copied.
+
+        Returns
+        -------
+            (Self)
+        """
+        obj = copy.copy(self)
+        obj.__parent = None
+        obj.__children = []
+        return obj
+
     def sort(self: T, **kwargs) -> None:
         """Sort the children nodes.
 
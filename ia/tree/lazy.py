@@ -0,0 +1,110 @@
+"""Lazy tree module.
+
+Contains the LazyTree class, a lightweight search tree that is only
+turned into :class:`Node` objects when needed.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Hashable
+
+from .node import Node
+
+
+class LazyTree:
+    """Search tree stored as parent-pointer arrays.
+
+    Every node is identified by the index in which it was added and
+    only stores its id and the index of its parent, which makes adding
+    a node O(1). :meth:`to_node` materializes the tree as :class:`Node`
+    objects with an ``id`` attribute, the same shape the traversals
+    used to build eagerly.
+
+    Examples
+    --------
+    >>> tree = LazyTree(1)
+    >>> child = tree.add(2, parent=0)
+    >>> tree.add(3, parent=child)
+    2
+    >>> [node.id for node in tree.path(2)]
+    [1, 2, 3]
+    """
+
+    def __init__(self, root: Hashable):
+        """Initialize the tree.
+
+        Parameters
+        ----------
+            root : (Hashable)
+                The id of the root node, which gets the index 0.
+        """
+        self.ids: list[Hashable] = [root]
+        self.parents = array("q", [-1])
+
+    def add(self, id: Hashable, parent: int) -> int:
+        """Add a node to the tree.
+
+        Parameters
+        ----------
+            id : (Hashable)
+                The id of the node.
+            parent : (int)
+                The index of the parent node.
+
+        Returns
+        -------
+            (int)
+                The index of the new node.
+        """
+        self.ids.append(id)
+        self.parents.append(parent)
+        return len(self.ids) - 1
+
+    def branch(self, index: int) -> list[Hashable]:
+        """Get the ids from the root to a node, both included."""
+        ids = self.ids
+        parents = self.parents
+        branch = []
+        while index != -1:
+            branch.append(ids[index])
+            index = parents[index]
+        branch.reverse()
+        return branch
+
+    def path(self, index: int) -> list[Node]:
+        """Build the chain of nodes from the root to a node.
+
+        The nodes are independent from the ones created by
+        :meth:`to_node`.
+        """
+        return node_chain(self.branch(index))
+
+    def to_node(self) -> Node:
+        """Materialize the whole tree and return its root node."""
+        ids = self.ids
+        parents = self.parents
+        nodes = [Node(ids[0], id=ids[0])]
+        for index in range(1, len(ids)):
+            nodes.append(Node(ids[index], parent=nodes[parents[index]], id=ids[index]))
+        return nodes[0]
+
+    def __len__(self) -> int:
+        """Return the number of nodes."""
+        return len(self.ids)
+
+
+def node_chain(ids: list[Hashable]) -> list[Node]:
+    """Build a chain of nodes, each one the parent of the next.
+
+    Examples
+    --------
+    >>> [node.path_name for node in node_chain([1, 2])]
+    ['/1', '/1/2']
+    """
+    path = []
+    parent = None
+    for id in ids:
+        parent = Node(id, parent=parent, id=id)
+        path.append(parent)
+    return path